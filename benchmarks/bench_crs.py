@@ -0,0 +1,53 @@
+"""Throughput of batch CRS transformation with ``fairdm_geo.gis.crs`` compared to transforming point by point.
+
+Transforms random UTM zone 32N coordinates to WGS84. The per-point loop creates no new transformers (it reuses the
+cached one), so the difference is purely the cost of crossing into PROJ once per point.
+
+Usage::
+
+    python benchmarks/bench_crs.py --points 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fairdm_geo.gis.crs import get_transformer, to_wgs84, utm_crs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--loop-points", type=int, default=20_000, help="Sample size for the per-point loop.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    source = utm_crs(32)
+    x = rng.uniform(300_000, 700_000, args.points)
+    y = rng.uniform(5_000_000, 6_000_000, args.points)
+
+    to_wgs84(x[:10], y[:10], source)  # build the transformer outside the timed section
+
+    start = time.perf_counter()
+    to_wgs84(x, y, source)
+    batch = time.perf_counter() - start
+
+    transformer = get_transformer(source)
+    n = min(args.loop_points, args.points)
+    start = time.perf_counter()
+    for i in range(n):
+        transformer.transform(x[i], y[i])
+    loop = (time.perf_counter() - start) * args.points / n
+
+    print(f"{'method':<12}{'seconds':>10}{'points/s':>16}")
+    print(f"{'batch':<12}{batch:>10.2f}{args.points / batch:>16,.0f}")
+    print(f"{'per point':<12}{loop:>10.2f}{args.points / loop:>16,.0f}  (extrapolated from {n:,} points)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Measure the cost of ``django.setup()`` with the fairdm_geo sites and rocks apps installed.
+
+Each configuration is run in a fresh interpreter so that nothing is shared between runs:
+
+- ``eager``: vocabularies are parsed from their remote source as soon as they are instantiated
+- ``lazy``: vocabularies are only parsed when their concepts are first needed
+- ``snapshot``: vocabularies are resolved from the offline vocabulary snapshot (``--snapshot``, by default the one
+  shipped in the package). The configuration is skipped if that file does not exist, rather than silently measuring
+  the remote fallback; build it with ``python manage.py build_vocabulary_snapshot``.
+
+A configuration that fails (e.g. ``eager`` without network access) is reported with its error and the others still
+run. ``--json`` writes the raw measurements to a file as well.
+
+Usage::
+
+    python benchmarks/import_time.py --runs 5 --json import_time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, resource, time
+start = time.perf_counter()
+import django
+django.setup()
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "maxrss_kb": rss}))
+"""
+
+SNAPSHOT = ROOT / "fairdm_geo" / "vocabularies" / "snapshot.sqlite3"
+
+CONFIGURATIONS = {
+    "eager": {"FAIRDM_GEO_LAZY_VOCABULARIES": "0", "FAIRDM_GEO_VOCABULARY_SNAPSHOT": ""},
+    "lazy": {"FAIRDM_GEO_LAZY_VOCABULARIES": "1", "FAIRDM_GEO_VOCABULARY_SNAPSHOT": ""},
+    "snapshot": {"FAIRDM_GEO_LAZY_VOCABULARIES": "1"},
+}
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def run_once(env):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "benchmarks.settings", "PYTHONPATH": str(ROOT), **env}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", CHILD], env=env, cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    if result.returncode:
+        lines = result.stderr.strip().splitlines() or [f"exit status {result.returncode}"]
+        raise BenchmarkError(lines[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(name, runs, snapshot):
+    """Measure one configuration and return a summary dict (with an ``error`` instead if it could not run)."""
+    env = CONFIGURATIONS[name]
+    if name == "snapshot":
+        if not snapshot.exists():
+            return {"configuration": name, "error": f"skipped, there is no snapshot at {snapshot}"}
+        env = {**env, "FAIRDM_GEO_VOCABULARY_SNAPSHOT": str(snapshot)}
+    try:
+        results = [run_once(env) for _ in range(runs)]
+    except BenchmarkError as e:
+        return {"configuration": name, "error": f"failed: {e}"}
+    seconds = [r["seconds"] for r in results]
+    return {
+        "configuration": name,
+        "runs": runs,
+        "median_seconds": statistics.median(seconds),
+        "min_seconds": min(seconds),
+        "max_rss_mb": max(r["maxrss_kb"] for r in results) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--config", choices=CONFIGURATIONS, action="append")
+    parser.add_argument("--snapshot", type=Path, default=SNAPSHOT, help="The snapshot used by the snapshot mode.")
+    parser.add_argument("--json", type=Path, help="Also write the measurements to this file.")
+    args = parser.parse_args()
+
+    summaries = []
+    print(f"{'configuration':<12} {'median s':>10} {'min s':>10} {'max RSS MB':>12}")
+    for name in args.config or CONFIGURATIONS:
+        summary = run(name, args.runs, args.snapshot)
+        summaries.append(summary)
+        if "error" in summary:
+            print(f"{name:<12} {summary['error']}")
+        else:
+            print(
+                f"{name:<12} {summary['median_seconds']:>10.3f} {summary['min_seconds']:>10.3f}"
+                f" {summary['max_rss_mb']:>12.1f}"
+            )
+    if args.json:
+        args.json.write_text(json.dumps(summaries, indent=2))
+
+
+if __name__ == "__main__":
+    main()
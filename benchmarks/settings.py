@@ -0,0 +1,11 @@
+"""Settings used by the benchmark scripts. Extends the test settings with a few environment toggles."""
+
+import os
+
+from tests.settings import *  # noqa: F403
+
+FAIRDM_GEO_LAZY_VOCABULARIES = os.environ.get("FAIRDM_GEO_LAZY_VOCABULARIES", "1") == "1"
+
+# an empty value disables the snapshot, a path selects it; unset keeps the default (the snapshot in the package)
+if "FAIRDM_GEO_VOCABULARY_SNAPSHOT" in os.environ:
+    FAIRDM_GEO_VOCABULARY_SNAPSHOT = os.environ["FAIRDM_GEO_VOCABULARY_SNAPSHOT"] or None
@@ -0,0 +1,55 @@
+"""Package-wide settings for fairdm_geo.
+
+All settings are prefixed with ``FAIRDM_GEO_`` and can be overridden in the project settings, e.g.
+``FAIRDM_GEO_VOCABULARY_OFFLINE = True``. Import ``settings`` from this module (rather than from ``django.conf``)
+to make sure the defaults below are registered.
+"""
+
+from pathlib import Path
+
+from appconf import AppConf
+from django.conf import settings
+
+__all__ = ["FairDMGeoConf", "settings"]
+
+
+class FairDMGeoConf(AppConf):
+    # Path to the pre-parsed vocabulary snapshot. Set to None to always parse vocabularies from their remote source.
+    VOCABULARY_SNAPSHOT = Path(__file__).parent / "vocabularies" / "snapshot.sqlite3"
+
+    # When True, a vocabulary that is missing from the snapshot raises ImproperlyConfigured instead of being
+    # fetched from the network (useful on air-gapped deployments).
+    VOCABULARY_OFFLINE = False
+
+    # Defer parsing vocabularies that are not in the snapshot until their concepts are first needed, rather than
+    # when the vocabulary is instantiated (typically at import time, as a model field argument).
+    LAZY_VOCABULARIES = True
+
+    # Directory holding rendered vector tiles. Defaults to a "fairdm_geo_tiles" folder in the system temp directory.
+    TILE_CACHE_DIR = None
+
+    # Cache-Control max-age (in seconds) sent with vector tiles.
+    TILE_MAX_AGE = 60 * 60 * 24
+
+    # Cache-Control max-age (in seconds) sent with vocabulary autocomplete responses. Responses also carry an ETag
+    # derived from the indexed vocabulary, so clients revalidate cheaply once this expires.
+    AUTOCOMPLETE_MAX_AGE = 60 * 60
+
+    # Cache alias and timeout (in seconds) for the clustered sampling locations served to map views. Cached clusters
+    # are also invalidated whenever a sampling location is saved or deleted, but only in processes that share the
+    # cache: with a per-process backend (LocMemCache) other workers serve stale clusters until the timeout expires.
+    CLUSTER_CACHE = "default"
+    CLUSTER_CACHE_TIMEOUT = 60 * 5
+
+    # Cache-Control max-age (in seconds) sent with clustered sampling locations.
+    CLUSTER_MAX_AGE = 60
+
+    # Maximum number of objects written per bulk_create when streaming fixtures with gis.loaders.load_fixture.
+    FIXTURE_BATCH_SIZE = 500
+
+    # Upper bound (in bytes of fixture JSON) on what a single batch may hold in memory. Large polygon fixtures hit
+    # this before FIXTURE_BATCH_SIZE.
+    FIXTURE_MAX_BATCH_BYTES = 64 * 1024 * 1024
+
+    class Meta:
+        prefix = "fairdm_geo"
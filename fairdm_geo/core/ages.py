@@ -0,0 +1,83 @@
+"""Maintenance of the denormalized ``min_age_ma`` / ``max_age_ma`` columns on geological depth intervals.
+
+The numeric bounds come from the ``GeologicalTimescale`` table of the ``fairdm_geo.geology.geologic_time`` app. If that
+app is not installed the columns are left empty.
+"""
+
+from itertools import batched
+
+from django.apps import apps
+
+BATCH_SIZE = 2000
+
+
+def _timescale_model():
+    try:
+        return apps.get_model("geologic_time", "GeologicalTimescale")
+    except LookupError:
+        return None
+
+
+def refresh_age_bounds(queryset, batch_size=BATCH_SIZE):
+    """Recalculate ``min_age_ma`` and ``max_age_ma`` for every interval in ``queryset``.
+
+    Works in batches of ``batch_size`` intervals, each costing one query for the assigned ages, one for their bounds
+    and a bulk update. Returns the number of intervals processed.
+    """
+    timescale = _timescale_model()
+    if timescale is None:
+        return 0
+
+    model = queryset.model
+    field = model._meta.get_field("age")
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+
+    count = 0
+    for pks in batched(queryset.values_list("pk", flat=True).iterator(chunk_size=batch_size), batch_size):
+        ages = {}
+        for interval, name in through._default_manager.filter(**{f"{source}__in": pks}).values_list(
+            f"{source}_id", f"{target}__name"
+        ):
+            ages.setdefault(interval, []).append(name)
+
+        names = {name for names in ages.values() for name in names}
+        bounds = {
+            name: (younger, older)
+            for name, younger, older in timescale._default_manager.filter(name__in=names).values_list(
+                "name", "younger_bound", "older_bound"
+            )
+        }
+
+        objs = []
+        for pk in pks:
+            known = [bounds[name] for name in ages.get(pk, []) if name in bounds]
+            younger = [y for y, _ in known if y is not None]
+            older = [o for _, o in known if o is not None]
+            objs.append(model(pk=pk, min_age_ma=min(younger, default=None), max_age_ma=max(older, default=None)))
+
+        model._base_manager.bulk_update(objs, ["min_age_ma", "max_age_ma"])
+        count += len(objs)
+    return count
+
+
+def age_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """``m2m_changed`` receiver keeping the age bounds in sync with the ``age`` relation."""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            instance.update_age_bounds()
+        return
+
+    # reverse: ``instance`` is a concept and ``model`` the interval model
+    if action == "pre_clear":
+        field = model._meta.get_field("age")
+        instance._cleared_interval_pks = set(
+            sender._default_manager.filter(**{field.m2m_reverse_field_name(): instance}).values_list(
+                f"{field.m2m_field_name()}_id", flat=True
+            )
+        )
+    elif action == "post_clear":
+        pk_set = getattr(instance, "_cleared_interval_pks", set())
+    if action in ("post_add", "post_remove", "post_clear") and pk_set:
+        refresh_age_bounds(model._base_manager.filter(pk__in=pk_set))
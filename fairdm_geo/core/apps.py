@@ -1,6 +1,7 @@
 """Django app configuration for fairdm_geo.core."""
 
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import m2m_changed
 from django.utils.translation import gettext_lazy as _
 
 
@@ -15,4 +16,14 @@ class CoreConfig(AppConfig):
     def ready(self):
         """Import models when app is ready."""
         # Import models to ensure they're registered
-        from . import models  # noqa: F401
+        from . import models
+        from .ages import age_changed
+
+        # keep the denormalized age bounds of every concrete geological interval in sync with its ages
+        for model in apps.get_models():
+            if issubclass(model, models.GeoDepthInterval):
+                m2m_changed.connect(
+                    age_changed,
+                    sender=model._meta.get_field("age").remote_field.through,
+                    dispatch_uid=f"fairdm_geo_age_bounds_{model._meta.label_lower}",
+                )
@@ -0,0 +1,87 @@
+"""Batched inserts for multi-table inheritance models.
+
+Django's ``bulk_create`` refuses models with concrete parents (e.g. ``Borehole`` -> ``SamplingLocation`` ->
+``Sample``). ``bulk_create_inherited`` inserts such objects one table at a time instead: the root table first, which
+returns the new primary keys, then each child table with the parent links filled in. That is one ``INSERT`` per table
+per batch rather than one per table per object.
+
+Like ``bulk_create``, model ``save()`` methods and ``pre_save``/``post_save`` signals are not called.
+"""
+
+from itertools import batched
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import NotSupportedError, connections, transaction
+
+BATCH_SIZE = 1000
+
+
+def _inheritance_chain(model):
+    """Concrete models from the root of the inheritance tree down to ``model``."""
+    return [*reversed(model._meta.get_parent_list()), model]
+
+
+def _set_polymorphic_ctype(model, objs, using):
+    if not any(f.attname == "polymorphic_ctype_id" for f in model._meta.concrete_fields):
+        return
+    ctype = ContentType.objects.db_manager(using).get_for_model(model, for_concrete_model=False)
+    for obj in objs:
+        if obj.polymorphic_ctype_id is None:
+            obj.polymorphic_ctype_id = ctype.pk
+
+
+def _insert_fields(model):
+    return [f for f in model._meta.local_concrete_fields if not getattr(f, "generated", False)]
+
+
+def _insert_root(root, batch, using):
+    """Insert ``batch`` into the root table and set the primary keys returned by the database."""
+    connection = connections[using]
+    pk = root._meta.pk
+    fields = _insert_fields(root)
+    if all(getattr(obj, pk.attname) is not None for obj in batch):
+        root._base_manager._insert(batch, fields=fields, using=using)
+        return
+
+    if not connection.features.can_return_rows_from_bulk_insert:
+        msg = f"The '{connection.vendor}' database cannot return primary keys from bulk inserts."
+        raise NotSupportedError(msg)
+    fields = [f for f in fields if f is not pk]
+    rows = root._base_manager._insert(batch, fields=fields, returning_fields=[pk], using=using)
+    for obj, row in zip(batch, rows):
+        setattr(obj, pk.attname, row[0])
+
+
+def _insert_children(chain, batch, using):
+    """Insert ``batch`` into each child table of ``chain``, pointing the parent links at the parent rows."""
+    for parent, child in zip(chain, chain[1:]):
+        link = child._meta.parents[parent]
+        for obj in batch:
+            setattr(obj, link.attname, getattr(obj, parent._meta.pk.attname))
+        child._base_manager._insert(batch, fields=_insert_fields(child), using=using)
+
+
+def bulk_create_inherited(model, objs, batch_size=BATCH_SIZE, using=None):
+    """Insert ``objs`` (instances of ``model``) in batches and set their primary keys.
+
+    Falls back to ``bulk_create`` for models without concrete parents. The database must be able to return the
+    primary keys of bulk inserted rows (PostgreSQL, SQLite 3.35+, MariaDB 10.5+) unless they are set beforehand.
+    """
+    objs = list(objs)
+    using = using or model._default_manager.db
+    if not objs:
+        return objs
+
+    chain = _inheritance_chain(model)
+    if len(chain) == 1:
+        return model._base_manager.using(using).bulk_create(objs, batch_size=batch_size)
+
+    _set_polymorphic_ctype(model, objs, using)
+    with transaction.atomic(using=using, savepoint=False):
+        for batch in batched(objs, batch_size):
+            _insert_root(chain[0], batch, using)
+            _insert_children(chain, batch, using)
+            for obj in batch:
+                obj._state.adding = False
+                obj._state.db = using
+    return objs
@@ -0,0 +1,134 @@
+"""Array operations on vertical intervals (top, bottom and vertical depth), shared by single saves and bulk loads.
+
+All values are in the base units of the fields (metres). Missing values are represented as NaN.
+"""
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db.models import Func
+
+# number of offending rows listed in a validation error message
+MAX_REPORTED = 10
+
+
+def magnitude(value, units="m"):
+    """Return ``value`` as a float in ``units``, accepting pint quantities, plain numbers and None (as NaN).
+
+    With ``units=None`` the magnitude of a quantity is returned as is.
+    """
+    if value is None:
+        return np.nan
+    if units is not None and hasattr(value, "to"):
+        return float(value.to(units).magnitude)
+    return float(getattr(value, "magnitude", value))
+
+
+def magnitudes(values, units="m"):
+    """Convert a sequence of quantities, numbers or None to a float array (see ``magnitude``)."""
+    return np.fromiter((magnitude(v, units) for v in values), dtype=float, count=len(values))
+
+
+def to_arrays(objs, fields=("top", "bottom", "vertical_depth")):
+    """Collect ``fields`` of every object into float arrays, in the order given."""
+    return [magnitudes([getattr(obj, f) for obj in objs]) for f in fields]
+
+
+def derive_depths(top, bottom, vertical_depth, positive_down=True):
+    """Fill in whichever of top, bottom and vertical depth can be derived from the other two.
+
+    Mirrors the rules of ``VerticalInterval.save()``:
+
+    - top and bottom given: the vertical depth is their absolute difference;
+    - top and vertical depth given: the bottom lies ``vertical_depth`` below the top;
+    - bottom and vertical depth given: the top lies ``vertical_depth`` above the bottom;
+    - only the vertical depth given: the interval starts at 0.
+
+    "Below" means larger values when ``positive_down`` is True, smaller values otherwise. Returns new arrays.
+    """
+    top, bottom, vertical_depth = (np.array(a, dtype=float, copy=True) for a in (top, bottom, vertical_depth))
+    sign = 1.0 if positive_down else -1.0
+    has_top, has_bottom, has_depth = ~np.isnan(top), ~np.isnan(bottom), ~np.isnan(vertical_depth)
+
+    both = has_top & has_bottom
+    vertical_depth[both] = np.abs(bottom[both] - top[both])
+
+    from_top = has_top & ~has_bottom & has_depth
+    bottom[from_top] = top[from_top] + sign * vertical_depth[from_top]
+
+    from_bottom = ~has_top & has_bottom & has_depth
+    top[from_bottom] = bottom[from_bottom] - sign * vertical_depth[from_bottom]
+
+    depth_only = ~has_top & ~has_bottom & has_depth
+    top[depth_only] = 0.0
+    bottom[depth_only] = sign * vertical_depth[depth_only]
+
+    return top, bottom, vertical_depth
+
+
+def invalid_order(top, bottom, positive_down=True):
+    """Indices of intervals whose bottom is not below their top (the ``top_above_bottom`` check constraint)."""
+    with np.errstate(invalid="ignore"):
+        ok = bottom > top if positive_down else bottom < top
+    return np.flatnonzero(~ok & ~np.isnan(top) & ~np.isnan(bottom))
+
+
+def validate_order(top, bottom, positive_down=True):
+    """Raise ``ValidationError`` if any interval would violate the ``top_above_bottom`` check constraint."""
+    invalid = invalid_order(top, bottom, positive_down)
+    if len(invalid):
+        rows = ", ".join(f"#{i} (top={top[i]:g}, bottom={bottom[i]:g})" for i in invalid[:MAX_REPORTED].tolist())
+        more = f" and {len(invalid) - MAX_REPORTED} more" if len(invalid) > MAX_REPORTED else ""
+        direction = "greater" if positive_down else "less"
+        msg = f"The bottom of an interval must be {direction} than its top: {rows}{more}."
+        raise ValidationError(msg)
+
+
+def sort_intervals(pks, top, bottom):
+    """Normalise intervals to ``(lower, upper)`` bounds and sort them by lower, then upper bound."""
+    top, bottom = np.asarray(top, dtype=float), np.asarray(bottom, dtype=float)
+    lower, upper = np.fmin(top, bottom), np.fmax(top, bottom)
+    order = np.lexsort((upper, lower))
+    return np.asarray(pks, dtype=object)[order], lower[order], upper[order]
+
+
+def find_gaps(lower, upper):
+    """Return the ``(start, end)`` of every uncovered stretch between sorted intervals."""
+    if len(lower) < 2:
+        return []
+    covered = np.maximum.accumulate(upper)[:-1]
+    starts = lower[1:]
+    gap = starts > covered
+    return list(zip(covered[gap].tolist(), starts[gap].tolist()))
+
+
+def find_overlaps(pks, lower, upper):
+    """Return ``(pk, pk)`` pairs of sorted intervals that overlap, i.e. each starts before the other ends.
+
+    Intervals that only share a boundary (one ends where the next starts) do not overlap.
+    """
+    n = len(lower)
+    if n < 2:
+        return []
+    # interval i overlaps every later interval that starts before i ends
+    ends = np.searchsorted(lower, upper, side="left")
+    counts = np.maximum(ends - np.arange(n) - 1, 0)
+    first = np.repeat(np.arange(n), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+    return list(zip(pks[first].tolist(), pks[second].tolist()))
+
+
+class DepthRange(Func):
+    """``numrange(LEAST(top, bottom), GREATEST(top, bottom), '[]')`` on PostgreSQL.
+
+    The same expression is indexed by ``CreateDepthRangeIndex``, so lookups against it (``overlap``, ``contains``,
+    ``contained_by``) are answered by the GiST index. The bounds are ordered so the expression is valid for both
+    downward (depth) and upward (height) intervals.
+    """
+
+    template = "numrange(LEAST(%(expressions)s)::numeric, GREATEST(%(expressions)s)::numeric, '[]')"
+
+    def __init__(self, top="top", bottom="bottom", **extra):
+        from django.contrib.postgres.fields import DecimalRangeField
+
+        super().__init__(top, bottom, output_field=DecimalRangeField(), **extra)
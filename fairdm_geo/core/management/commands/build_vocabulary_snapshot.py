@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fairdm_geo.conf import settings
+from fairdm_geo.vocabularies.snapshot import SnapshotStore, build_snapshot, iter_vocabularies, missing_vocabularies
+
+
+class Command(BaseCommand):
+    help = "Download and parse every fairdm_geo vocabulary and store the result in the offline vocabulary snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="Where to write the snapshot. Defaults to the FAIRDM_GEO_VOCABULARY_SNAPSHOT setting.",
+        )
+        parser.add_argument(
+            "--module",
+            action="append",
+            dest="modules",
+            help="Only include vocabularies from this module (can be given multiple times).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Do not build anything, fail if the snapshot is missing or cannot resolve every vocabulary.",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"] or settings.FAIRDM_GEO_VOCABULARY_SNAPSHOT
+        if not output:
+            msg = "No output path given and FAIRDM_GEO_VOCABULARY_SNAPSHOT is not set."
+            raise CommandError(msg)
+
+        vocabularies = list(iter_vocabularies(options["modules"]))
+        if options["check"]:
+            self.check_snapshot(vocabularies, output)
+            return
+        counts = build_snapshot(vocabularies, output)
+
+        for key, count in counts.items():
+            self.stdout.write(f"{key}: {count} concepts")
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {sum(counts.values())} concepts from {len(counts)} vocabularies to {output}")
+        )
+
+    def check_snapshot(self, vocabularies, path):
+        if not Path(path).exists():
+            msg = f"There is no vocabulary snapshot at {path}."
+            raise CommandError(msg)
+        store = SnapshotStore(path)
+        if not store.is_compatible:
+            msg = f"The vocabulary snapshot at {path} was written in an incompatible format; rebuild it."
+            raise CommandError(msg)
+        missing = missing_vocabularies(vocabularies, store)
+        if missing:
+            msg = f"The vocabulary snapshot at {path} is missing: {', '.join(missing)}"
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS(f"The vocabulary snapshot resolves all {len(vocabularies)} vocabularies."))
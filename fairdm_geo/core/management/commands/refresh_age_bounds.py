@@ -0,0 +1,18 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from fairdm_geo.core.ages import refresh_age_bounds
+from fairdm_geo.core.models import GeoDepthInterval
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate the denormalized min_age_ma/max_age_ma columns of all geological intervals, "
+        "e.g. after reloading the geological timescale."
+    )
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if issubclass(model, GeoDepthInterval):
+                count = refresh_age_bounds(model._base_manager.all())
+                self.stdout.write(f"{model._meta.label}: {count} intervals updated")
@@ -0,0 +1,27 @@
+"""Managers for concrete sample models that add queryset methods from this package.
+
+``Sample`` subclasses must keep the (polymorphic) manager and queryset provided by fairdm as their default, so
+``sample_manager`` builds a manager from fairdm's own manager and queryset classes with extra queryset methods mixed
+in, rather than replacing them::
+
+    class Borehole(GeoDepthInterval, GenericHole, SamplingLocation):
+        objects = sample_manager(GeoDepthIntervalQuerySet)
+"""
+
+from fairdm.core.models import Sample
+
+
+def sample_manager(*querysets):
+    """Return a manager instance combining fairdm's ``Sample`` manager with the methods of ``querysets``."""
+    base_manager = type(Sample.objects)
+    # django-polymorphic managers instantiate ``queryset_class`` instead of ``_queryset_class``
+    base_queryset = getattr(base_manager, "queryset_class", None) or base_manager._queryset_class
+    queryset_class = type(
+        "".join(qs.__name__.removesuffix("QuerySet") for qs in querysets) + base_queryset.__name__,
+        (*querysets, base_queryset),
+        {},
+    )
+    manager_class = base_manager.from_queryset(queryset_class)
+    if hasattr(base_manager, "queryset_class"):
+        manager_class.queryset_class = queryset_class
+    return manager_class()
@@ -4,16 +4,20 @@ from .base import (
     GenericEarthSample,
     GenericHole,
     GeoDepthInterval,
+    GeoDepthIntervalQuerySet,
     Interval,
     VerticalDepthInterval,
     VerticalInterval,
+    VerticalIntervalQuerySet,
 )
 
 __all__ = [
     "GenericEarthSample",
     "GenericHole",
     "GeoDepthInterval",
+    "GeoDepthIntervalQuerySet",
     "Interval",
     "VerticalDepthInterval",
     "VerticalInterval",
+    "VerticalIntervalQuerySet",
 ]
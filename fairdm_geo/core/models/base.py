@@ -1,13 +1,28 @@
 """Abstract base models for earth science samples and intervals."""
 
+import math
+
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import connections
 from django.db import models as dj_models
 from django.utils.translation import gettext as _
 from fairdm.core.models import Sample
 from fairdm.db import models
 from research_vocabs.fields import ConceptManyToManyField
 
+from fairdm_geo.core.ages import refresh_age_bounds
+from fairdm_geo.core.bulk import BATCH_SIZE, bulk_create_inherited
+from fairdm_geo.core.intervals import (
+    DepthRange,
+    derive_depths,
+    find_gaps,
+    find_overlaps,
+    magnitudes,
+    sort_intervals,
+    to_arrays,
+    validate_order,
+)
 from fairdm_geo.vocabularies.cgi import geosciml
 from fairdm_geo.vocabularies.stratigraphy import GeologicalTimescale
 
@@ -83,13 +98,146 @@ class Interval(GenericEarthSample):
         verbose_name_plural = _("intervals")
 
 
+def _quantity(obj, name, value):
+    """Wrap ``value`` in the base units of the quantity field ``name``."""
+    field = obj._meta.get_field(name)
+    return field.ureg.Quantity(value, field.base_units)
+
+
+def _assign_depths(obj, top, bottom, vertical_depth):
+    """Set the derived values on ``obj`` without replacing the top or bottom that were given (NaN means unknown)."""
+    if obj.top is None and not math.isnan(top):
+        obj.top = _quantity(obj, "top", top)
+    if obj.bottom is None and not math.isnan(bottom):
+        obj.bottom = _quantity(obj, "bottom", bottom)
+    if not math.isnan(vertical_depth):
+        obj.vertical_depth = _quantity(obj, "vertical_depth", vertical_depth)
+
+
+class VerticalIntervalQuerySet(dj_models.QuerySet):
+    def bulk_create_intervals(self, objs, batch_size=BATCH_SIZE, validate=True):
+        """Insert intervals in batches, deriving missing depth values for all of them at once.
+
+        ``bulk_create`` bypasses ``save()``, so the top/bottom/vertical depth derivation it performs is done here
+        with array arithmetic instead. With ``validate`` (the default) the ``top_above_bottom`` check constraint is
+        verified in memory first and a ``ValidationError`` listing the offending intervals is raised before anything is
+        written. Works for multi-table inheritance models such as ``Borehole``.
+        """
+        objs = list(objs)
+        positive_down = self.model.POSITIVE_DOWN
+        top, bottom, vertical_depth = derive_depths(*to_arrays(objs), positive_down=positive_down)
+        if validate:
+            validate_order(top, bottom, positive_down)
+        for obj, values in zip(objs, zip(top.tolist(), bottom.tolist(), vertical_depth.tolist())):
+            _assign_depths(obj, *values)
+        return bulk_create_inherited(self.model, objs, batch_size=batch_size, using=self.db)
+
+    # range queries
+    #
+    # On PostgreSQL these compare against the ``numrange`` expression indexed by ``CreateDepthRangeIndex``. Elsewhere
+    # they compare the ``top``/``bottom`` columns directly. Ranges are closed, so intervals that touch at a single
+    # depth intersect.
+
+    def _bounds(self):
+        # (shallower, deeper) field names, i.e. the fields holding the smaller and larger value
+        return ("top", "bottom") if self.model.POSITIVE_DOWN else ("bottom", "top")
+
+    def _range_filter(self, lookup, start, end):
+        from django.db.backends.postgresql.psycopg_any import NumericRange
+
+        return (
+            self.filter(top__isnull=False, bottom__isnull=False)
+            .alias(_depth_range=DepthRange())
+            .filter(**{f"_depth_range__{lookup}": NumericRange(start, end, "[]")})
+        )
+
+    def _use_range_index(self):
+        return connections[self.db].vendor == "postgresql"
+
+    def intersecting(self, start, end):
+        """Intervals that share at least one depth with ``start``-``end``, e.g. ``intersecting(120, 135)``."""
+        start, end = sorted((start, end))
+        if self._use_range_index():
+            return self._range_filter("overlap", start, end)
+        lower, upper = self._bounds()
+        return self.filter(**{f"{lower}__lte": end, f"{upper}__gte": start})
+
+    def containing(self, start, end=None):
+        """Intervals that fully contain ``start``-``end`` (or the single depth ``start``)."""
+        start, end = sorted((start, start if end is None else end))
+        if self._use_range_index():
+            return self._range_filter("contains", start, end)
+        lower, upper = self._bounds()
+        return self.filter(**{f"{lower}__lte": start, f"{upper}__gte": end})
+
+    def within(self, start, end):
+        """Intervals that lie entirely inside ``start``-``end``."""
+        start, end = sorted((start, end))
+        if self._use_range_index():
+            return self._range_filter("contained_by", start, end)
+        lower, upper = self._bounds()
+        return self.filter(**{f"{lower}__gte": start, f"{upper}__lte": end})
+
+    # log integrity checks, evaluated on sorted arrays of the interval bounds
+
+    def interval_array(self):
+        """Return ``(pks, lower, upper)`` arrays of the intervals, sorted by depth. Only three columns are loaded."""
+        rows = list(self.filter(top__isnull=False, bottom__isnull=False).values_list("pk", "top", "bottom"))
+        pks, top, bottom = (list(col) for col in zip(*rows)) if rows else ([], [], [])
+        return sort_intervals(pks, magnitudes(top), magnitudes(bottom))
+
+    def gaps(self):
+        """Return the ``(start, end)`` depth ranges between the intervals that no interval covers."""
+        _pks, lower, upper = self.interval_array()
+        return find_gaps(lower, upper)
+
+    def overlaps(self):
+        """Return ``(pk, pk)`` pairs of intervals that overlap each other (sharing only a boundary is fine)."""
+        return find_overlaps(*self.interval_array())
+
+
+# relation -> columns loaded for display, or None to load the whole row (stratigraphic units have no large columns)
+GEOLOGY_RELATIONS = {
+    "lithology": ("name", "label", "uri"),
+    "age": ("name", "label", "uri"),
+    "stratigraphy": None,
+}
+
+
+class GeoDepthIntervalQuerySet(VerticalIntervalQuerySet):
+    def with_geology(self, *relations):
+        """Prefetch the lithology, age and stratigraphy of every interval (or only the given ``relations``).
+
+        Listing the intervals then costs one query per relation in total instead of one per relation per interval.
+        Concept rows are trimmed with ``only()`` to the columns needed to display them, leaving out large columns
+        such as the concept metadata.
+        """
+        prefetches = []
+        for name in relations or GEOLOGY_RELATIONS:
+            fields = GEOLOGY_RELATIONS[name]
+            if fields is None:
+                prefetches.append(name)
+                continue
+            related = self.model._meta.get_field(name).related_model
+            columns = [f.attname for f in related._meta.concrete_fields if f.primary_key or f.name in fields]
+            prefetches.append(dj_models.Prefetch(name, queryset=related._base_manager.only(*columns)))
+        return self.prefetch_related(*prefetches)
+
+
 class VerticalInterval(dj_models.Model):
     """
     A pure field mixin for a vertical interval defined by top and bottom measurements.
     Does not inherit Sample lineage; concrete subclasses should also inherit from
     GenericEarthSample or a concrete Sample-based model to register as a Sample type.
+
+    Intervals can be loaded in bulk with ``bulk_create_intervals`` (see ``VerticalIntervalQuerySet``), which concrete
+    subclasses get by building their manager from the interval querysets, e.g.
+    ``objects = sample_manager(GeoDepthIntervalQuerySet)``.
     """
 
+    # whether larger values are further down (depths) rather than further up (heights)
+    POSITIVE_DOWN = False
+
     top = models.QuantityField(
         base_units="m",
         verbose_name=_("top"),
@@ -139,25 +287,17 @@ class VerticalInterval(dj_models.Model):
         ]
 
     def save(self, *args, **kwargs):
-        """Automatically calculate missing depth values from provided values."""
-        if self.top is not None and self.bottom is not None:
-            self.vertical_depth = abs(self.bottom - self.top)
-        elif self.top is not None and self.vertical_depth is not None:
-            # If only top and vertical_depth are provided, calculate bottom
-            self.bottom = self.top + self.vertical_depth
-        elif self.bottom is not None and self.vertical_depth is not None:
-            # If only bottom and vertical_depth are provided, calculate top
-            self.top = self.bottom - self.vertical_depth
-        elif self.top is None and self.bottom is None and self.vertical_depth is not None:
-            # If only vertical_depth is provided, set top to 0 and calculate bottom
-            self.top = 0
-            self.bottom = self.vertical_depth
+        """Automatically calculate missing depth values from provided values (see ``derive_depths``)."""
+        top, bottom, vertical_depth = derive_depths(*to_arrays([self]), positive_down=self.POSITIVE_DOWN)
+        _assign_depths(self, top[0], bottom[0], vertical_depth[0])
         super().save(*args, **kwargs)
 
 
 class VerticalDepthInterval(VerticalInterval):
     """A vertical interval where measurements are positive in the downward direction."""
 
+    POSITIVE_DOWN = True
+
     class Meta:
         abstract = True
         verbose_name = _("depth interval")
@@ -173,7 +313,13 @@ class VerticalDepthInterval(VerticalInterval):
 
 
 class GeoDepthInterval(VerticalDepthInterval):
-    """A geological depth interval with lithology, age, and stratigraphy information."""
+    """
+    A geological depth interval with lithology, age, and stratigraphy information.
+
+    The numeric extent of the assigned geologic ages is copied to ``min_age_ma`` / ``max_age_ma`` whenever ``age``
+    changes, so that intervals can be filtered by age with a plain indexed range query, e.g.
+    ``Borehole.objects.filter(min_age_ma__gte=400)`` for intervals entirely older than 400 Ma.
+    """
 
     lithology = ConceptManyToManyField(
         vocabulary=geosciml.SimpleLithology,
@@ -193,8 +339,29 @@ class GeoDepthInterval(VerticalDepthInterval):
         help_text=_("The stratigraphy of the interval."),
         blank=True,
     )
+    min_age_ma = models.FloatField(
+        verbose_name=_("minimum age (Ma)"),
+        help_text=_("The younger bound of the geologic ages assigned to the interval, in millions of years."),
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+    )
+    max_age_ma = models.FloatField(
+        verbose_name=_("maximum age (Ma)"),
+        help_text=_("The older bound of the geologic ages assigned to the interval, in millions of years."),
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+    )
 
     class Meta:
         abstract = True
         verbose_name = _("geological depth interval")
         verbose_name_plural = _("geological depth intervals")
+
+    def update_age_bounds(self):
+        """Recalculate ``min_age_ma`` and ``max_age_ma`` from the current ``age`` concepts."""
+        refresh_age_bounds(type(self)._base_manager.filter(pk=self.pk))
+        self.refresh_from_db(fields=["min_age_ma", "max_age_ma"])
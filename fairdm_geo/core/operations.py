@@ -0,0 +1,143 @@
+"""Migration operations for the abstract interval models.
+
+Concrete interval models live in other apps, so the operations take the model name and are added to the migrations
+of the app that defines the model, e.g.::
+
+    operations = [CreateDepthRangeIndex("borehole")]
+"""
+
+from django.db.migrations.operations.base import Operation
+
+INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS {name} ON {table} USING gist "
+    "(numrange(LEAST({top}, {bottom})::numeric, GREATEST({top}, {bottom})::numeric, '[]')) "
+    "WHERE {top} IS NOT NULL AND {bottom} IS NOT NULL"
+)
+
+LOCATION_INDEX_SQL = "CREATE INDEX IF NOT EXISTS {name} ON {table} USING gist ((ST_MakePoint({x}, {y})::geography))"
+
+POSITION_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS {name} ON {table} USING gist (ST_MakePoint({x}, {y}, {z}) gist_geometry_ops_nd)"
+)
+
+
+class ExpressionIndexOperation(Operation):
+    """Base class for the database specific expression indexes below, which are not part of the model state."""
+
+    reversible = True
+    suffix = None
+
+    def __init__(self, model_name, name=None):
+        self.model_name = model_name
+        self.name = name
+
+    def deconstruct(self):
+        kwargs = {"model_name": self.model_name}
+        if self.name:
+            kwargs["name"] = self.name
+        return self.__class__.__qualname__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def get_indexed_model(self, model):
+        """The model whose table is indexed, ``model`` itself unless the index is on a related table."""
+        return model
+
+    def index_name(self, model):
+        return self.name or f"{self.get_indexed_model(model)._meta.db_table[:40]}_{self.suffix}"
+
+    def is_supported(self, connection):
+        return connection.vendor == "postgresql"
+
+    def get_sql(self, model, quote_name):
+        raise NotImplementedError
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not self.is_supported(schema_editor.connection):
+            return
+        model = to_state.apps.get_model(app_label, self.model_name)
+        schema_editor.execute(self.get_sql(model, schema_editor.quote_name))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not self.is_supported(schema_editor.connection):
+            return
+        model = from_state.apps.get_model(app_label, self.model_name)
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(self.index_name(model))}")
+
+    @property
+    def migration_name_fragment(self):
+        return f"{self.model_name.lower()}_{self.suffix.rsplit('_', 1)[0]}_index"
+
+
+class CreateDepthRangeIndex(ExpressionIndexOperation):
+    """Create a GiST index on the depth range of a vertical interval model (PostgreSQL only).
+
+    The index backs the ``intersecting``/``containing``/``within`` queries of ``VerticalIntervalQuerySet``. It has
+    no effect on other databases, where those queries fall back to the plain ``top``/``bottom`` columns.
+    """
+
+    suffix = "depth_range_gist"
+
+    def get_sql(self, model, quote_name):
+        return INDEX_SQL.format(
+            name=quote_name(self.index_name(model)),
+            table=quote_name(model._meta.db_table),
+            top=quote_name(model._meta.get_field("top").column),
+            bottom=quote_name(model._meta.get_field("bottom").column),
+        )
+
+    def describe(self):
+        return f"Create a depth range GiST index on {self.model_name}"
+
+
+class CreatePositionIndex(ExpressionIndexOperation):
+    """Create an n-dimensional GiST index on the ``x``/``y``/``z`` columns of a model (PostGIS only).
+
+    The index backs the distance queries of ``IntervalPositionQuerySet`` (``ST_3DDWithin`` and ``<<->>``). It has no
+    effect on databases without PostGIS, where those queries are answered from an in-memory KD-tree.
+    """
+
+    suffix = "position_gist"
+
+    def is_supported(self, connection):
+        return getattr(connection.ops, "postgis", False)
+
+    def get_sql(self, model, quote_name):
+        return POSITION_INDEX_SQL.format(
+            name=quote_name(self.index_name(model)),
+            table=quote_name(model._meta.db_table),
+            **{axis: quote_name(model._meta.get_field(axis).column) for axis in ("x", "y", "z")},
+        )
+
+    def describe(self):
+        return f"Create a 3D position GiST index on {self.model_name}"
+
+
+class CreateLocationIndex(ExpressionIndexOperation):
+    """Create a geography GiST index on the ``x``/``y`` columns of the ``location`` of a model (PostGIS only).
+
+    The points are stored in the table of the related location model, so that is where the index is created. It
+    backs the ``nearest`` (``<->``) and ``within_km`` queries of ``SamplingLocationQuerySet`` and has no effect on
+    databases without PostGIS, where those queries are answered from an in-memory index.
+    """
+
+    suffix = "geography_gist"
+
+    def is_supported(self, connection):
+        return getattr(connection.ops, "postgis", False)
+
+    def get_indexed_model(self, model):
+        return model._meta.get_field("location").related_model
+
+    def get_sql(self, model, quote_name):
+        point = self.get_indexed_model(model)
+        return LOCATION_INDEX_SQL.format(
+            name=quote_name(self.index_name(model)),
+            table=quote_name(point._meta.db_table),
+            x=quote_name(point._meta.get_field("x").column),
+            y=quote_name(point._meta.get_field("y").column),
+        )
+
+    def describe(self):
+        return f"Create a location geography GiST index for {self.model_name}"
@@ -1,33 +1,30 @@
 import factory
+from factory.django import DjangoModelFactory
 from fairdm.factories import SampleFactory
 from fairdm.factories.generic import RandomM2M
 
 from fairdm_geo.geology.geologic_time.models import GeologicalTimescale
 from fairdm_geo.geology.lithology.models import SimpleLithology
 from fairdm_geo.geology.stratigraphy.models import StratigraphicUnit
-from fairdm_geo.models.features.sites import Borehole
+from fairdm_geo.sites.models import Borehole, SamplingLocation
 
-# class PointFactory(DjangoModelFactory):
-#     x = factory.Faker("pyfloat", min_value=-180, max_value=180)
-#     y = factory.Faker("pyfloat", min_value=-90, max_value=90)
 
-#     samples = factory.RelatedFactoryList(
-#         "fairdm.factories.SampleFactory",
-#         factory_related_name="Point",
-#         size=randint(2, 8),
-#     )
+class PointFactory(DjangoModelFactory):
+    x = factory.Faker("pyfloat", min_value=-180, max_value=180, right_digits=5)
+    y = factory.Faker("pyfloat", min_value=-90, max_value=90, right_digits=5)
 
-#     class Meta:
-#         model = "location.Point"
+    class Meta:
+        # the point model that fairdm's Sample.location points at
+        model = SamplingLocation._meta.get_field("location").related_model
 
 
 class SamplingLocationFactory(SampleFactory):
     type = factory.Faker("word")
-    location = factory.SubFactory(PointFactory, samples=None)
+    location = factory.SubFactory(PointFactory)
     elevation = factory.Faker("pyfloat", min_value=-8000, max_value=3500)
 
-    # class Meta:
-    # model = "example.GenericSite"
+    class Meta:
+        model = SamplingLocation
 
 
 class HoleFactory(SampleFactory):
@@ -54,4 +51,5 @@ class GeoDepthIntervalFactory(VerticalIntervalFactory):
 
 
 class BoreholeFactory(HoleFactory, GeoDepthIntervalFactory, SamplingLocationFactory):
-    pass
+    class Meta:
+        model = Borehole
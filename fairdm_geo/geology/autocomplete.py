@@ -0,0 +1,118 @@
+"""Select2 autocomplete views for controlled vocabularies, answered from an in-memory text index.
+
+Forms that use these views (through ``dal`` widgets) only receive the concepts matching what the user typed, instead
+of rendering every concept of the vocabulary into the page. Two kinds of sources are supported:
+
+- ``model``: an ``AbstractConcept`` subclass, searched by name and label. Call ``register(model)`` (e.g. in
+  ``AppConfig.ready``) so the index is rebuilt after rows are saved or deleted.
+- ``vocabulary``: a vocabulary class, for ``ConceptField``s that store concept names without a database table.
+  Vocabularies do not change while the process runs, so their index is never invalidated.
+
+Example::
+
+    class SimpleLithologyAutocomplete(ConceptAutocomplete):
+        model = SimpleLithology
+
+    urls = [path("simple-lithology-autocomplete/", SimpleLithologyAutocomplete.as_view(), name="...")]
+"""
+
+import hashlib
+
+from django.db.models.signals import post_delete, post_save
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
+
+from fairdm_geo.conf import settings
+from fairdm_geo.geology.search import TrigramIndex, get_search_index, invalidate_search_index
+
+# labels of the models whose index is reset by post_save/post_delete
+registry = set()
+
+
+def _reset_index(sender, **kwargs):
+    invalidate_search_index(sender._meta.label_lower)
+
+
+def register(model):
+    """Rebuild the autocomplete index of ``model`` whenever one of its rows is saved or deleted.
+
+    Bulk operations (``bulk_create``, ``QuerySet.update``) do not send signals; call
+    ``invalidate_search_index(model._meta.label_lower)`` after them.
+    """
+    if model._meta.label_lower in registry:
+        return
+    registry.add(model._meta.label_lower)
+    for signal in (post_save, post_delete):
+        signal.connect(_reset_index, sender=model, dispatch_uid=f"fairdm_geo.autocomplete.{model._meta.label_lower}")
+
+
+def concept_entries(model):
+    """Index entries (see ``TrigramIndex``) for the rows of an ``AbstractConcept`` model, matched on label and name."""
+    for pk, label in model._default_manager.values_list("pk", "label"):
+        yield pk, [label, pk], {"label": label or pk, "context": []}
+
+
+def get_concept_index(model):
+    """Return the (cached) text index over the concepts of ``model``."""
+    return get_search_index(model._meta.label_lower, lambda: TrigramIndex(concept_entries(model)))
+
+
+class ConceptAutocomplete(View):
+    """Select2 autocomplete over the concepts of a model or vocabulary.
+
+    Responds in the format expected by ``dal`` widgets (``?q=<text>&page=<n>``). Each result may carry the labels of
+    its enclosing concepts in ``context`` (see ``get_entries``), which are also appended to the displayed text.
+    Responses are cacheable for ``FAIRDM_GEO_AUTOCOMPLETE_MAX_AGE`` seconds and carry an ETag derived from the indexed
+    content, so clients revalidate with a 304 response.
+    """
+
+    model = None
+    vocabulary = None
+    paginate_by = 10
+    # number of enclosing concepts shown in the result text
+    context_depth = 2
+
+    def get_index_key(self):
+        if self.model is not None:
+            return self.model._meta.label_lower
+        return f"{self.vocabulary.__module__}.{self.vocabulary.__qualname__}"
+
+    def get_entries(self):
+        """Return ``(key, texts, data)`` for every concept, where ``data`` holds the ``label`` and ``context``."""
+        if self.model is not None:
+            return concept_entries(self.model)
+        return (
+            (name, [label, name], {"label": label or name, "context": []}) for name, label in self.vocabulary().choices
+        )
+
+    def get_index(self):
+        return get_search_index(self.get_index_key(), lambda: TrigramIndex(self.get_entries()))
+
+    def get_result(self, index, pk):
+        data = index.data[pk]
+        context = data["context"]
+        text = data["label"]
+        if context:
+            text = f"{text} ({', '.join(context[: self.context_depth])})"
+        return {"id": pk, "text": text, "selected_text": data["label"], "context": context}
+
+    def get(self, request, *args, **kwargs):
+        index = self.get_index()
+        query = request.GET.get("q", "")
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+
+        # responses only depend on the indexed content and the request parameters
+        etag = hashlib.sha1(f"{index.digest}:{page}:{query}".encode(), usedforsecurity=False).hexdigest()[:16]
+        response = get_conditional_response(request, etag=f'"{etag}"')
+        if response is None:
+            start, end = (page - 1) * self.paginate_by, page * self.paginate_by
+            keys = index.search(query, limit=end + 1)
+            results = [self.get_result(index, pk) for pk in keys[start:end]]
+            response = JsonResponse({"results": results, "pagination": {"more": len(keys) > end}})
+        response["ETag"] = f'"{etag}"'
+        patch_cache_control(response, public=True, max_age=settings.FAIRDM_GEO_AUTOCOMPLETE_MAX_AGE)
+        return response
@@ -6,3 +6,6 @@ class GeologicTimeConfig(AppConfig):
     name = "fairdm_geo.geology.geologic_time"
     label = "geologic_time"
     verbose_name = _("Geologic Time")
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,140 @@
+"""In-process indexes over the geological timescale.
+
+Questions such as "which eras overlap 250-300 Ma" or "which eras contain 66 Ma" are answered from an interval tree
+built from the ``younger_bound``/``older_bound`` columns, instead of scanning the table. Autocomplete queries are
+answered from a text index over names and labels (see ``fairdm_geo.geology.search``). Both are built on first use and
+discarded whenever a ``GeologicalTimescale`` row is saved or deleted, or the chart is reloaded with ``preload()``.
+"""
+
+import math
+import threading
+
+from fairdm_geo.geology.search import TrigramIndex, get_search_index, invalidate_search_index
+
+_trees = {}
+_lock = threading.Lock()
+
+
+class IntervalTree:
+    """A static interval tree answering overlap and containment queries in O(log n + k).
+
+    Intervals are kept sorted by their start in an implicit balanced binary tree (the middle element of each slice is
+    the node) where every node also records the largest end found in its subtree, which lets whole subtrees be skipped
+    during a query. Intervals are closed, i.e. touching intervals overlap.
+
+    Args:
+        intervals: An iterable of ``(start, end, key)`` tuples. ``key`` is returned by the queries.
+    """
+
+    def __init__(self, intervals):
+        items = sorted((min(s, e), max(s, e), key) for s, e, key in intervals)
+        self._starts = [item[0] for item in items]
+        self._ends = [item[1] for item in items]
+        self._keys = [item[2] for item in items]
+        self._max_end = [-math.inf] * len(items)
+        self._build(0, len(items))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return -math.inf
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(self._ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        return self._max_end[mid]
+
+    def overlapping(self, start, end):
+        """Return the keys of all intervals that overlap ``[start, end]``."""
+        start, end = min(start, end), max(start, end)
+        results = []
+        stack = [(0, len(self._keys))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] < start:
+                # nothing in this subtree reaches the query interval
+                continue
+            stack.append((lo, mid))
+            if self._starts[mid] <= end:
+                if self._ends[mid] >= start:
+                    results.append(self._keys[mid])
+                # everything to the right starts after this node, so is only relevant if this node starts in range
+                stack.append((mid + 1, hi))
+        return results
+
+    def containing(self, point):
+        """Return the keys of all intervals that contain ``point``."""
+        return self.overlapping(point, point)
+
+
+def _timescale_intervals(model, uncertainty):
+    rows = model._default_manager.values_list(
+        "pk", "younger_bound", "older_bound", "younger_bound_uncertainty", "older_bound_uncertainty"
+    )
+    for pk, younger, older, younger_uncertainty, older_uncertainty in rows:
+        if younger is None or older is None:
+            continue
+        if uncertainty:
+            younger = max(younger - (younger_uncertainty or 0), 0)
+            older = older + (older_uncertainty or 0)
+        yield younger, older, pk
+
+
+def get_interval_tree(model, uncertainty=False):
+    """Return the (cached) interval tree for a timescale model.
+
+    When ``uncertainty`` is True each interval is widened by its bound uncertainties, so that an age matches any era
+    it could belong to within the published error.
+    """
+    key = (model._meta.label_lower, uncertainty)
+    tree = _trees.get(key)
+    if tree is None:
+        with _lock:
+            tree = _trees.get(key)
+            if tree is None:
+                tree = _trees[key] = IntervalTree(_timescale_intervals(model, uncertainty))
+    return tree
+
+
+def invalidate_interval_trees(model=None):
+    """Discard cached trees for ``model`` (or all models), forcing a rebuild on next use."""
+    with _lock:
+        for key in list(_trees):
+            if model is None or key[0] == model._meta.label_lower:
+                del _trees[key]
+
+
+def _timescale_entries(model):
+    rows = list(model._default_manager.values_list("pk", "uri", "label", "broader"))
+    pks = {uri: pk for pk, uri, _label, _broader in rows}
+    labels = {pk: label for pk, _uri, label, _broader in rows}
+    parents = {pk: pks.get(broader) for pk, _uri, _label, broader in rows}
+
+    for pk, _uri, label, _broader in rows:
+        # the enclosing units (e.g. period and era of an epoch) along skos:broader, innermost first
+        context = []
+        seen = {pk}
+        parent = parents[pk]
+        while parent is not None and parent not in seen:
+            context.append(labels[parent])
+            seen.add(parent)
+            parent = parents[parent]
+        yield pk, [label, pk], {"label": label or pk, "context": context}
+
+
+def get_timescale_search_index(model):
+    """Return the (cached) text index over the names and labels of a timescale model.
+
+    ``index.data[pk]`` holds the display label and the labels of the enclosing units (the chain of ``skos:broader``
+    concepts), innermost first.
+    """
+    return get_search_index(model._meta.label_lower, lambda: TrigramIndex(_timescale_entries(model)))
+
+
+def invalidate_timescale_indexes(model):
+    """Discard the interval trees and the text index of ``model``."""
+    invalidate_interval_trees(model)
+    invalidate_search_index(model._meta.label_lower)
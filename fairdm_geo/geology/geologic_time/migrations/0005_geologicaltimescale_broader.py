@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geologic_time", "0004_remove_geologicaltimescale_vocab_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="geologicaltimescale",
+            name="broader",
+            field=models.URLField(blank=True, null=True, verbose_name="broader concept"),
+        ),
+    ]
@@ -1,16 +1,73 @@
 import re
 
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext as _
 from research_vocabs.models import AbstractConcept
 
 from fairdm_geo.vocabularies import stratigraphy
 
+from .index import get_interval_tree, invalidate_timescale_indexes
+
 # this captures age values from the comment field of GeologicalEra concepts
 AGE_PATTERN = re.compile(
     r"(?P<bound_type>older|younger) bound (?P<year>-?\d+(\.\d+)?)(?: \+\|-(?P<uncertainty>\d+(\.\d+)?))? Ma"
 )
 
+# the same pattern applied to a block of "<concept index>\t<comment>" lines, so that the comments of every concept in
+# the vocabulary can be parsed in a single pass
+BULK_AGE_PATTERN = re.compile(r"^(?P<index>\d+)\t.*?" + AGE_PATTERN.pattern, re.MULTILINE)
+
+
+def get_comments(concept):
+    comments = concept.attrs.get("rdfs:comment", [])
+    if not comments:
+        return []
+    if not isinstance(comments, list):
+        comments = [comments]
+    return comments
+
+
+def get_broader(concept):
+    """Return the URI of the broader concept (``skos:broader``) of ``concept``, or None."""
+    broader = concept.attrs.get("skos:broader")
+    if isinstance(broader, list | tuple):
+        broader = broader[0] if broader else None
+    return str(broader) if broader is not None else None
+
+
+def parse_age_comments(comment_lists):
+    """Parse the age bounds out of the ``rdfs:comment`` values of many concepts at once.
+
+    ``comment_lists`` contains one list of comments per concept. Returns a list with one dict of age fields
+    (``older_bound``, ``younger_bound_uncertainty``, etc.) per concept, in the same order.
+    """
+    text = "\n".join(
+        f"{i}\t{' '.join(str(c).splitlines())}" for i, comments in enumerate(comment_lists) for c in comments
+    )
+    results = [{} for _ in comment_lists]
+    for match in BULK_AGE_PATTERN.finditer(text):
+        defaults = results[int(match["index"])]
+        defaults[f"{match['bound_type']}_bound"] = abs(float(match["year"]))
+        if match["uncertainty"]:
+            defaults[f"{match['bound_type']}_bound_uncertainty"] = float(match["uncertainty"])
+    return results
+
+
+class GeologicalTimescaleQuerySet(models.QuerySet):
+    def containing(self, age, uncertainty=False):
+        """Eras that contain ``age`` (in Ma).
+
+        With ``uncertainty=True``, the era bounds are widened by their published uncertainties.
+        """
+        return self.filter(pk__in=get_interval_tree(self.model, uncertainty).containing(age))
+
+    def overlapping(self, start, end, uncertainty=False):
+        """Eras that overlap the age range between ``start`` and ``end`` (in Ma, in either order).
+
+        With ``uncertainty=True``, the era bounds are widened by their published uncertainties.
+        """
+        return self.filter(pk__in=get_interval_tree(self.model, uncertainty).overlapping(start, end))
+
 
 class GeologicalTimescale(AbstractConcept):
     vocabulary_name = None
@@ -21,6 +78,9 @@ class GeologicalTimescale(AbstractConcept):
     older_bound_uncertainty = models.FloatField(_("older bound uncertainty"), blank=True, null=True)
     younger_bound = models.FloatField(_("younger bound"), blank=True, null=True)
     younger_bound_uncertainty = models.FloatField(_("lower bound uncertainty"), blank=True, null=True)
+    broader = models.URLField(_("broader concept"), blank=True, null=True)
+
+    objects = GeologicalTimescaleQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("Geological Era")
@@ -43,29 +103,36 @@ class GeologicalTimescale(AbstractConcept):
     @classmethod
     def _get_defaults(cls, concept):
         defaults = super()._get_defaults(concept)
-
-        comments = concept.attrs.get("rdfs:comment", [])
-
-        if not comments:
-            return defaults
-
-        if not isinstance(comments, list):
-            comments = [comments]
-
-        for c in comments:
-            defaults.update(cls._parse_age_comment(c))
-
+        defaults.update(parse_age_comments([get_comments(concept)])[0])
+        defaults["broader"] = get_broader(concept)
         return defaults
 
     @classmethod
     def _parse_age_comment(cls, comment):
-        result = AGE_PATTERN.search(comment).groupdict()
-        defaults = {}
-        if result:
-            defaults[f"{result['bound_type']}_bound"] = abs(float(result["year"]))
-            if result["uncertainty"]:
-                defaults[f"{result['bound_type']}_bound_uncertainty"] = float(result["uncertainty"])
-        return defaults
+        return parse_age_comments([[comment]])[0]
+
+    @classmethod
+    def preload(cls):
+        """Load every concept in the vocabulary into the database.
+
+        All age comments are parsed in one pass and the rows are written with a single upsert, so reloading the
+        chart takes one transaction rather than a query per concept.
+        """
+        concepts = list(cls._vocabulary.concepts())
+        ages = parse_age_comments([get_comments(concept) for concept in concepts])
+
+        get_defaults = super()._get_defaults
+        objs = [
+            cls(**{"name": concept.name, **get_defaults(concept), **age, "broader": get_broader(concept)})
+            for concept, age in zip(concepts, ages)
+        ]
+        update_fields = [f.name for f in cls._meta.concrete_fields if not f.primary_key]
+
+        with transaction.atomic():
+            cls.objects.bulk_create(objs, update_conflicts=True, unique_fields=["name"], update_fields=update_fields)
+        # bulk_create does not send post_save, so the indexes have to be reset here
+        invalidate_timescale_indexes(cls)
+        return objs
 
 
 # class StratigraphicBoundary(AbstractConcept):
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .index import invalidate_timescale_indexes
+from .models import GeologicalTimescale
+
+
+@receiver([post_save, post_delete], sender=GeologicalTimescale)
+def reset_indexes(sender, **kwargs):
+    invalidate_timescale_indexes(sender)
@@ -1,12 +1,18 @@
-from dal import autocomplete
 from django.urls import path
 
+from fairdm_geo.geology.autocomplete import ConceptAutocomplete
+
+from .index import get_timescale_search_index
 from .models import GeologicalTimescale
 
 
-class GeologicalTimescaleAutocomplete(autocomplete.Select2QuerySetView):
-    def get_queryset(self):
-        return GeologicalTimescale.objects.all()
+class GeologicalTimescaleAutocomplete(ConceptAutocomplete):
+    """Autocomplete for geological eras; results list the enclosing units (e.g. period and era) as context."""
+
+    model = GeologicalTimescale
+
+    def get_index(self):
+        return get_timescale_search_index(self.model)
 
 
 urls = [
@@ -1,9 +1,16 @@
 from django.contrib import admin
 
-from .models import SimpleLithology
+from .models import RockName, SimpleLithology
 
 
 @admin.register(SimpleLithology)
 class SimpleLithologyAdmin(admin.ModelAdmin):
     list_display = ("name", "label", "uri")
     search_fields = ("name", "label")
+
+
+@admin.register(RockName)
+class RockNameAdmin(admin.ModelAdmin):
+    list_display = ("name", "code", "depth", "path")
+    search_fields = ("name", "label", "code")
+    ordering = ("path",)
@@ -6,3 +6,11 @@ class LithologyConfig(AppConfig):
     name = "fairdm_geo.geology.lithology"
     label = "lithology"
     verbose_name = _("Lithology")
+
+    def ready(self):
+        from fairdm_geo.geology.autocomplete import register
+
+        from .models import RockName, SimpleLithology
+
+        register(SimpleLithology)
+        register(RockName)
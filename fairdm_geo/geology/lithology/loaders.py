@@ -0,0 +1,67 @@
+"""Loader for the BGS Rock Classification Scheme (``data/data.csv`` in the fairdm-geo repository).
+
+The CSV is an export of a django-treebeard materialized path tree: every row carries its ``path``, ``depth`` and
+``numchild`` along with the ``label``, ``name``, ``description``, BGS ``code`` and ``url`` of the class. The rows are
+written as they are, in batched upserts, so loading the ~4,400 classes takes a handful of queries rather than an
+``add_child()`` call (and several queries) per node. The tree is validated before anything is written.
+"""
+
+import csv
+
+from django.db import router, transaction
+
+from fairdm_geo.geology.search import invalidate_search_index
+
+from .models import STEPLEN, RockName
+
+BATCH_SIZE = 1000
+
+UPDATE_FIELDS = ["path", "depth", "numchild", "label", "name", "description", "code", "uri"]
+
+
+def read_rock_names(path):
+    """Parse the CSV at ``path`` into unsaved ``RockName`` objects, checking that they form a valid tree."""
+    with open(path, newline="", encoding="utf-8") as f:
+        objs = [
+            RockName(
+                id=int(row["id"]),
+                path=row["path"],
+                depth=int(row["depth"]),
+                numchild=int(row["numchild"]),
+                label=row["label"],
+                name=row["name"],
+                description=row["description"],
+                code=row["code"],
+                uri=row["url"],
+            )
+            for row in csv.DictReader(f)
+        ]
+
+    paths = {obj.path for obj in objs}
+    for obj in objs:
+        if len(obj.path) != obj.depth * STEPLEN:
+            msg = f"Rock name {obj.id} ({obj.name}): path {obj.path!r} does not match depth {obj.depth}."
+            raise ValueError(msg)
+        if obj.depth > 1 and obj.path[:-STEPLEN] not in paths:
+            msg = f"Rock name {obj.id} ({obj.name}): the parent of path {obj.path!r} is missing."
+            raise ValueError(msg)
+    if len(paths) != len(objs):
+        msg = "The rock name CSV contains duplicate paths."
+        raise ValueError(msg)
+    return objs
+
+
+def load_rock_names(path, batch_size=BATCH_SIZE, using=None):
+    """Create or update the rock name hierarchy from the CSV at ``path``. Returns the number of rows loaded.
+
+    Rows are matched on their id. Rows already in the database but missing from the file are left untouched.
+    """
+    objs = read_rock_names(path)
+    using = using or router.db_for_write(RockName)
+    with transaction.atomic(using=using):
+        RockName.objects.using(using).bulk_create(
+            objs, batch_size=batch_size, update_conflicts=True, unique_fields=["id"], update_fields=UPDATE_FIELDS
+        )
+    # bulk_create does not send post_save, so the text index used for matching has to be reset here
+    invalidate_search_index(RockName._meta.label_lower)
+    return len(objs)
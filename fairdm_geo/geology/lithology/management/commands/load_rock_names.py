@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from fairdm_geo.geology.lithology.loaders import load_rock_names
+
+
+class Command(BaseCommand):
+    help = "Load the BGS Rock Classification Scheme hierarchy (e.g. data/data.csv) into the RockName table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the rock name CSV export.")
+        parser.add_argument("--database", default=None, help="Database to load the rock names into.")
+
+    def handle(self, *args, **options):
+        try:
+            count = load_rock_names(options["path"], using=options["database"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        self.stdout.write(self.style.SUCCESS(f"Loaded {count} rock names from {options['path']}"))
@@ -0,0 +1,100 @@
+"""Map free-text lithology names (as submitted by field teams) to controlled terms.
+
+Names are matched against ``SimpleLithology`` concepts and BGS ``RockName`` classes using the in-memory text indexes
+of ``fairdm_geo.geology.search``: an exact match on the normalized name (case, accents and punctuation ignored) first,
+then the most similar term by trigram similarity, which tolerates typos and word order ("olivine basalt" vs "basalt,
+olivine").
+
+Import columns repeat the same few names many times, so ``match_many`` normalizes the column once, matches each
+distinct name a single time and broadcasts the results back with NumPy::
+
+    matches = match_lithologies(df["lithology"])
+    df["simple_lithology"] = matches["simple_lithology"].keys
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from fairdm_geo.geology.autocomplete import get_concept_index
+from fairdm_geo.geology.search import TrigramIndex, get_search_index, normalize
+
+from .models import RockName, SimpleLithology
+
+# minimum trigram similarity for a fuzzy match
+THRESHOLD = 0.5
+
+
+def rock_name_entries():
+    # a class listed under several parents is indexed once, at its shallowest position
+    seen = set()
+    for pk, name, label in RockName.objects.order_by("depth", "path").values_list("pk", "name", "label"):
+        if name not in seen:
+            seen.add(name)
+            yield pk, [name, label], {"label": name, "context": []}
+
+
+def get_rock_name_index():
+    """Return the (cached) text index over the names and labels of ``RockName``."""
+    return get_search_index(RockName._meta.label_lower, lambda: TrigramIndex(rock_name_entries()))
+
+
+@dataclass
+class Matches:
+    """Match results for a column of names: the matched keys (None where nothing matched) and their scores.
+
+    Exact matches score 1.0, fuzzy matches their trigram similarity and unmatched names 0.0.
+    """
+
+    keys: np.ndarray
+    scores: np.ndarray
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def matched(self):
+        return self.scores > 0
+
+
+class LithologyMatcher:
+    """Matches names against the entries of a ``TrigramIndex``."""
+
+    def __init__(self, index, threshold=THRESHOLD):
+        self.index = index
+        self.threshold = threshold
+
+    def match_normalized(self, name):
+        if not name:
+            return None, 0.0
+        key = self.index.exact.get(name)
+        if key is not None:
+            return key, 1.0
+        best = self.index.similar(name, limit=1, threshold=self.threshold)
+        return best[0] if best else (None, 0.0)
+
+    def match(self, name):
+        """Return ``(key, score)`` of the best match for ``name``, or ``(None, 0.0)``."""
+        return self.match_normalized(normalize(name) if name is not None else "")
+
+    def match_many(self, names):
+        """Match every name of a sequence (list, array, pandas Series...). Returns ``Matches`` aligned with it."""
+        normalized = np.array([normalize(name) if name is not None else "" for name in names], dtype=object)
+        unique, inverse = np.unique(normalized, return_inverse=True)
+        keys = np.empty(len(unique), dtype=object)
+        scores = np.zeros(len(unique))
+        for i, name in enumerate(unique):
+            keys[i], scores[i] = self.match_normalized(name)
+        return Matches(keys[inverse], scores[inverse])
+
+
+def match_lithologies(names, threshold=THRESHOLD):
+    """Match a column of names to both ``SimpleLithology`` (by pk) and ``RockName`` (by pk).
+
+    Returns a dict of ``Matches`` with the keys ``"simple_lithology"`` and ``"rock_name"``.
+    """
+    names = list(names)
+    return {
+        "simple_lithology": LithologyMatcher(get_concept_index(SimpleLithology), threshold).match_many(names),
+        "rock_name": LithologyMatcher(get_rock_name_index(), threshold).match_many(names),
+    }
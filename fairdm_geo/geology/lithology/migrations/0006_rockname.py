@@ -0,0 +1,32 @@
+# Generated by Django 5.2.12 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lithology", "0005_remove_simplelithology_vocab_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RockName",
+            fields=[
+                ("id", models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ("path", models.CharField(max_length=255, unique=True, verbose_name="path")),
+                ("depth", models.PositiveSmallIntegerField(verbose_name="depth")),
+                ("numchild", models.PositiveIntegerField(default=0, verbose_name="number of children")),
+                ("label", models.CharField(max_length=255, verbose_name="label")),
+                ("name", models.CharField(max_length=255, verbose_name="name")),
+                ("description", models.TextField(blank=True, verbose_name="description")),
+                ("code", models.CharField(db_index=True, max_length=16, verbose_name="code")),
+                ("uri", models.URLField(blank=True, verbose_name="URI")),
+            ],
+            options={
+                "verbose_name": "Rock Name",
+                "verbose_name_plural": "Rock Names",
+                "ordering": ["path"],
+            },
+        ),
+    ]
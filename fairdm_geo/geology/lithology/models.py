@@ -4,6 +4,9 @@ from research_vocabs.models import AbstractConcept
 
 from fairdm_geo.vocabularies.cgi import geosciml
 
+# number of characters per level of a RockName path
+STEPLEN = 4
+
 
 class SimpleLithology(AbstractConcept):
     vocabulary_name = None
@@ -36,6 +39,86 @@ class SimpleLithology(AbstractConcept):
     #     return defaults
 
 
+class RockNameQuerySet(models.QuerySet):
+    def _paths(self, nodes):
+        paths = [node.path for node in nodes if isinstance(node, RockName)]
+        codes = [node for node in nodes if not isinstance(node, RockName)]
+        if codes:
+            paths += self.model._default_manager.filter(code__in=codes).values_list("path", flat=True)
+        return paths
+
+    def descendants(self, *nodes, include_self=False):
+        """Every rock name below any of ``nodes`` (``RockName`` objects or codes) in the hierarchy, in tree order.
+
+        A class can appear under several parents, in which case a code refers to each of its nodes.
+        """
+        condition = models.Q(pk__in=[])
+        for path in self._paths(nodes):
+            term = models.Q(path__startswith=path)
+            if not include_self:
+                term &= ~models.Q(path=path)
+            condition |= term
+        return self.filter(condition).order_by("path")
+
+    def ancestors(self, *nodes, include_self=False):
+        """The rock names above any of ``nodes`` (``RockName`` objects or codes), from the root down."""
+        prefixes = set()
+        for path in self._paths(nodes):
+            end = len(path) + STEPLEN if include_self else len(path)
+            prefixes.update(path[:i] for i in range(STEPLEN, end, STEPLEN))
+        return self.filter(path__in=prefixes).order_by("path")
+
+
+class RockName(models.Model):
+    """A class of the BGS Rock Classification Scheme (see ``fairdm_geo.geology.lithology.loaders``).
+
+    The hierarchy is stored as a materialized path (as used by django-treebeard): each level adds ``STEPLEN``
+    characters to the path of the parent, so the descendants of a node are the rows whose path starts with its path
+    and its ancestors are the prefixes of its path. Both are answered by the indexes on ``path``: on PostgreSQL,
+    ``unique=True`` also creates the ``varchar_pattern_ops`` index that ``startswith`` lookups need.
+    """
+
+    id = models.PositiveIntegerField(primary_key=True)
+    path = models.CharField(_("path"), max_length=255, unique=True)
+    depth = models.PositiveSmallIntegerField(_("depth"))
+    numchild = models.PositiveIntegerField(_("number of children"), default=0)
+    label = models.CharField(_("label"), max_length=255)
+    name = models.CharField(_("name"), max_length=255)
+    description = models.TextField(_("description"), blank=True)
+    code = models.CharField(_("code"), max_length=16, db_index=True)
+    uri = models.URLField(_("URI"), blank=True)
+
+    objects = RockNameQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Rock Name")
+        verbose_name_plural = _("Rock Names")
+        ordering = ["path"]
+
+    def __str__(self):
+        return self.name
+
+    def is_root(self):
+        return self.depth == 1
+
+    def is_leaf(self):
+        return self.numchild == 0
+
+    def get_parent(self):
+        if self.is_root():
+            return None
+        return RockName.objects.get(path=self.path[:-STEPLEN])
+
+    def get_children(self):
+        return RockName.objects.filter(path__startswith=self.path, depth=self.depth + 1)
+
+    def get_descendants(self, include_self=False):
+        return RockName.objects.descendants(self, include_self=include_self)
+
+    def get_ancestors(self, include_self=False):
+        return RockName.objects.ancestors(self, include_self=include_self)
+
+
 # class StratigraphicBoundary(AbstractConcept):
 #     vocabulary_name = None
 #     _vocabulary = StratigraphicBoundary()
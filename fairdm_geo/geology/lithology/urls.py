@@ -0,0 +1,18 @@
+from django.urls import path
+
+from fairdm_geo.geology.autocomplete import ConceptAutocomplete
+
+from .models import SimpleLithology
+
+
+class SimpleLithologyAutocomplete(ConceptAutocomplete):
+    model = SimpleLithology
+
+
+urls = [
+    path(
+        "simple-lithology-autocomplete/",
+        SimpleLithologyAutocomplete.as_view(),
+        name="simple-lithology-autocomplete",
+    ),
+]
@@ -0,0 +1,151 @@
+"""In-process text index for autocompleting vocabulary concepts.
+
+Vocabularies are small (hundreds to a few thousand terms) and change only when they are reloaded, so rather than
+running an ``icontains`` scan for every keystroke the terms are indexed in memory once:
+
+- a sorted list of every word, searched with ``bisect`` for prefix matches (used for short queries);
+- trigram posting lists, scored with the same similarity measure as PostgreSQL's ``pg_trgm``, which also tolerates
+  typos and word order.
+
+Indexes are cached per process under a key and rebuilt on first use after ``invalidate_search_index`` is called.
+"""
+
+import bisect
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+_indexes = {}
+_lock = threading.Lock()
+
+# queries shorter than this are answered from the prefix index only
+MIN_TRIGRAM_QUERY = 3
+
+
+def normalize(text):
+    """Lowercase, strip accents and reduce to space separated alphanumeric words."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def trigrams(text):
+    """The set of trigrams of every word in ``text``, padded like ``pg_trgm`` (two spaces in front, one behind)."""
+    grams = set()
+    for word in normalize(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Prefix and trigram search over a fixed set of entries.
+
+    Args:
+        entries: An iterable of ``(key, texts)`` or ``(key, texts, data)`` tuples. ``texts`` is a list of strings to
+            match (e.g. name and label), the first of which is used to order equally good matches. ``data`` is stored
+            in ``index.data[key]`` for building responses without going back to the database.
+    """
+
+    def __init__(self, entries):
+        self.keys = []
+        self.sort_text = []
+        self.grams = []
+        self.postings = {}
+        self.data = {}
+        # normalized text -> key, for exact lookups
+        self.exact = {}
+        words = set()
+        digest = hashlib.sha1(usedforsecurity=False)
+
+        for i, (key, texts, *data) in enumerate(entries):
+            texts = [str(t) for t in texts if t]
+            digest.update(repr((key, texts, data)).encode())
+            if data:
+                self.data[key] = data[0]
+            self.keys.append(key)
+            self.sort_text.append(normalize(texts[0]) if texts else "")
+            grams = set()
+            for text in texts:
+                self.exact.setdefault(normalize(text), key)
+                grams |= trigrams(text)
+                words.update((word, i) for word in normalize(text).split())
+            self.grams.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+        self.words = sorted(words)
+        # identifies the indexed content, e.g. for HTTP ETags; identical in every process serving the same data
+        self.digest = digest.hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _prefix_matches(self, query):
+        """Entry indices with a word starting with each word of ``query``."""
+        matches = None
+        for word in query.split():
+            found = set()
+            for position in range(bisect.bisect_left(self.words, (word, -1)), len(self.words)):
+                indexed, i = self.words[position]
+                if not indexed.startswith(word):
+                    break
+                found.add(i)
+            matches = found if matches is None else matches & found
+        return matches or set()
+
+    def _similarities(self, query):
+        """Trigram similarity (as in ``pg_trgm``) between ``query`` and every entry sharing a trigram with it."""
+        query_grams = trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+        return {i: count / (len(query_grams) + self.grams[i] - count) for i, count in shared.items()}
+
+    def similar(self, query, limit=None, threshold=0.3):
+        """Return ``(key, similarity)`` for the entries at least ``threshold`` similar to ``query``, best first."""
+        scores = {i: score for i, score in self._similarities(query).items() if score >= threshold}
+        results = sorted(scores, key=lambda i: (-scores[i], self.sort_text[i]))
+        return [(self.keys[i], scores[i]) for i in results[:limit]]
+
+    def search(self, query, limit=None, threshold=0.3):
+        """Return the keys of the entries matching ``query``, best matches first.
+
+        Entries with a word starting with every word of the query always match and rank first (those whose first text
+        starts with the query ahead of the rest). For queries of at least three characters, entries whose trigram
+        similarity to the query is at least ``threshold`` are added.
+        """
+        query = normalize(query)
+        if not query:
+            results = sorted(range(len(self.keys)), key=self.sort_text.__getitem__)
+            return [self.keys[i] for i in results[:limit]]
+
+        scores = {i: 2.0 if self.sort_text[i].startswith(query) else 1.0 for i in self._prefix_matches(query)}
+        if len(query) >= MIN_TRIGRAM_QUERY:
+            for i, similarity in self._similarities(query).items():
+                if similarity >= threshold and i not in scores:
+                    scores[i] = similarity
+
+        results = sorted(scores, key=lambda i: (-scores[i], self.sort_text[i]))
+        return [self.keys[i] for i in results[:limit]]
+
+
+def get_search_index(key, build):
+    """Return the cached index stored under ``key``, creating it with ``build()`` if needed."""
+    index = _indexes.get(key)
+    if index is None:
+        with _lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = _indexes[key] = build()
+    return index
+
+
+def invalidate_search_index(key=None):
+    """Discard the index under ``key`` (or every index), forcing a rebuild on next use."""
+    with _lock:
+        if key is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(key, None)
@@ -0,0 +1,28 @@
+from django.urls import path
+
+from fairdm_geo.geology.autocomplete import ConceptAutocomplete
+from fairdm_geo.vocabularies.cgi import geosciml
+
+
+class StratigraphicRankAutocomplete(ConceptAutocomplete):
+    vocabulary = geosciml.StratigraphicRank
+
+
+class GeneticCategoryAutocomplete(ConceptAutocomplete):
+    vocabulary = geosciml.GeneticCategory
+
+
+urls = [
+    # StratigraphicUnit.rank
+    path(
+        "stratigraphic-rank-autocomplete/",
+        StratigraphicRankAutocomplete.as_view(),
+        name="stratigraphic-rank-autocomplete",
+    ),
+    # StratigraphicUnit.genesis
+    path(
+        "genetic-category-autocomplete/",
+        GeneticCategoryAutocomplete.as_view(),
+        name="genetic-category-autocomplete",
+    ),
+]
@@ -0,0 +1,114 @@
+"""Coordinate reference system transformations for sample coordinates.
+
+Building a ``pyproj.Transformer`` is far more expensive than using one, so transformers are cached per
+(source, target) CRS pair. ``Transformer`` objects are not thread safe, so the cache is kept per thread. Coordinates
+are always transformed as whole arrays and in x/y (longitude/latitude, easting/northing) axis order, regardless of
+the axis order the CRS definition declares.
+
+Example::
+
+    lon, lat = to_wgs84(eastings, northings, utm_crs(32))
+"""
+
+import threading
+
+import numpy as np
+from pyproj import CRS, Transformer
+
+WGS84 = "EPSG:4326"
+# geographic 3D (longitude, latitude, ellipsoidal height) and earth-centred, earth-fixed cartesian coordinates
+WGS84_3D = "EPSG:4979"
+ECEF = "EPSG:4978"
+
+_local = threading.local()
+
+
+def _key(crs):
+    if isinstance(crs, CRS):
+        return crs.to_wkt()
+    if isinstance(crs, str):
+        return crs.upper()
+    return crs
+
+
+def get_transformer(source, target=WGS84):
+    """Return a cached ``Transformer`` from ``source`` to ``target`` (anything ``CRS.from_user_input`` accepts)."""
+    cache = _local.__dict__.setdefault("transformers", {})
+    key = (_key(source), _key(target))
+    try:
+        return cache[key]
+    except KeyError:
+        transformer = cache[key] = Transformer.from_crs(source, target, always_xy=True)
+        return transformer
+
+
+def clear_transformer_cache():
+    _local.__dict__.pop("transformers", None)
+
+
+def utm_crs(zone, south=False):
+    """The WGS 84 / UTM CRS for ``zone`` (1-60) in the northern or southern hemisphere."""
+    if not 1 <= zone <= 60:
+        msg = f"UTM zone must be between 1 and 60, got {zone}."
+        raise ValueError(msg)
+    return CRS.from_epsg((32700 if south else 32600) + zone)
+
+
+def transform(x, y, source, target=WGS84, z=None):
+    """Transform arrays of coordinates from ``source`` to ``target``.
+
+    Args:
+        x: Longitudes or eastings (array-like).
+        y: Latitudes or northings (array-like).
+        source: The CRS of the input coordinates.
+        target: The CRS to transform to. Defaults to WGS84 (EPSG:4326).
+        z: Optional heights, transformed along with the horizontal coordinates.
+
+    Returns:
+        ``(x, y)`` or ``(x, y, z)`` float arrays. Points that cannot be transformed are NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if z is not None:
+        z = np.asarray(z, dtype=float)
+
+    if _key(source) == _key(target):
+        result = (x.copy(), y.copy()) if z is None else (x.copy(), y.copy(), z.copy())
+    else:
+        transformer = get_transformer(source, target)
+        result = transformer.transform(x, y) if z is None else transformer.transform(x, y, z)
+        result = tuple(np.asarray(a, dtype=float) for a in result)
+
+    for a in result:
+        a[~np.isfinite(a)] = np.nan
+    return result
+
+
+def to_wgs84(x, y, source):
+    """Transform arrays of coordinates in ``source`` to WGS84 longitude/latitude."""
+    return transform(x, y, source, WGS84)
+
+
+def from_wgs84(longitude, latitude, target):
+    """Transform arrays of WGS84 longitude/latitude to ``target``."""
+    return transform(longitude, latitude, WGS84, target)
+
+
+def to_ecef(longitude, latitude, height):
+    """Transform arrays of WGS84 longitude/latitude/height (metres) to earth-centred, earth-fixed x/y/z (metres)."""
+    return transform(longitude, latitude, WGS84_3D, ECEF, z=height)
+
+
+def local_to_ecef(longitude, latitude, height, east, north, up):
+    """ECEF x/y/z of points given as east/north/up offsets (metres) from origins at longitude/latitude/height.
+
+    The offsets are rotated from the local tangent plane of each origin, so the result is exact however far the
+    points are from their origin (e.g. along a deviated borehole).
+    """
+    x0, y0, z0 = to_ecef(longitude, latitude, height)
+    lam, phi = np.radians(np.asarray(longitude, dtype=float)), np.radians(np.asarray(latitude, dtype=float))
+    east, north, up = (np.asarray(a, dtype=float) for a in (east, north, up))
+    x = x0 - np.sin(lam) * east - np.sin(phi) * np.cos(lam) * north + np.cos(phi) * np.cos(lam) * up
+    y = y0 + np.cos(lam) * east - np.sin(phi) * np.sin(lam) * north + np.cos(phi) * np.sin(lam) * up
+    z = z0 + np.cos(phi) * north + np.sin(phi) * up
+    return x, y, z
@@ -0,0 +1,183 @@
+"""Streaming loader for large, compressed Django JSON fixtures such as the plate and province dumps.
+
+``loaddata`` reads and deserializes the whole fixture before saving it one row at a time. ``load_fixture`` instead
+decompresses the file incrementally, decodes one object at a time from the top-level JSON array and writes the
+objects with ``bulk_create`` in batches, all inside a single transaction. Memory use is bounded by the batch size
+and by ``max_batch_bytes`` (the approximate size of the JSON held in the current batch), whichever is hit first.
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import re
+from collections import Counter
+
+from django.core.serializers import python
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from fairdm_geo.conf import settings
+
+OPENERS = {
+    None: open,
+    "bz2": bz2.open,
+    "gz": gzip.open,
+    "lzma": lzma.open,
+    "xz": lzma.open,
+}
+
+READ_SIZE = 64 * 1024
+
+# values that may be cut off at the end of the read buffer: literals, numbers and \u escapes (including surrogate
+# pairs, which are reported from their first half)
+LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+TRUNCATED_TAIL = re.compile(r"[-+.eE0-9]+|\\?u[0-9a-fA-F]{0,4}(?:\\(?:u[0-9a-fA-F]{0,4})?)?")
+
+
+def open_fixture(path):
+    """Open a ``.json`` fixture for reading as text, decompressing it on the fly if needed."""
+    from fairdm_geo.gis.utils import get_compression_formats, splitext
+
+    parts = splitext(os.path.basename(path))
+    _, file_format, compression = parts if parts else (None, None, None)
+    if file_format != "json":
+        msg = f"Only JSON fixtures can be streamed, got '{path}'."
+        raise ValueError(msg)
+    if compression is not None and compression not in get_compression_formats():
+        msg = f"Unsupported compression format '{compression}'. Use one of {get_compression_formats()}."
+        raise ValueError(msg)
+    return OPENERS[compression](path, "rt", encoding="utf-8")
+
+
+def _is_truncated(error, buffer):
+    """Whether ``error``, raised decoding ``buffer``, could go away once more of the file is read.
+
+    That is the case if the value ends early: inside a string, or in a number, literal or ``\\u`` escape that is
+    cut off at the end of the buffer. Any other error means the JSON is invalid.
+    """
+    if error.msg.startswith("Unterminated string"):
+        return True
+    tail = buffer[error.pos :]
+    return any(literal.startswith(tail) for literal in LITERALS) or bool(TRUNCATED_TAIL.fullmatch(tail))
+
+
+def _decode(decoder, buffer, pos, eof):
+    """Decode the value at ``pos``, or return None if it continues past the end of the buffer."""
+    try:
+        return decoder.raw_decode(buffer, pos)
+    except json.JSONDecodeError as e:
+        if eof or not _is_truncated(e, buffer):
+            raise
+        return None
+
+
+def iter_json_array(fp, read_size=READ_SIZE):
+    """Yield ``(item, size)`` for every object in the top-level JSON array read from ``fp``.
+
+    Only the object currently being decoded is held in memory. ``size`` is the length of the object's JSON text.
+    Invalid JSON raises a ``ValueError`` as soon as it is read.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+    chunk_size = read_size
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != "[":
+                    msg = "Expected the fixture to contain a JSON array."
+                    raise ValueError(msg)
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            decoded = _decode(decoder, buffer, pos, eof)
+            if decoded:
+                item, end = decoded
+                yield item, end - pos
+                pos = end
+                chunk_size = read_size
+                continue
+            # the object continues past the end of the buffer; read ahead in growing steps so that very large
+            # objects (e.g. detailed polygons) are not re-parsed many times
+            chunk_size *= 2
+
+        if eof:
+            if started:
+                msg = "Unexpected end of fixture, the JSON array is not closed."
+                raise ValueError(msg)
+            return
+
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _flush(model, objs, field_names, using):
+    pk = model._meta.pk
+    update_fields = [f.name for f in model._meta.concrete_fields if not f.primary_key and f.name in field_names]
+    model._base_manager.using(using).bulk_create(
+        objs,
+        update_conflicts=bool(update_fields),
+        ignore_conflicts=not update_fields,
+        unique_fields=[pk.name] if update_fields else None,
+        update_fields=update_fields or None,
+    )
+
+
+def load_fixture(path, batch_size=None, max_batch_bytes=None, using=DEFAULT_DB_ALIAS):
+    """Stream a (compressed) JSON fixture into the database.
+
+    Existing rows with the same primary key are updated, as with ``loaddata``. Fields in the fixture that no longer
+    exist on the model are ignored.
+
+    Args:
+        path: Path to a ``.json`` file, optionally compressed (``.json.xz``, ``.json.gz``, ...).
+        batch_size: Maximum number of objects per ``bulk_create``. Defaults to ``FAIRDM_GEO_FIXTURE_BATCH_SIZE``.
+        max_batch_bytes: Maximum amount of fixture JSON held in memory per batch. Defaults to
+            ``FAIRDM_GEO_FIXTURE_MAX_BATCH_BYTES``.
+        using: The database alias to load into.
+
+    Returns:
+        A ``Counter`` mapping each model to the number of objects loaded.
+    """
+    batch_size = batch_size or settings.FAIRDM_GEO_FIXTURE_BATCH_SIZE
+    max_batch_bytes = max_batch_bytes or settings.FAIRDM_GEO_FIXTURE_MAX_BATCH_BYTES
+
+    counts = Counter()
+    batch, batch_model, batch_fields, batch_bytes = [], None, set(), 0
+
+    with open_fixture(path) as fp, transaction.atomic(using=using):
+        for item, size in iter_json_array(fp):
+            deserialized = next(iter(python.Deserializer([item], using=using, ignorenonexistent=True)))
+            obj = deserialized.object
+            model = type(obj)
+
+            if batch and (model is not batch_model or len(batch) >= batch_size or batch_bytes >= max_batch_bytes):
+                _flush(batch_model, batch, batch_fields, using)
+                batch, batch_fields, batch_bytes = [], set(), 0
+
+            if deserialized.m2m_data or deserialized.deferred_fields:
+                # relations need the saved instance, which bulk_create cannot provide on every backend
+                deserialized.save(using=using)
+                deserialized.save_deferred_fields(using=using)
+            else:
+                batch.append(obj)
+                batch_model = model
+                batch_fields.update(item.get("fields", {}))
+                batch_bytes += size
+            counts[model] += 1
+
+        if batch:
+            _flush(batch_model, batch, batch_fields, using)
+
+    return counts
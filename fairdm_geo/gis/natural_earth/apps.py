@@ -2,8 +2,8 @@ from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
 
-class TectonicPlateConfig(AppConfig):
+class NaturalEarthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "fairdm_geo.gis.plates"
-    verbose_name = _("Tectonic Plate")
-    verbose_name_plural = _("Tectonic Plates")
+    name = "fairdm_geo.gis.natural_earth"
+    label = "natural_earth"
+    verbose_name = _("Natural Earth")
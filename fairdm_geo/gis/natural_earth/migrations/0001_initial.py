@@ -0,0 +1,60 @@
+# Generated by Django 5.2.12 on 2026-10-18 10:06
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Plate",
+            fields=[
+                (
+                    "geom_low",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        editable=False,
+                        help_text="Geometry simplified for small scale (zoomed out) maps.",
+                        null=True,
+                        srid=4326,
+                    ),
+                ),
+                (
+                    "geom_medium",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        editable=False, help_text="Geometry simplified for medium scale maps.", null=True, srid=4326
+                    ),
+                ),
+                (
+                    "geom_high",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        editable=False,
+                        help_text="Geometry simplified for large scale (zoomed in) maps.",
+                        null=True,
+                        srid=4326,
+                    ),
+                ),
+                ("id", models.PositiveSmallIntegerField(help_text="plate ID", primary_key=True, serialize=False)),
+                ("name", models.CharField(help_text="plate name", max_length=100)),
+                ("reference", models.CharField(help_text="reference", max_length=100, null=True)),
+                ("plate", models.CharField(help_text="plate", max_length=100)),
+                ("subplate_id", models.IntegerField(help_text="Latitude in decimal degrees")),
+                ("subplate_code", models.CharField(help_text="Latitude in decimal degrees", max_length=3)),
+                ("subplate", models.CharField(help_text="Latitude in decimal degrees", max_length=128)),
+                ("type", models.CharField(help_text="Latitude in decimal degrees", max_length=64)),
+                ("crust_type", models.CharField(help_text="Latitude in decimal degrees", max_length=12)),
+                ("sea_name", models.CharField(help_text="Latitude in decimal degrees", max_length=100, null=True)),
+                ("domain", models.CharField(help_text="Latitude in decimal degrees", max_length=100, null=True)),
+                ("area", models.FloatField(help_text="Latitude in decimal degrees")),
+                ("geom", django.contrib.gis.db.models.fields.MultiPolygonField(srid=4326)),
+            ],
+            options={
+                "verbose_name": "Tectonic Plate",
+                "verbose_name_plural": "Tectonic Plates",
+            },
+        ),
+    ]
@@ -1,8 +1,10 @@
 from django.contrib.gis.db import models
 from django.utils.translation import gettext as _
 
+from fairdm_geo.gis.simplify import SimplifiedGeometryModel
 
-class Plate(models.Model):
+
+class Plate(SimplifiedGeometryModel):
     fixtures = "https://github.com/FairDM/gis_fixtures_dump/raw/main/plates.json.xz"
 
     id = models.PositiveSmallIntegerField(
@@ -50,4 +52,3 @@ class Plate(models.Model):
     class Meta:
         verbose_name = _("Tectonic Plate")
         verbose_name_plural = _("Tectonic Plates")
-        editable = False
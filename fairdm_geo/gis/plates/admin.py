@@ -1,10 +1,12 @@
 from django.contrib.gis import admin
 
+from fairdm_geo.gis.simplify import SimplifiedGeometryAdminMixin
+
 from .models import Plate
 
 
 @admin.register(Plate)
-class PlateAdmin(admin.GeoModelAdmin):
+class PlateAdmin(SimplifiedGeometryAdminMixin, admin.GISModelAdmin):
     change_list_template = "admin/gis/change_list.html"
 
     list_display = ["name", "subplate", "plate", "type", "crust_type", "domain", "area"]
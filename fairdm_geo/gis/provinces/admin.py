@@ -1,10 +1,12 @@
 from django.contrib.gis import admin
 
+from fairdm_geo.gis.simplify import SimplifiedGeometryAdminMixin
+
 from .models import Province
 
 
 @admin.register(Province)
-class ProvinceAdmin(admin.GeoModelAdmin):
+class ProvinceAdmin(SimplifiedGeometryAdminMixin, admin.GISModelAdmin):
     change_list_template = "admin/gis/change_list.html"
     list_display = ["name", "type", "group", "last_orogen", "crust_type"]
     search_fields = [
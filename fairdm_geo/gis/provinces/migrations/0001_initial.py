@@ -0,0 +1,60 @@
+# Generated by Django 5.2.12 on 2026-10-18 10:05
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Province",
+            fields=[
+                (
+                    "geom_low",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        editable=False,
+                        help_text="Geometry simplified for small scale (zoomed out) maps.",
+                        null=True,
+                        srid=4326,
+                    ),
+                ),
+                (
+                    "geom_medium",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        editable=False, help_text="Geometry simplified for medium scale maps.", null=True, srid=4326
+                    ),
+                ),
+                (
+                    "geom_high",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        editable=False,
+                        help_text="Geometry simplified for large scale (zoomed in) maps.",
+                        null=True,
+                        srid=4326,
+                    ),
+                ),
+                ("id", models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=80)),
+                ("type", models.CharField(max_length=80)),
+                ("reference", models.CharField(max_length=80, null=True)),
+                ("group", models.CharField(max_length=80, null=True)),
+                ("last_orogen", models.CharField(max_length=80, null=True)),
+                ("continent", models.CharField(max_length=80, null=True)),
+                ("conjugate_1", models.CharField(max_length=80, null=True)),
+                ("comment", models.CharField(max_length=254, null=True)),
+                ("crust_type", models.CharField(max_length=12)),
+                ("conjugate_2", models.CharField(max_length=64, null=True)),
+                ("area", models.FloatField()),
+                ("geom", django.contrib.gis.db.models.fields.MultiPolygonField(srid=4326)),
+            ],
+            options={
+                "verbose_name": "Geologic Province",
+                "verbose_name_plural": "Geologic Provinces",
+            },
+        ),
+    ]
@@ -1,8 +1,10 @@
 from django.contrib.gis.db import models
 from django.utils.translation import gettext as _
 
+from fairdm_geo.gis.simplify import SimplifiedGeometryModel
 
-class Province(models.Model):
+
+class Province(SimplifiedGeometryModel):
     fixtures = "https://github.com/FairDM/gis_fixtures_dump/raw/main/provinces.json.xz"
 
     id = models.PositiveSmallIntegerField(primary_key=True)
@@ -0,0 +1,3 @@
+from fairdm_geo.gis.urls import tile_urls
+
+urls = tile_urls("provinces")
@@ -0,0 +1,120 @@
+"""Precomputed, simplified copies of large polygon geometries.
+
+The plate and province polygons are stored at full resolution, which is far more detail than a list view or a
+zoomed-out map can display. Models inheriting from ``SimplifiedGeometryModel`` keep simplified copies of ``geom`` at a
+few tolerances next to the original, and ``geometry_for_zoom`` picks the coarsest one that still looks right at a
+given web map zoom level.
+
+The copies are regenerated with ``refresh_simplified_geometries`` whenever the fixtures are (re)loaded.
+"""
+
+from django.apps import apps
+from django.contrib.gis.db import models
+from django.contrib.gis.geos import MultiPolygon
+from django.db import connections
+from django.db.models import Func
+from django.utils.translation import gettext as _
+
+# simplified field name -> (simplification tolerance in degrees, maximum zoom level the field is used for)
+SIMPLIFIED_GEOMETRIES = {
+    "geom_low": (0.1, 3),
+    "geom_medium": (0.01, 6),
+    "geom_high": (0.001, 9),
+}
+
+BATCH_SIZE = 100
+
+
+class SimplifyPreserveTopology(Func):
+    """``ST_Multi(ST_SimplifyPreserveTopology(geom, tolerance))`` on PostGIS."""
+
+    template = "ST_Multi(ST_SimplifyPreserveTopology(%(expressions)s))"
+    output_field = models.MultiPolygonField(srid=4326)
+
+
+class SimplifiedGeometryModel(models.Model):
+    """Abstract base for polygon layers that keep simplified copies of their ``geom`` field."""
+
+    geom_low = models.MultiPolygonField(
+        srid=4326,
+        null=True,
+        editable=False,
+        help_text=_("Geometry simplified for small scale (zoomed out) maps."),
+    )
+    geom_medium = models.MultiPolygonField(
+        srid=4326,
+        null=True,
+        editable=False,
+        help_text=_("Geometry simplified for medium scale maps."),
+    )
+    geom_high = models.MultiPolygonField(
+        srid=4326,
+        null=True,
+        editable=False,
+        help_text=_("Geometry simplified for large scale (zoomed in) maps."),
+    )
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def geometry_field_for_zoom(cls, zoom):
+        """Name of the coarsest geometry field that is detailed enough for a web map at ``zoom``."""
+        for field, (_tolerance, max_zoom) in SIMPLIFIED_GEOMETRIES.items():
+            if zoom <= max_zoom:
+                return field
+        return "geom"
+
+    def geometry_for_zoom(self, zoom):
+        """Return the geometry to draw at ``zoom``, falling back to the full geometry if no copy was generated."""
+        return getattr(self, self.geometry_field_for_zoom(zoom)) or self.geom
+
+
+def _simplify(geom, tolerance):
+    simplified = geom.simplify(tolerance, preserve_topology=True)
+    if simplified.geom_type == "Polygon":
+        simplified = MultiPolygon(simplified, srid=geom.srid)
+    return simplified
+
+
+def refresh_simplified_geometries(queryset, batch_size=BATCH_SIZE):
+    """Regenerate the simplified geometries of every row in ``queryset``.
+
+    PostGIS does the work in one ``UPDATE`` per tolerance. Other backends simplify with GEOS in Python and write the
+    results back in batches.
+    """
+    if getattr(connections[queryset.db].ops, "postgis", False):
+        queryset.update(
+            **{
+                field: SimplifyPreserveTopology("geom", tolerance)
+                for field, (tolerance, _max_zoom) in SIMPLIFIED_GEOMETRIES.items()
+            }
+        )
+        return
+
+    fields = list(SIMPLIFIED_GEOMETRIES)
+    objs = []
+    for obj in queryset.only("pk", "geom").iterator(chunk_size=batch_size):
+        for field, (tolerance, _max_zoom) in SIMPLIFIED_GEOMETRIES.items():
+            setattr(obj, field, _simplify(obj.geom, tolerance))
+        objs.append(obj)
+        if len(objs) >= batch_size:
+            queryset.model._base_manager.bulk_update(objs, fields)
+            objs = []
+    if objs:
+        queryset.model._base_manager.bulk_update(objs, fields)
+
+
+def get_simplified_models():
+    return [model for model in apps.get_models() if issubclass(model, SimplifiedGeometryModel)]
+
+
+class SimplifiedGeometryAdminMixin:
+    """Keeps the (potentially huge) geometry columns out of the admin change list query."""
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name and match.url_name.endswith("_changelist"):
+            queryset = queryset.defer("geom", *SIMPLIFIED_GEOMETRIES)
+        return queryset
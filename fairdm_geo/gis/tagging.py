@@ -0,0 +1,137 @@
+"""Batch assignment of sampling locations to the polygons that contain them (tectonic plates, geologic provinces).
+
+Rather than issuing one ``geom__contains`` query per site, all sites in a queryset are resolved together:
+
+- on PostGIS, with a single query that annotates each site with a correlated, index-backed ``ST_Contains`` lookup
+  per layer;
+- on other backends (e.g. SpatiaLite), by loading the layer polygons once into an in-memory STRtree (requires
+  ``shapely``) and querying every point against it in bulk.
+
+Example::
+
+    tags = tag_locations(SamplingLocation.objects.filter(dataset=dataset))
+    tags[site.pk]  # {"plate": 12, "province": 301}
+"""
+
+import numpy as np
+from django.apps import apps
+from django.contrib.gis.db.models import PointField
+from django.db import connections
+from django.db.models import F, FloatField, Func, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+# layer name -> model label of the polygon model
+DEFAULT_LAYERS = {
+    "plate": "plates.Plate",
+    "province": "provinces.Province",
+}
+
+# number of points queried against the STRtree at once
+CHUNK_SIZE = 100_000
+
+
+class MakePoint(Func):
+    template = "ST_SetSRID(ST_MakePoint(%(expressions)s), 4326)"
+    output_field = PointField(srid=4326)
+
+
+def get_layers(layers=None):
+    """Resolve a ``{name: model or label}`` mapping to installed models, skipping apps that are not installed."""
+    resolved = {}
+    for name, model in (layers or DEFAULT_LAYERS).items():
+        if isinstance(model, str):
+            try:
+                model = apps.get_model(model)
+            except LookupError:
+                continue
+        resolved[name] = model
+    return resolved
+
+
+def tag_locations(queryset, layers=None, location_field="location", method="auto"):
+    """Find the containing polygon of every layer for each sample in ``queryset``.
+
+    Args:
+        queryset: Samples with a point location, e.g. ``SamplingLocation.objects.all()``.
+        layers: Mapping of layer names to polygon models (or model labels). Defaults to plates and provinces.
+        location_field: Name of the relation holding the ``x`` (longitude) / ``y`` (latitude) coordinates.
+        method: ``"database"`` (PostGIS spatial join), ``"memory"`` (STRtree) or ``"auto"`` to pick based on the
+            database backend.
+
+    Returns:
+        A dict mapping each sample pk to ``{layer name: polygon pk or None}``. Samples without coordinates are
+        omitted.
+    """
+    layers = get_layers(layers)
+    queryset = queryset.filter(**{f"{location_field}__x__isnull": False, f"{location_field}__y__isnull": False})
+    if method == "auto":
+        method = "database" if getattr(connections[queryset.db].ops, "postgis", False) else "memory"
+    if method == "database":
+        return _tag_in_database(queryset, layers, location_field)
+    if method == "memory":
+        return _tag_in_memory(queryset, layers, location_field)
+    msg = f"Unknown tagging method '{method}'. Use 'auto', 'database' or 'memory'."
+    raise ValueError(msg)
+
+
+def _tag_in_database(queryset, layers, location_field):
+    x = Cast(F(f"{location_field}__x"), FloatField())
+    y = Cast(F(f"{location_field}__y"), FloatField())
+    queryset = queryset.annotate(_tag_point=MakePoint(x, y))
+    queryset = queryset.annotate(
+        **{
+            f"_tag_{name}": Subquery(
+                model._default_manager.filter(geom__contains=OuterRef("_tag_point")).values("pk")[:1]
+            )
+            for name, model in layers.items()
+        }
+    )
+    fields = [f"_tag_{name}" for name in layers]
+    return {
+        row[0]: dict(zip(layers, row[1:]))
+        for row in queryset.values_list("pk", *fields).iterator(chunk_size=CHUNK_SIZE)
+    }
+
+
+def _load_tree(model):
+    import shapely
+
+    rows = list(model._default_manager.values_list("pk", "geom"))
+    polygons = shapely.from_wkb([bytes(geom.wkb) for _, geom in rows])
+    return [pk for pk, _ in rows], shapely.STRtree(polygons)
+
+
+def _tag_in_memory(queryset, layers, location_field):
+    try:
+        import shapely
+    except ImportError as e:
+        msg = "In-memory spatial tagging requires shapely. Install it with `pip install fairdm-geo[spatial]`."
+        raise ImportError(msg) from e
+
+    rows = list(queryset.values_list("pk", f"{location_field}__x", f"{location_field}__y"))
+    pks = [row[0] for row in rows]
+    x = np.array([row[1] for row in rows], dtype=float)
+    y = np.array([row[2] for row in rows], dtype=float)
+
+    result = {pk: dict.fromkeys(layers) for pk in pks}
+    for name, model in layers.items():
+        polygon_pks, tree = _load_tree(model)
+        if not polygon_pks:
+            continue
+        for start in range(0, len(pks), CHUNK_SIZE):
+            points = shapely.points(x[start : start + CHUNK_SIZE], y[start : start + CHUNK_SIZE])
+            for i, j in match_points(tree, points):
+                result[pks[start + i]][name] = polygon_pks[j]
+    return result
+
+
+def match_points(tree, points):
+    """Pair the index of each point with the index of the first polygon in ``tree`` that contains it.
+
+    Like ``ST_Contains`` on PostGIS, a point must lie in the interior of a polygon: points on a polygon boundary
+    (including the border shared by two neighbouring polygons) match nothing.
+    """
+    point_idx, polygon_idx = tree.query(points, predicate="within")
+    # only overlapping polygons can contain the same point; keep the first match
+    point_idx, first = np.unique(point_idx, return_index=True)
+    return zip(point_idx.tolist(), polygon_idx[first].tolist())
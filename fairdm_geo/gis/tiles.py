@@ -0,0 +1,152 @@
+"""Mapbox Vector Tiles for the GIS polygon layers.
+
+Tiles are rendered by PostGIS (``ST_AsMVT``, PostGIS 3.0+) from the simplified geometry that matches the tile zoom
+level, clipped to the tile envelope, and stored on disk under ``<layer>/<version>/<z>/<x>/<y>.pbf`` so that each tile
+is only rendered once per load of the layer data.
+
+The version is a token stored next to the tiles of each layer. ``load_fixtures`` replaces it after every load (see
+``clear_tile_cache``), so tiles rendered from earlier data are never served again, even by processes that were in the
+middle of rendering while the data changed. Point ``FAIRDM_GEO_TILE_CACHE_DIR`` at storage shared by all servers if
+fixtures may be loaded from a different host than the one serving tiles.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.db import connections
+
+from fairdm_geo.conf import settings
+
+# url name of the layer -> (model label, attribute fields included in the tile)
+LAYERS = {
+    "plates": ("plates.Plate", ["id", "name", "plate", "type", "crust_type"]),
+    "provinces": ("provinces.Province", ["id", "name", "type", "group", "crust_type"]),
+    "natural-earth": ("natural_earth.Plate", ["id", "name", "plate", "type", "crust_type"]),
+}
+
+# file holding the current version of a layer, next to its tiles
+VERSION_FILE = "version"
+
+EXTENT = 4096
+BUFFER = 64
+
+TILE_SQL = """
+WITH bounds AS (
+    SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+),
+features AS (
+    SELECT
+        ST_AsMVTGeom(ST_Transform({geometry}, 3857), bounds.geom, {extent}, {buffer}, true) AS mvt_geom,
+        {attributes}
+    FROM {table} AS t, bounds
+    WHERE t.{geom} && ST_Transform(bounds.geom, 4326)
+)
+SELECT ST_AsMVT(features.*, %(layer)s, {extent}, 'mvt_geom') FROM features WHERE mvt_geom IS NOT NULL
+"""
+
+
+def get_layer_model(layer):
+    """Return the model serving ``layer``, or None if the layer is unknown or its app is not installed."""
+    if layer not in LAYERS:
+        return None
+    try:
+        return apps.get_model(LAYERS[layer][0])
+    except LookupError:
+        return None
+
+
+def get_cache_dir():
+    return Path(settings.FAIRDM_GEO_TILE_CACHE_DIR or Path(tempfile.gettempdir()) / "fairdm_geo_tiles")
+
+
+def _write_atomic(path, data, replace=True):
+    """Write ``data`` through a temporary file so that concurrent readers never see a partial file.
+
+    With ``replace=False`` an existing file at ``path`` is kept.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fp:
+        fp.write(data)
+    if replace:
+        os.replace(tmp, path)
+        return
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp)
+
+
+def _new_version():
+    return f"{time.time_ns():x}".encode()
+
+
+def fixtures_version(layer):
+    """The version of the layer data that the cached tiles of ``layer`` were rendered from.
+
+    A version is started on first use and replaced by ``clear_tile_cache`` whenever the layer data is (re)loaded.
+    """
+    path = get_cache_dir() / layer / VERSION_FILE
+    if not path.exists():
+        # when several processes get here at once, the first one to store its version wins
+        _write_atomic(path, _new_version(), replace=False)
+    return path.read_text()
+
+
+def tile_path(layer, z, x, y):
+    return get_cache_dir() / layer / fixtures_version(layer) / str(z) / str(x) / f"{y}.pbf"
+
+
+def render_tile(layer, model, z, x, y, using=None):
+    """Render a single tile with PostGIS."""
+    connection = connections[using or model._default_manager.db]
+    qn = connection.ops.quote_name
+
+    geom_field = model.geometry_field_for_zoom(z) if hasattr(model, "geometry_field_for_zoom") else "geom"
+    geom = qn(model._meta.get_field("geom").column)
+    geometry = f"t.{geom}"
+    if geom_field != "geom":
+        geometry = f"COALESCE(t.{qn(model._meta.get_field(geom_field).column)}, t.{geom})"
+
+    attributes = ", ".join(f"t.{qn(model._meta.get_field(f).column)} AS {qn(f)}" for f in LAYERS[layer][1])
+    sql = TILE_SQL.format(
+        geometry=geometry,
+        geom=geom,
+        attributes=attributes,
+        table=qn(model._meta.db_table),
+        extent=EXTENT,
+        buffer=BUFFER,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"z": z, "x": x, "y": y, "layer": layer})
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] else b""
+
+
+def get_tile(layer, model, z, x, y):
+    """Return the tile from the on-disk cache, rendering and storing it first if needed."""
+    path = tile_path(layer, z, x, y)
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+
+    tile = render_tile(layer, model, z, x, y)
+    _write_atomic(path, tile)
+    return tile
+
+
+def clear_tile_cache(layer=None):
+    """Start a new version of ``layer`` (or all layers) and remove the tiles rendered for earlier versions."""
+    for name in [layer] if layer else LAYERS:
+        version = _new_version()
+        _write_atomic(get_cache_dir() / name / VERSION_FILE, version)
+        for path in (get_cache_dir() / name).iterdir():
+            if path.is_dir() and path.name != version.decode():
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from .views import TileView
+
+
+def tile_urls(layer):
+    """URL patterns serving the vector tiles of ``layer``, for the ``urls`` module of the app providing the layer."""
+    return [
+        path(
+            f"tiles/{layer}/<int:z>/<int:x>/<int:y>.pbf",
+            TileView.as_view(),
+            {"layer": layer},
+            name=f"{layer}-tile",
+        ),
+    ]
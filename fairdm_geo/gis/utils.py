@@ -1,7 +1,13 @@
 # import requests
+import os
+
 from django.core.management import call_command
 from django.db.utils import DEFAULT_DB_ALIAS
 
+from fairdm_geo.gis.loaders import load_fixture
+from fairdm_geo.gis.simplify import get_simplified_models, refresh_simplified_geometries
+from fairdm_geo.gis.tiles import clear_tile_cache
+
 
 def get_compression_formats():
     return ["bz2", "gz", "lzma", "xz"]
@@ -29,15 +35,32 @@ def save_uploaded_file_on_disk(uploaded_file, destination_path):
 
 
 def load_fixtures(fixtures):
-    call_command(
-        "loaddata",
-        fixtures,
-        **{
-            "ignore": True,
-            "database": DEFAULT_DB_ALIAS,
-            "verbosity": 1,
-        },
-    )
+    """Load one or more fixtures, then rebuild the simplified geometries and clear the tile cache.
+
+    JSON fixture files (optionally compressed) are streamed in batches with ``load_fixture``. Anything else, such as
+    fixture labels resolved through ``FIXTURE_DIRS``, is handed to ``loaddata``.
+    """
+    if isinstance(fixtures, (str, os.PathLike)):
+        fixtures = [fixtures]
+
+    for fixture in fixtures:
+        parts = splitext(os.path.basename(fixture))
+        if os.path.isfile(fixture) and parts and parts[1] == "json":
+            load_fixture(fixture, using=DEFAULT_DB_ALIAS)
+        else:
+            call_command(
+                "loaddata",
+                fixture,
+                **{
+                    "ignore": True,
+                    "database": DEFAULT_DB_ALIAS,
+                    "verbosity": 1,
+                },
+            )
+
+    for model in get_simplified_models():
+        refresh_simplified_geometries(model._default_manager.all())
+    clear_tile_cache()
 
 
 # def load_online_fixtures(url):
@@ -0,0 +1,28 @@
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views import View
+
+from fairdm_geo.conf import settings
+
+from .tiles import get_layer_model, get_tile
+
+MAX_ZOOM = 22
+
+
+class TileView(View):
+    """Serve a Mapbox Vector Tile for one of the GIS layers in ``fairdm_geo.gis.tiles.LAYERS``."""
+
+    content_type = "application/vnd.mapbox-vector-tile"
+
+    def get(self, request, layer, z, x, y):
+        model = get_layer_model(layer)
+        if model is None or z > MAX_ZOOM or not (0 <= x < 2**z and 0 <= y < 2**z):
+            raise Http404
+
+        if not getattr(connections[model._default_manager.db].ops, "postgis", False):
+            return HttpResponse("Vector tiles require a PostGIS database.", status=501)
+
+        response = HttpResponse(get_tile(layer, model, z, x, y), content_type=self.content_type)
+        patch_cache_control(response, public=True, max_age=settings.FAIRDM_GEO_TILE_MAX_AGE)
+        return response
@@ -1,27 +1,318 @@
-# """Provides a specialized importer for samples with a location field."""
+"""Bulk import of sampling locations and boreholes from tabular data.
 
-# from fairdm.core.models import Sample
-# from fairdm_geo.location.models import Point
+Coordinates are handled column-wise with NumPy: latitude and longitude are parsed into float arrays, range checked in
+one pass and deduplicated in memory, so each distinct coordinate pair resolves to a single location ``Point`` no matter
+how many rows share it. Coordinates recorded in another CRS (e.g. a local UTM grid) are reprojected to WGS84 as whole
+arrays before validation. Existing points are looked up in batches, new points and the samples themselves are written
+with batched inserts.
 
+Example::
 
-# class SampleLocationImporterMixin:
-#     location_fields = {
-#         "x": "x",
-#         "y": "y",
-#     }
+    with open("sites.csv", newline="") as fp:
+        report = SamplingLocationImporter(dataset=dataset).run(csv.DictReader(fp))
+    print(report)  # 120000 rows imported in 8.4s (14286 rows/s), 3 skipped
+"""
 
-#     def get_location(self, row):
-#         """Extracts location data from the row and returns a Location object."""
-#         location = {}
-#         for key, value in self.location_fields.items():
-#             location[key] = row.pop(value)
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import partial
+from itertools import batched
 
-#         return Point.objects.get_or_create(
-#             **location,
-#         )[0]
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
 
-#     def modify_row(self, row, model, options):
-#         row = super().modify_row(row, model, options)
-#         if issubclass(model, Sample):
-#             row["location"] = self.get_location(row)
-#         return row
+from fairdm_geo.core.bulk import bulk_create_inherited
+from fairdm_geo.core.intervals import derive_depths, invalid_order
+from fairdm_geo.gis.crs import to_wgs84
+
+BATCH_SIZE = 1000
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    skipped: int = 0
+    locations_created: int = 0
+    locations_reused: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.created} rows imported in {self.seconds:.1f}s ({self.rows_per_second:.0f} rows/s), "
+            f"{self.skipped} skipped"
+        )
+
+
+def to_float_array(values):
+    """Convert a column of raw values to a float array, with NaN for blank or unparseable values."""
+    values = ["nan" if v is None or v == "" else v for v in values]
+    try:
+        return np.asarray(values, dtype=float)
+    except ValueError:
+        pass
+
+    def parse(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    return np.fromiter((parse(v) for v in values), dtype=float, count=len(values))
+
+
+def validate_coordinates(latitude, longitude):
+    """Return a boolean mask of the rows with finite coordinates inside the valid WGS84 range."""
+    return (
+        np.isfinite(latitude)
+        & np.isfinite(longitude)
+        & (latitude >= -90)
+        & (latitude <= 90)
+        & (longitude >= -180)
+        & (longitude <= 180)
+    )
+
+
+class SamplingLocationImporter:
+    """Imports rows of sample data with latitude/longitude columns into ``SamplingLocation`` (or a subclass).
+
+    Columns matching a concrete field of ``model`` are converted for their field and assigned to the new samples,
+    everything else is ignored. Foreign key columns hold the key of the related object. Rows with missing or
+    out-of-range coordinates, values that cannot be converted or references to missing objects are skipped and listed
+    in ``ImportReport.errors``.
+
+    If ``source_crs`` is given, the longitude and latitude columns are read as x (easting) and y (northing) in that
+    CRS and transformed to WGS84.
+    """
+
+    latitude_column = "latitude"
+    longitude_column = "longitude"
+
+    def __init__(
+        self,
+        model=None,
+        dataset=None,
+        batch_size=BATCH_SIZE,
+        latitude_column=None,
+        longitude_column=None,
+        source_crs=None,
+    ):
+        if model is None:
+            from fairdm_geo.sites.models import SamplingLocation
+
+            model = SamplingLocation
+        self.model = model
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.latitude_column = latitude_column or self.latitude_column
+        self.longitude_column = longitude_column or self.longitude_column
+        self.source_crs = source_crs
+
+        location = model._meta.get_field("location")
+        self.point_model = location.related_model
+        self.decimal_places = {
+            axis: getattr(self.point_model._meta.get_field(axis), "decimal_places", None) for axis in ("x", "y")
+        }
+        self.field_names = {f.name for f in model._meta.concrete_fields} | {
+            f.attname for f in model._meta.concrete_fields
+        }
+        self.field_names -= {"id", "pk", "location", "location_id", "polymorphic_ctype", "polymorphic_ctype_id"}
+
+    def _round(self, values, axis):
+        places = self.decimal_places[axis]
+        return np.round(values, places) if places is not None else values
+
+    def _to_decimal(self, value, axis):
+        places = self.decimal_places[axis]
+        return Decimal(f"{value:.{places}f}") if places is not None else value
+
+    def resolve_locations(self, longitude, latitude, report):
+        """Return the location pk for every coordinate pair, creating the points that do not exist yet."""
+        coords = np.column_stack([self._round(longitude, "x"), self._round(latitude, "y")])
+        unique, inverse = np.unique(coords, axis=0, return_inverse=True)
+        keys = [(self._to_decimal(x, "x"), self._to_decimal(y, "y")) for x, y in unique.tolist()]
+
+        existing = {}
+        manager = self.point_model._default_manager
+        for batch in batched(keys, self.batch_size):
+            # narrow the lookup on both axes; exact pairs are matched in memory below
+            query = Q(x__in={x for x, _ in batch}) & Q(y__in={y for _, y in batch})
+            for pk, x, y in manager.filter(query).values_list("pk", "x", "y"):
+                existing[(self._to_decimal(float(x), "x"), self._to_decimal(float(y), "y"))] = pk
+
+        missing = [key for key in keys if key not in existing]
+        created = manager.bulk_create(
+            [self.point_model(x=x, y=y) for x, y in missing],
+            batch_size=self.batch_size,
+        )
+        existing.update({key: obj.pk for key, obj in zip(missing, created)})
+
+        report.locations_created += len(missing)
+        report.locations_reused += len(keys) - len(missing)
+        pks = np.array([existing[key] for key in keys], dtype=object)
+        return pks[inverse.reshape(-1)]
+
+    @staticmethod
+    def to_python(field, value):
+        """Convert a raw ``value`` (e.g. CSV text) for ``field``; relations are converted to the related key."""
+        if field.is_relation:
+            field = field.target_field
+        if hasattr(field, "base_units"):
+            # QuantityFields store a plain number in base units
+            return float(value)
+        return field.to_python(value)
+
+    def clean_row(self, row, fields):
+        """Return the converted values of the ``fields`` columns of ``row``, keyed by attribute name."""
+        values = {}
+        for column, value in row.items():
+            field = fields.get(column)
+            if field is None or value in ("", None):
+                continue
+            try:
+                values[field.attname] = self.to_python(field, value)
+            except (TypeError, ValueError, ValidationError) as e:
+                msg = f"Invalid {column}: {value!r}"
+                raise ValueError(msg) from e
+        return values
+
+    def clean(self, rows, report):
+        """Convert the field columns of every row, with None (and an error in ``report``) for invalid rows.
+
+        Foreign keys are checked in batches; rows referring to related objects that do not exist are invalid.
+        """
+        columns = {column for row in rows for column in row if column in self.field_names}
+        fields = {column: self.model._meta.get_field(column) for column in columns}
+        cleaned = []
+        for index, row in enumerate(rows):
+            try:
+                cleaned.append(self.clean_row(row, fields))
+            except ValueError as e:
+                report.errors.append((index, str(e)))
+                cleaned.append(None)
+
+        self.check_relations(cleaned, fields, report)
+        return cleaned
+
+    def check_relations(self, cleaned, fields, report):
+        """Invalidate the rows of ``cleaned`` that refer to related objects that do not exist."""
+        for relation in {f for f in fields.values() if f.is_relation}:
+            keys = {values[relation.attname] for values in cleaned if values and relation.attname in values}
+            target = relation.target_field.attname
+            manager = relation.related_model._base_manager
+            existing = set()
+            for batch in batched(keys, self.batch_size):
+                existing.update(manager.filter(**{f"{target}__in": batch}).values_list(target, flat=True))
+            for index, values in enumerate(cleaned):
+                if values and relation.attname in values and values[relation.attname] not in existing:
+                    msg = f"Invalid {relation.name}: {values[relation.attname]!r} does not exist"
+                    report.errors.append((index, msg))
+                    cleaned[index] = None
+
+    def build(self, values, location_id):
+        """Create an unsaved sample from the converted values of a row (see ``clean``)."""
+        if self.dataset is not None:
+            values.setdefault(self.model._meta.get_field("dataset").attname, self.dataset.pk)
+        return self.model(location_id=location_id, **values)
+
+    def index_locations(self, objs, longitude, latitude):
+        """Add the new sites to the cached nearest neighbour index and clusters once the import is committed.
+
+        Batched inserts send no ``post_save`` signals, so the caches would otherwise not see them until they expire.
+        """
+        from fairdm_geo.sites.clusters import invalidate_clusters
+        from fairdm_geo.sites.models import SamplingLocation
+        from fairdm_geo.sites.spatial import update_location_index
+
+        if issubclass(self.model, SamplingLocation):
+            pks = [obj.pk for obj in objs]
+            transaction.on_commit(partial(update_location_index, SamplingLocation, pks, longitude, latitude))
+            transaction.on_commit(invalidate_clusters)
+
+    def run(self, rows):
+        """Import ``rows`` (an iterable of dicts, e.g. a ``csv.DictReader``) and return an ``ImportReport``."""
+        start = time.perf_counter()
+        rows = list(rows)
+        report = ImportReport(rows=len(rows))
+        if not rows:
+            return report
+
+        latitude = to_float_array([row.get(self.latitude_column) for row in rows])
+        longitude = to_float_array([row.get(self.longitude_column) for row in rows])
+        if self.source_crs is not None:
+            longitude, latitude = to_wgs84(longitude, latitude, self.source_crs)
+        valid = validate_coordinates(latitude, longitude)
+
+        for index in np.flatnonzero(~valid).tolist():
+            report.errors.append(
+                (
+                    index,
+                    f"Invalid coordinates: latitude={rows[index].get(self.latitude_column)!r}, "
+                    f"longitude={rows[index].get(self.longitude_column)!r}",
+                )
+            )
+        cleaned = self.clean(rows, report)
+        valid &= np.array([values is not None for values in cleaned])
+        report.errors.sort(key=lambda error: error[0])
+        report.skipped = int((~valid).sum())
+
+        indices = np.flatnonzero(valid)
+        with transaction.atomic():
+            locations = self.resolve_locations(longitude[indices], latitude[indices], report)
+            objs = [self.build(cleaned[i], pk) for i, pk in zip(indices.tolist(), locations.tolist())]
+            bulk_create_inherited(self.model, objs, batch_size=self.batch_size)
+            self.index_locations(objs, self._round(longitude[indices], "x"), self._round(latitude[indices], "y"))
+
+        report.created = len(objs)
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+class BoreholeImporter(SamplingLocationImporter):
+    """Imports rows of borehole data into ``Borehole`` (or a subclass).
+
+    Missing ``top``, ``bottom`` and ``vertical_depth`` values are derived from the others, as ``save()`` would, and
+    rows whose bottom is not below their top are skipped and listed in ``ImportReport.errors`` rather than failing
+    the ``top_above_bottom`` constraint for the whole import.
+    """
+
+    depth_fields = ("top", "bottom", "vertical_depth")
+
+    def __init__(self, model=None, **kwargs):
+        if model is None:
+            from fairdm_geo.sites.models import Borehole
+
+            model = Borehole
+        super().__init__(model=model, **kwargs)
+
+    def clean(self, rows, report):
+        cleaned = super().clean(rows, report)
+        self.clean_depths(cleaned, report)
+        return cleaned
+
+    def clean_depths(self, cleaned, report):
+        """Derive the missing depths of the valid rows of ``cleaned`` and invalidate rows with inverted depths."""
+        indices = [index for index, values in enumerate(cleaned) if values is not None]
+        columns = [to_float_array([cleaned[i].get(f) for i in indices]) for f in self.depth_fields]
+        positive_down = self.model.POSITIVE_DOWN
+        depths = derive_depths(*columns, positive_down=positive_down)
+
+        for i, index in enumerate(indices):
+            for name, values in zip(self.depth_fields, depths):
+                if not np.isnan(values[i]):
+                    cleaned[index][name] = float(values[i])
+
+        direction = "greater" if positive_down else "less"
+        top, bottom, _vertical_depth = depths
+        for i in invalid_order(top, bottom, positive_down).tolist():
+            msg = f"Invalid depths: the bottom ({bottom[i]:g}) must be {direction} than the top ({top[i]:g})"
+            report.errors.append((indices[i], msg))
+            cleaned[indices[i]] = None
@@ -0,0 +1,157 @@
+"""Keyset (seek) pagination for django-tables2 tables backed by large querysets.
+
+Offset pagination gets slower the further in a page is (the database has to walk past every skipped row) and needs a
+``COUNT(*)`` over the whole table. A keyset paginator instead remembers the ordering values of the last row on the
+page and asks for the rows that sort after it, which an index on the ordering columns answers in constant time
+regardless of page depth.
+
+The "page number" is an opaque cursor string, so only previous/next navigation is possible.
+"""
+
+import base64
+import json
+
+from django.core.paginator import PageNotAnInteger
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, OrderBy, Q
+from django.utils.translation import gettext as _
+from django_tables2.rows import BoundRow
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps([direction, values], cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, values = json.loads(payload)
+    except (TypeError, ValueError) as e:
+        raise PageNotAnInteger(_("Invalid page cursor")) from e
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        raise PageNotAnInteger(_("Invalid page cursor"))
+    return direction, values
+
+
+def get_ordering(queryset):
+    """Return the queryset ordering as ``[(field path, descending)]``, made unique by appending the primary key."""
+    ordering = []
+    for item in queryset.query.order_by or queryset.model._meta.ordering:
+        if isinstance(item, str):
+            ordering.append((item.lstrip("-"), item.startswith("-")))
+        elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+            ordering.append((item.expression.name, item.descending))
+        else:
+            msg = f"Keyset pagination only supports ordering by fields, got {item!r}."
+            raise TypeError(msg)
+    pk_name = queryset.model._meta.pk.name
+    if not any(name in ("pk", pk_name) for name, _descending in ordering):
+        ordering.append(("pk", False))
+    return ordering
+
+
+def seek(ordering, values, reverse=False):
+    """Build the ``WHERE`` clause selecting the rows that sort after ``values`` (before, with ``reverse``)."""
+    condition = Q()
+    for i, (_name, descending) in enumerate(ordering):
+        lookup = "lt" if descending != reverse else "gt"
+        term = Q(**{f"_keyset_{i}__{lookup}": values[i]})
+        for j in range(i):
+            term &= Q(**{f"_keyset_{j}": values[j]})
+        condition |= term
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, object_list, number, paginator, has_previous, has_next, first, last):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self._first = first
+        self._last = last
+
+    def __repr__(self):
+        return f"<Page {self.number}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+    def next_page_number(self):
+        return encode_cursor(NEXT, self._last)
+
+    def previous_page_number(self):
+        return encode_cursor(PREVIOUS, self._first)
+
+
+class KeysetPaginator:
+    """A django-tables2 compatible paginator that seeks by the ordering values of the current page's edge rows.
+
+    Use it through ``Table.paginate(paginator_class=KeysetPaginator)`` or ``RequestConfig(paginate={"paginator_class":
+    KeysetPaginator})``. The table must be backed by a queryset; the ordering is taken from it (including any ordering
+    applied by the table) and made unique with the primary key. Ordering fields should not contain NULLs.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0, **kwargs):
+        self.rows = object_list
+        self.queryset = object_list.data.data
+        self.per_page = int(per_page)
+        self.orphans = orphans
+        self.ordering = get_ordering(self.queryset)
+        self._has_other_pages = False
+
+    @property
+    def num_pages(self):
+        # the total is never counted; report two pages whenever there is another page so navigation is rendered
+        return 2 if self._has_other_pages else 1
+
+    def page(self, number):
+        cursor = number if isinstance(number, str) and not number.isdigit() else None
+        direction, values = decode_cursor(cursor) if cursor else (None, None)
+        if values is not None and len(values) != len(self.ordering):
+            raise PageNotAnInteger(_("Invalid page cursor"))
+
+        reverse = direction == PREVIOUS
+        queryset = self.queryset.annotate(**{f"_keyset_{i}": F(name) for i, (name, _d) in enumerate(self.ordering)})
+        if values is not None:
+            queryset = queryset.filter(seek(self.ordering, values, reverse=reverse))
+        order = [
+            f"{'-' if descending != reverse else ''}_keyset_{i}" for i, (_n, descending) in enumerate(self.ordering)
+        ]
+        records = list(queryset.order_by(*order)[: self.per_page + 1])
+
+        more = len(records) > self.per_page
+        records = records[: self.per_page]
+        if reverse:
+            records.reverse()
+            has_previous, has_next = more, True
+        else:
+            has_previous, has_next = values is not None, more
+
+        def keys(record):
+            return [getattr(record, f"_keyset_{i}") for i in range(len(self.ordering))]
+
+        first, last = (keys(records[0]), keys(records[-1])) if records else (values, values)
+        self._has_other_pages = has_previous or has_next
+        rows = [BoundRow(record, table=self.rows.table) for record in records]
+        return KeysetPage(rows, cursor or 1, self, has_previous, has_next, first, last)
@@ -24,4 +24,4 @@ class SitesConfig(AppConfig):
             raise ImproperlyConfigured(msg)
 
         # Import models to ensure they're registered
-        from . import config, models  # noqa: F401
+        from . import config, models, signals  # noqa: F401
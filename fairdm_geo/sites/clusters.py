@@ -0,0 +1,154 @@
+"""Server-side clustering of sampling locations for map views.
+
+Locations are binned into a longitude/latitude grid whose cells halve in size with every zoom level
+(``CELLS_PER_TILE`` cells across the width of a map tile), then counted per cell and broken down by site type and
+elevation datum with a single grouped query. Results are cached per zoom level and bounding box, with the box snapped
+outwards to the tile grid so that nearby views share cache entries. Saving or deleting a site (or a location point)
+invalidates every cached result by moving to a new cache version, which is itself stored in the cache.
+
+With more than one worker process, ``FAIRDM_GEO_CLUSTER_CACHE`` must therefore be a cache shared between them
+(Redis, Memcached, the database cache, ...). With a per-process cache such as ``LocMemCache``, only the process that
+saved the site sees the new version; the others keep serving stale clusters until ``FAIRDM_GEO_CLUSTER_CACHE_TIMEOUT``
+expires.
+
+Example::
+
+    cells = get_clusters(zoom=3, bbox=(-30, 30, 40, 70))
+    cells[0]  # {"cell": [70, 108], "bbox": [...], "center": [...], "count": 1284, "type": {...}, ...}
+"""
+
+import math
+import time
+from collections import Counter
+
+from django.core.cache import caches
+from django.db.models import Count, FloatField, Q, Sum
+from django.db.models.functions import Cast, Floor
+
+from fairdm_geo.conf import settings
+
+from .models import SamplingLocation
+
+CELLS_PER_TILE = 4
+MAX_ZOOM = 22
+WORLD = (-180.0, -90.0, 180.0, 90.0)
+
+# fields broken down per cell
+BREAKDOWNS = ("type", "elevation_datum")
+
+VERSION_KEY = "fairdm_geo:clusters:version"
+
+
+def cell_size(zoom):
+    """The width (and height) of a grid cell at ``zoom``, in degrees."""
+    return 360 / (2**zoom * CELLS_PER_TILE)
+
+
+def snap_bbox(bbox, zoom):
+    """Grow ``(west, south, east, north)`` to the edges of the map tiles at ``zoom`` that it overlaps.
+
+    A box with ``west > east`` crosses the antimeridian and is snapped on both sides.
+    """
+    step = 360 / 2**zoom
+    west, south, east, north = bbox
+    return (
+        max(math.floor((west + 180) / step) * step - 180, -180.0),
+        max(math.floor((south + 90) / step) * step - 90, -90.0),
+        min(math.ceil((east + 180) / step) * step - 180, 180.0),
+        min(math.ceil((north + 90) / step) * step - 90, 90.0),
+    )
+
+
+def grouped_cells(queryset, zoom, bbox=WORLD):
+    """Count the locations of ``queryset`` in ``bbox`` per grid cell, type and elevation datum in one query.
+
+    Returns the grouped rows, each with ``cell_x``, ``cell_y``, the ``BREAKDOWNS`` fields, ``count`` and the summed
+    ``longitude`` and ``latitude`` of its locations.
+    """
+    size = cell_size(zoom)
+    west, south, east, north = bbox
+    x, y = Cast("location__x", FloatField()), Cast("location__y", FloatField())
+    if west <= east:
+        longitude = Q(location__x__gte=west, location__x__lte=east)
+    else:
+        longitude = Q(location__x__gte=west) | Q(location__x__lte=east)
+    return (
+        queryset.filter(longitude, location__y__gte=south, location__y__lte=north)
+        .annotate(cell_x=Floor((x + 180) / size), cell_y=Floor((y + 90) / size))
+        .order_by()
+        .values("cell_x", "cell_y", *BREAKDOWNS)
+        .annotate(count=Count("pk"), longitude=Sum(x), latitude=Sum(y))
+    )
+
+
+def merge_cells(rows, zoom):
+    """Merge grouped rows (see ``grouped_cells``) into one dict per cell, most populated first.
+
+    Each cell has its grid ``cell`` index, its ``bbox``, the mean position of its locations as ``center``, the total
+    ``count`` and the counts per value of each of the ``BREAKDOWNS`` fields.
+    """
+    size = cell_size(zoom)
+    columns = 2**zoom * CELLS_PER_TILE
+    cells = {}
+    for row in rows:
+        # locations on the east or north edge of the world belong to the last cell
+        key = (min(int(row["cell_x"]), columns - 1), min(int(row["cell_y"]), columns // 2 - 1))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = {"count": 0, "longitude": 0.0, "latitude": 0.0}
+            cell.update({field: Counter() for field in BREAKDOWNS})
+        cell["count"] += row["count"]
+        cell["longitude"] += row["longitude"]
+        cell["latitude"] += row["latitude"]
+        for field in BREAKDOWNS:
+            cell[field][row[field]] += row["count"]
+
+    result = []
+    for (i, j), cell in cells.items():
+        count = cell["count"]
+        result.append(
+            {
+                "cell": [i, j],
+                "bbox": [i * size - 180, j * size - 90, (i + 1) * size - 180, (j + 1) * size - 90],
+                "center": [cell["longitude"] / count, cell["latitude"] / count],
+                "count": count,
+                **{field: dict(cell[field].most_common()) for field in BREAKDOWNS},
+            }
+        )
+    result.sort(key=lambda cell: (-cell["count"], cell["cell"]))
+    return result
+
+
+def cluster_locations(queryset, zoom, bbox=WORLD):
+    """Return the clusters of ``queryset`` in ``bbox`` at ``zoom`` (uncached, see ``merge_cells``)."""
+    return merge_cells(grouped_cells(queryset, zoom, bbox), zoom)
+
+
+def get_cache():
+    return caches[settings.FAIRDM_GEO_CLUSTER_CACHE]
+
+
+def _version(cache):
+    # the version lives in the cluster cache itself, so invalidation only reaches processes sharing that cache
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_clusters(zoom, bbox=WORLD):
+    """Return the (cached) clusters of all sampling locations in the tiles at ``zoom`` overlapping ``bbox``."""
+    cache = get_cache()
+    bbox = snap_bbox(bbox, zoom)
+    key = f"fairdm_geo:clusters:{_version(cache)}:{zoom}:{':'.join(map(repr, bbox))}"
+    cells = cache.get(key)
+    if cells is None:
+        cells = cluster_locations(SamplingLocation.objects.all(), zoom, bbox)
+        cache.set(key, cells, settings.FAIRDM_GEO_CLUSTER_CACHE_TIMEOUT)
+    return cells
+
+
+def invalidate_clusters():
+    """Discard all cached clusters by moving to a new cache version."""
+    get_cache().set(VERSION_KEY, time.time_ns(), None)
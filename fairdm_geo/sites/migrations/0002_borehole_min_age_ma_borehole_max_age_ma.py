@@ -0,0 +1,37 @@
+# Generated by Django 5.2.12 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fairdm_geo_sites", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="borehole",
+            name="max_age_ma",
+            field=models.FloatField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="The older bound of the geologic ages assigned to the interval, in millions of years.",
+                null=True,
+                verbose_name="maximum age (Ma)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="borehole",
+            name="min_age_ma",
+            field=models.FloatField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="The younger bound of the geologic ages assigned to the interval, in millions of years.",
+                null=True,
+                verbose_name="minimum age (Ma)",
+            ),
+        ),
+    ]
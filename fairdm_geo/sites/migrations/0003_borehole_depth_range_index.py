@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-18 11:20
+
+from django.db import migrations
+
+import fairdm_geo.core.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fairdm_geo_sites", "0002_borehole_min_age_ma_borehole_max_age_ma"),
+    ]
+
+    operations = [
+        fairdm_geo.core.operations.CreateDepthRangeIndex(
+            model_name="borehole",
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.12 on 2026-10-18 12:05
+
+import django.core.validators
+import django.db.models.deletion
+import fairdm.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fairdm_geo_sites", "0003_borehole_depth_range_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SurveyStation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "measured_depth",
+                    fairdm.db.fields.QuantityField(
+                        base_units="m",
+                        help_text="The distance along the hole from the collar to the station.",
+                        unit_choices=["m"],
+                        validators=[django.core.validators.MinValueValidator(0)],
+                        verbose_name="measured depth",
+                    ),
+                ),
+                (
+                    "azimuth",
+                    fairdm.db.fields.QuantityField(
+                        base_units="deg",
+                        help_text="The horizontal angle of the hole relative to north.",
+                        unit_choices=["deg"],
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(360),
+                        ],
+                        verbose_name="azimuth",
+                    ),
+                ),
+                (
+                    "inclination",
+                    fairdm.db.fields.QuantityField(
+                        base_units="deg",
+                        help_text=(
+                            "The vertical angle of the hole relative to the horizontal plane where 90 is true vertical"
+                            " (downwards) and negative values point upwards."
+                        ),
+                        unit_choices=["deg"],
+                        validators=[
+                            django.core.validators.MinValueValidator(-90),
+                            django.core.validators.MaxValueValidator(90),
+                        ],
+                        verbose_name="inclination",
+                    ),
+                ),
+                (
+                    "borehole",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="survey_stations",
+                        to="fairdm_geo_sites.borehole",
+                        verbose_name="borehole",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "survey station",
+                "verbose_name_plural": "survey stations",
+                "ordering": ["borehole", "measured_depth"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("borehole", "measured_depth"), name="unique_survey_station_depth")
+                ],
+            },
+        ),
+    ]
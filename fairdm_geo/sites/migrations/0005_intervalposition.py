@@ -0,0 +1,59 @@
+# Generated by Django 5.2.12 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import fairdm_geo.core.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fairdm_geo_sites", "0004_surveystation"),
+        ("sample", "0005_alter_sample_options_alter_samplerelation_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IntervalPosition",
+            fields=[
+                (
+                    "sample",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="interval_position",
+                        serialize=False,
+                        to="sample.sample",
+                        verbose_name="interval",
+                    ),
+                ),
+                ("x", models.FloatField(verbose_name="ECEF x")),
+                ("y", models.FloatField(verbose_name="ECEF y")),
+                ("z", models.FloatField(verbose_name="ECEF z")),
+                (
+                    "tvd",
+                    models.FloatField(
+                        blank=True,
+                        help_text="The true vertical depth of the interval midpoint below the borehole collar, in metres.",
+                        null=True,
+                        verbose_name="true vertical depth",
+                    ),
+                ),
+                (
+                    "borehole",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="interval_positions",
+                        to="fairdm_geo_sites.borehole",
+                        verbose_name="borehole",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "interval position",
+                "verbose_name_plural": "interval positions",
+            },
+        ),
+        fairdm_geo.core.operations.CreatePositionIndex(model_name="intervalposition"),
+    ]
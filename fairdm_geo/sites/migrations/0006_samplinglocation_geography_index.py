@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-18 17:05
+
+from django.db import migrations
+
+import fairdm_geo.core.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fairdm_geo_sites", "0005_intervalposition"),
+    ]
+
+    operations = [
+        fairdm_geo.core.operations.CreateLocationIndex(
+            model_name="samplinglocation",
+        ),
+    ]
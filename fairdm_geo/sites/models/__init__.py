@@ -1,8 +1,13 @@
 """Sampling location models."""
 
+from .positions import IntervalPosition, IntervalPositionQuerySet
 from .sites import Borehole, SamplingLocation
+from .surveys import SurveyStation
 
 __all__ = [
     "Borehole",
+    "IntervalPosition",
+    "IntervalPositionQuerySet",
     "SamplingLocation",
+    "SurveyStation",
 ]
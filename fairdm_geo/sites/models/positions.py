@@ -0,0 +1,96 @@
+"""True 3D positions of depth intervals, for proximity queries at depth."""
+
+from django.db import connections, models
+from django.db.models import F, FloatField, Func, Value
+from django.utils.translation import gettext as _
+from fairdm.core.models import Sample
+
+from fairdm_geo.sites.spatial import ecef_point, get_position_tree, nearest_matching, ranked
+
+from .sites import Borehole
+
+
+def _make_point(x, y, z):
+    return Func(x, y, z, function="ST_MakePoint", output_field=FloatField())
+
+
+class IntervalPositionQuerySet(models.QuerySet):
+    """Distance queries in 3D. Points are ``(longitude, latitude, height)`` tuples, distances are in metres.
+
+    On PostGIS the queries use the n-dimensional GiST index created by ``CreatePositionIndex``; on other databases
+    they are answered from an in-memory KD-tree (see ``fairdm_geo.sites.spatial``) and the matching rows are then
+    loaded by primary key into a list. Either way the results carry their ``distance`` and are sorted nearest first.
+    """
+
+    def _use_index(self):
+        return getattr(connections[self.db].ops, "postgis", False)
+
+    def _positions(self, point):
+        x, y, z = ecef_point(point)
+        return _make_point(F("x"), F("y"), F("z")), _make_point(Value(x), Value(y), Value(z))
+
+    def within_distance(self, point, distance):
+        """Positions within ``distance`` metres of ``point``."""
+        if self._use_index():
+            position, target = self._positions(point)
+            within = Func(
+                position, target, Value(float(distance)), function="ST_3DDWithin", output_field=models.BooleanField()
+            )
+            return (
+                self.filter(within)
+                .annotate(distance=Func(position, target, function="ST_3DDistance", output_field=FloatField()))
+                .order_by("distance")
+            )
+        return ranked(self, *get_position_tree(self.model).within(ecef_point(point), distance))
+
+    def nearest(self, point, k=1):
+        """The ``k`` positions in this queryset nearest to ``point``."""
+        if self._use_index():
+            position, target = self._positions(point)
+            knn = Func(position, target, template="%(expressions)s", arg_joiner=" <<->> ", output_field=FloatField())
+            return self.annotate(
+                distance=Func(position, target, function="ST_3DDistance", output_field=FloatField())
+            ).order_by(knn)[:k]
+
+        # the tree covers the whole table, so filtered querysets need a wider search
+        return nearest_matching(self, get_position_tree(self.model), ecef_point(point), k, not self.query.has_filters())
+
+
+class IntervalPosition(models.Model):
+    """
+    The true position of the midpoint of a depth interval, as earth-centred, earth-fixed (ECEF)
+    coordinates in metres. Positions are derived from the trajectory of the borehole the interval
+    was measured along and are (re)calculated with ``fairdm_geo.sites.trajectory.update_interval_positions``.
+    """
+
+    sample = models.OneToOneField(
+        Sample,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="interval_position",
+        verbose_name=_("interval"),
+    )
+    borehole = models.ForeignKey(
+        Borehole,
+        on_delete=models.CASCADE,
+        related_name="interval_positions",
+        verbose_name=_("borehole"),
+    )
+    x = models.FloatField(_("ECEF x"))
+    y = models.FloatField(_("ECEF y"))
+    z = models.FloatField(_("ECEF z"))
+    tvd = models.FloatField(
+        _("true vertical depth"),
+        null=True,
+        blank=True,
+        help_text=_("The true vertical depth of the interval midpoint below the borehole collar, in metres."),
+    )
+
+    objects = IntervalPositionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("interval position")
+        verbose_name_plural = _("interval positions")
+
+    def __str__(self):
+        return f"{self.sample_id} ({self.x:.1f}, {self.y:.1f}, {self.z:.1f})"
@@ -1,13 +1,78 @@
 """Concrete sampling location and borehole models."""
 
+from django.db import connections, models
+from django.db.models import F, FloatField, Func, Value
 from django.utils.translation import gettext as _
 from fairdm.db.models import QuantityField
 from research_vocabs.fields import ConceptField
 
-from fairdm_geo.core.models import GenericEarthSample, GenericHole, GeoDepthInterval
+from fairdm_geo.core.managers import sample_manager
+from fairdm_geo.core.models import GenericEarthSample, GenericHole, GeoDepthInterval, GeoDepthIntervalQuerySet
+from fairdm_geo.sites.spatial import get_location_index, nearest_matching, ranked
 from fairdm_geo.vocabularies.odm2 import ElevationDatum, SiteType
 
 
+def _geography(x, y):
+    point = Func(x, y, function="ST_MakePoint")
+    return Func(point, template="%(expressions)s::geography", output_field=FloatField())
+
+
+class SamplingLocationQuerySet(models.QuerySet):
+    """Great-circle distance queries. Points are ``(longitude, latitude)`` tuples, distances are in kilometres.
+
+    On PostGIS the queries use the geography index created by ``CreateLocationIndex`` and its KNN operator (``<->``);
+    on other databases they are answered from a cached, incrementally updated index of the site locations (see
+    ``fairdm_geo.sites.spatial``) and return a list rather than a queryset. Distances are haversine distances on a
+    sphere of the mean earth radius either way, and the results carry their ``distance`` and are sorted nearest
+    first. Sites without a location are never returned.
+    """
+
+    def _use_index(self):
+        return getattr(connections[self.db].ops, "postgis", False)
+
+    def _locations(self, point):
+        longitude, latitude = point
+        return _geography(F("location__x"), F("location__y")), _geography(
+            Value(float(longitude)), Value(float(latitude))
+        )
+
+    def _distance(self, location, target):
+        # use_spheroid=false: distances on the sphere, like the KNN operator and the in-memory index
+        distance = Func(location, target, Value(False), function="ST_Distance", output_field=FloatField())
+        return distance / 1000
+
+    def _is_indexed(self):
+        """Whether the in-memory index covers exactly the rows of this queryset."""
+        return self.model is SamplingLocation and not self.query.has_filters()
+
+    def within_km(self, point, km):
+        """Sites within ``km`` kilometres of ``point``."""
+        if self._use_index():
+            location, target = self._locations(point)
+            within = Func(
+                location,
+                target,
+                Value(float(km) * 1000),
+                Value(False),
+                function="ST_DWithin",
+                output_field=models.BooleanField(),
+            )
+            return self.filter(within).annotate(distance=self._distance(location, target)).order_by("distance")
+        return ranked(self, *get_location_index(SamplingLocation).within(point, km))
+
+    def nearest(self, point, k=1):
+        """The ``k`` sites in this queryset nearest to ``point``."""
+        if self._use_index():
+            location, target = self._locations(point)
+            knn = Func(location, target, template="%(expressions)s", arg_joiner=" <-> ", output_field=FloatField())
+            return (
+                self.filter(location__isnull=False)
+                .annotate(distance=self._distance(location, target))
+                .order_by(knn)[:k]
+            )
+        return nearest_matching(self, get_location_index(SamplingLocation), point, k, self._is_indexed())
+
+
 class SamplingLocation(GenericEarthSample):
     """
     A sampling location represents a specific geographic point where samples are collected.
@@ -40,6 +105,8 @@ class SamplingLocation(GenericEarthSample):
         help_text=_("The site elevation in meters with reference to the specified elevation datum."),
     )
 
+    objects = sample_manager(SamplingLocationQuerySet)
+
     class Meta:
         abstract = False
         verbose_name = _("sampling location")
@@ -55,6 +122,8 @@ class Borehole(GeoDepthInterval, GenericHole, SamplingLocation):
 
     HOLE_MAX_LENGTH = 12262  # meters (Kola Superdeep Borehole)
 
+    objects = sample_manager(GeoDepthIntervalQuerySet, SamplingLocationQuerySet)
+
     class Meta:
         abstract = False
         verbose_name = _("borehole")
@@ -0,0 +1,55 @@
+"""Directional survey stations of boreholes."""
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+from django.utils.translation import gettext as _
+from fairdm.db.models import QuantityField
+
+from .sites import Borehole
+
+
+class SurveyStation(models.Model):
+    """
+    A single measurement of the hole direction at a measured depth along a borehole.
+    The stations of a borehole describe its trajectory, which is reconstructed with
+    the minimum curvature method (see ``fairdm_geo.sites.trajectory``).
+    """
+
+    borehole = models.ForeignKey(
+        Borehole,
+        on_delete=models.CASCADE,
+        related_name="survey_stations",
+        verbose_name=_("borehole"),
+    )
+    measured_depth = QuantityField(
+        base_units="m",
+        verbose_name=_("measured depth"),
+        help_text=_("The distance along the hole from the collar to the station."),
+        validators=[MinValueValidator(0)],
+    )
+    azimuth = QuantityField(
+        base_units="deg",
+        verbose_name=_("azimuth"),
+        help_text=_("The horizontal angle of the hole relative to north."),
+        validators=[MinValueValidator(0), MaxValueValidator(360)],
+    )
+    inclination = QuantityField(
+        base_units="deg",
+        verbose_name=_("inclination"),
+        help_text=_(
+            "The vertical angle of the hole relative to the horizontal plane where 90 is true vertical (downwards) and"
+            " negative values point upwards."
+        ),
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+
+    class Meta:
+        verbose_name = _("survey station")
+        verbose_name_plural = _("survey stations")
+        ordering = ["borehole", "measured_depth"]
+        constraints = [
+            models.UniqueConstraint(fields=["borehole", "measured_depth"], name="unique_survey_station_depth"),
+        ]
+
+    def __str__(self):
+        return f"{self.borehole} @ {self.measured_depth}"
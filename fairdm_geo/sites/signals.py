@@ -0,0 +1,60 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .clusters import invalidate_clusters
+from .models import Borehole, IntervalPosition, SamplingLocation, SurveyStation
+from .spatial import invalidate_location_index, invalidate_position_tree, update_location_index
+from .trajectory import invalidate_trajectories, refresh_interval_positions
+
+Location = SamplingLocation._meta.get_field("location").related_model
+
+
+@receiver([post_save, post_delete], sender=SurveyStation)
+def reset_survey_trajectory(sender, instance, using, **kwargs):
+    invalidate_trajectories(instance.borehole_id)
+    transaction.on_commit(partial(refresh_interval_positions, instance.borehole_id), using=using)
+
+
+@receiver([post_save, post_delete], sender=Borehole)
+def reset_borehole_trajectory(sender, instance, using, **kwargs):
+    invalidate_trajectories(instance.pk)
+    transaction.on_commit(partial(refresh_interval_positions, instance.pk), using=using)
+
+
+@receiver([post_save, post_delete], sender=IntervalPosition)
+def reset_position_tree(sender, **kwargs):
+    invalidate_position_tree(sender)
+
+
+@receiver(post_save)
+def add_to_location_index(sender, instance, using, **kwargs):
+    if not issubclass(sender, SamplingLocation):
+        return
+    location = instance.location
+    if location is None:
+        transaction.on_commit(partial(update_location_index, SamplingLocation, [instance.pk]), using=using)
+    else:
+        transaction.on_commit(
+            partial(update_location_index, SamplingLocation, [instance.pk], [location.x], [location.y]), using=using
+        )
+
+
+@receiver(post_delete)
+def remove_from_location_index(sender, instance, using, **kwargs):
+    if issubclass(sender, SamplingLocation):
+        transaction.on_commit(partial(update_location_index, SamplingLocation, [instance.pk]), using=using)
+
+
+# moving a point moves every site at it, so the index is rebuilt rather than updated
+@receiver([post_save, post_delete], sender=Location)
+def reset_location_index(sender, using, **kwargs):
+    transaction.on_commit(partial(invalidate_location_index, SamplingLocation), using=using)
+
+
+@receiver([post_save, post_delete])
+def reset_clusters(sender, using, **kwargs):
+    if sender is Location or issubclass(sender, SamplingLocation):
+        transaction.on_commit(invalidate_clusters, using=using)
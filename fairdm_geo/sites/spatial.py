@@ -0,0 +1,296 @@
+"""In-memory spatial indexes, used where the database has no spatial index (i.e. without PostGIS).
+
+Interval positions are earth-centred, earth-fixed (ECEF) coordinates in metres, so straight-line distances between
+them are true 3D distances, at any depth and across boreholes. Sampling locations are indexed as unit vectors on the
+sphere: the straight-line (chord) distance between two unit vectors grows monotonically with the great-circle
+distance between them, so nearest neighbours and radius queries on the chord give exactly the haversine results.
+
+The trees are a ``scipy.spatial.cKDTree`` when SciPy is installed (``pip install fairdm-geo[spatial]``) and a
+vectorized brute force search otherwise, which is fast enough for a few hundred thousand points. They are built on
+first use. The position tree is discarded whenever positions are saved, deleted or recalculated; the location index
+takes added, moved and deleted sites incrementally and is only compacted once enough changes have piled up.
+"""
+
+import threading
+from itertools import batched
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover
+    cKDTree = None
+
+from fairdm_geo.gis.crs import to_ecef
+
+# mean earth radius, as used by PostGIS for spherical geography distances
+EARTH_RADIUS_KM = 6371.0088
+
+# the location index is compacted once its pending changes exceed this many sites, or this fraction of the snapshot
+COMPACT_MIN_CHANGES = 1000
+COMPACT_FRACTION = 0.1
+
+# maximum number of keys per query when loading the rows found in an index
+BATCH_SIZE = 1000
+
+_trees = {}
+_lock = threading.Lock()
+
+
+def ecef_point(point):
+    """Convert a ``(longitude, latitude, height)`` tuple to an ECEF ``(x, y, z)`` array.
+
+    The height is in metres above the ellipsoid (approximately sea level), so a point 1,200 m below sea level is
+    ``(longitude, latitude, -1200)``.
+    """
+    longitude, latitude, height = point
+    return np.array([float(a[0]) for a in to_ecef([longitude], [latitude], [height])])
+
+
+def unit_vectors(longitude, latitude):
+    """Convert longitudes and latitudes (in degrees) to an ``(n, 3)`` array of unit vectors."""
+    lon = np.radians(np.asarray(longitude, dtype=float).reshape(-1))
+    lat = np.radians(np.asarray(latitude, dtype=float).reshape(-1))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord):
+    """Convert chord lengths between unit vectors to great-circle distances in kilometres."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord, dtype=float) / 2, 0, 1))
+
+
+def km_to_chord(km):
+    """Convert a great-circle distance in kilometres to the chord length between unit vectors."""
+    return 2 * np.sin(min(max(float(km), 0.0) / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+class PositionTree:
+    """Radius and nearest neighbour queries over a fixed set of 3D points.
+
+    Args:
+        pks: The key of each point.
+        xyz: An ``(n, 3)`` array of coordinates.
+    """
+
+    def __init__(self, pks, xyz):
+        self.pks = np.asarray(pks, dtype=object)
+        self.xyz = np.asarray(xyz, dtype=float).reshape(-1, 3)
+        self.tree = cKDTree(self.xyz) if cKDTree is not None and len(self.xyz) else None
+
+    def __len__(self):
+        return len(self.pks)
+
+    def within(self, point, radius):
+        """Return ``(pks, distances)`` of the points within ``radius`` of ``point``, nearest first."""
+        point = np.asarray(point, dtype=float)
+        if self.tree is not None:
+            index = np.asarray(self.tree.query_ball_point(point, radius), dtype=int)
+            distances = np.linalg.norm(self.xyz[index] - point, axis=1)
+        else:
+            distances = np.linalg.norm(self.xyz - point, axis=1)
+            index = np.flatnonzero(distances <= radius)
+            distances = distances[index]
+        order = np.argsort(distances, kind="stable")
+        return self.pks[index[order]], distances[order]
+
+    def nearest(self, point, k):
+        """Return ``(pks, distances)`` of the ``k`` points nearest to ``point``, nearest first."""
+        point = np.asarray(point, dtype=float)
+        k = min(k, len(self))
+        if k <= 0:
+            return self.pks[:0], np.empty(0)
+        if self.tree is not None:
+            distances, index = self.tree.query(point, k=k)
+            return self.pks[np.atleast_1d(index)], np.atleast_1d(distances)
+        distances = np.linalg.norm(self.xyz - point, axis=1)
+        index = np.argpartition(distances, k - 1)[:k]
+        index = index[np.argsort(distances[index], kind="stable")]
+        return self.pks[index], distances[index]
+
+
+class LocationIndex:
+    """Great-circle nearest neighbour and radius queries over sampling locations, with incremental updates.
+
+    The index is a ``PositionTree`` snapshot of unit vectors plus the changes made since it was built: added (or
+    moved) sites are searched by brute force and removed (or moved) sites are masked out of the snapshot. Updates
+    replace the ``(removed, added)`` change sets rather than modify them, so concurrent queries see a consistent state.
+
+    Args:
+        pks: The key of each location.
+        longitude: Longitudes in degrees.
+        latitude: Latitudes in degrees.
+    """
+
+    def __init__(self, pks, longitude, latitude):
+        self.tree = PositionTree(pks, unit_vectors(longitude, latitude))
+        self.tree_pks = set(self.tree.pks.tolist())
+        self.changes = (frozenset(), {})
+
+    def __len__(self):
+        removed, added = self.changes
+        return len(self.tree) - len(removed) + len(added)
+
+    def needs_compacting(self):
+        removed, added = self.changes
+        return len(removed) + len(added) > max(COMPACT_MIN_CHANGES, COMPACT_FRACTION * len(self.tree))
+
+    def add(self, pks, longitude, latitude):
+        """Add (or move) the locations with the given keys."""
+        pks = list(pks)
+        removed, added = self.changes
+        self.changes = (
+            removed | (set(pks) & self.tree_pks),
+            {**added, **dict(zip(pks, unit_vectors(longitude, latitude)))},
+        )
+
+    def remove(self, pks):
+        """Remove the locations with the given keys; unknown keys are ignored."""
+        pks = set(pks)
+        removed, added = self.changes
+        self.changes = (removed | (pks & self.tree_pks), {pk: xyz for pk, xyz in added.items() if pk not in pks})
+
+    def compacted(self):
+        """Return a new index with the pending changes folded into the snapshot."""
+        removed, added = self.changes
+        keep = np.array([pk not in removed for pk in self.tree.pks.tolist()], dtype=bool)
+        index = LocationIndex([], [], [])
+        index.tree = PositionTree(
+            [*self.tree.pks[keep].tolist(), *added],
+            np.concatenate([self.tree.xyz[keep], np.reshape(list(added.values()), (-1, 3))]),
+        )
+        index.tree_pks = set(index.tree.pks.tolist())
+        return index
+
+    def _search(self, point, search, limit=None):
+        """Run ``search(tree, point, removed)`` on the snapshot and the added sites and merge the results."""
+        removed, added = self.changes
+        pks, chords = search(self.tree, point, removed)
+        if removed:
+            keep = np.array([pk not in removed for pk in pks.tolist()], dtype=bool)
+            pks, chords = pks[keep], chords[keep]
+        if added:
+            added_pks, added_chords = search(PositionTree(list(added), list(added.values())), point, removed)
+            pks, chords = np.concatenate([pks, added_pks]), np.concatenate([chords, added_chords])
+        order = np.argsort(chords, kind="stable")[:limit]
+        return pks[order], chord_to_km(chords[order])
+
+    def within(self, point, km):
+        """Return ``(pks, distances)`` of the locations within ``km`` kilometres of ``point``, nearest first."""
+        chord = km_to_chord(km)
+        return self._search(unit_vectors(*point)[0], lambda tree, xyz, removed: tree.within(xyz, chord))
+
+    def nearest(self, point, k):
+        """Return ``(pks, distances)`` of the ``k`` locations nearest to ``point``, nearest first."""
+        # removed sites may be among the nearest of the snapshot, so ask it for enough extra candidates
+        return self._search(unit_vectors(*point)[0], lambda tree, xyz, removed: tree.nearest(xyz, k + len(removed)), k)
+
+
+def get_location_index(model):
+    """Return the (cached) index over every row of ``model`` that has a point ``location``."""
+    key = model._meta.label_lower
+    index = _trees.get(key)
+    if index is None or index.needs_compacting():
+        with _lock:
+            index = _trees.get(key)
+            if index is None:
+                rows = list(
+                    model._base_manager.filter(location__isnull=False).values_list("pk", "location__x", "location__y")
+                )
+                columns = list(zip(*rows)) or [(), (), ()]
+                index = _trees[key] = LocationIndex(columns[0], columns[1], columns[2])
+            elif index.needs_compacting():
+                index = _trees[key] = index.compacted()
+    return index
+
+
+def update_location_index(model, pks, longitude=None, latitude=None):
+    """Add (or move) locations in the cached index of ``model``, or remove them if no coordinates are given.
+
+    Does nothing if the index has not been built yet, since it will be built from the database when first used.
+    """
+    with _lock:
+        index = _trees.get(model._meta.label_lower)
+        if index is None:
+            return
+        if longitude is None:
+            index.remove(pks)
+        else:
+            index.add(pks, longitude, latitude)
+
+
+def _matching(queryset, pks):
+    """Return the subset of ``pks`` that are rows of ``queryset``, checked in batches."""
+    matched = set()
+    for batch in batched(pks, BATCH_SIZE):
+        matched.update(queryset.filter(pk__in=batch).values_list("pk", flat=True))
+    return matched
+
+
+def ranked(queryset, pks, distances):
+    """Return the rows of ``queryset`` with the given keys as a list, nearest first.
+
+    ``pks`` and ``distances`` are the results of an index query, sorted by distance. The rows are loaded by primary
+    key in batches of ``BATCH_SIZE`` and each gets a ``distance`` attribute; keys that are not rows of the queryset
+    are skipped.
+    """
+    pks = list(pks)
+    found = {}
+    for batch in batched(pks, BATCH_SIZE):
+        found.update(queryset.in_bulk(batch))
+    results = []
+    for pk, distance in zip(pks, distances):
+        obj = found.get(pk)
+        if obj is not None:
+            obj.distance = float(distance)
+            results.append(obj)
+    return results
+
+
+def nearest_matching(queryset, index, point, k, exact):
+    """Return the ``k`` rows of ``queryset`` nearest to ``point`` according to ``index``, as a ``ranked`` list.
+
+    ``exact`` says whether the index covers exactly the rows of the queryset. If not (e.g. the queryset is filtered),
+    the search is widened until enough of the nearest candidates are rows of the queryset. Every candidate is checked
+    once, and only the ``k`` rows returned are loaded.
+    """
+    if exact:
+        return ranked(queryset, *index.nearest(point, k))
+    candidates = k
+    checked, matched = set(), set()
+    while True:
+        pks, distances = index.nearest(point, candidates)
+        new = [pk for pk in pks.tolist() if pk not in checked]
+        checked.update(new)
+        matched |= _matching(queryset, new)
+        keep = [i for i, pk in enumerate(pks.tolist()) if pk in matched][:k]
+        if len(keep) >= k or candidates >= len(index):
+            return ranked(queryset, pks[keep], distances[keep])
+        candidates *= 4
+
+
+def get_position_tree(model):
+    """Return the (cached) tree over every row of a position model (with ``x``, ``y`` and ``z`` columns)."""
+    key = model._meta.label_lower
+    tree = _trees.get(key)
+    if tree is None:
+        with _lock:
+            tree = _trees.get(key)
+            if tree is None:
+                rows = list(model._default_manager.values_list("pk", "x", "y", "z"))
+                pks = [row[0] for row in rows]
+                tree = _trees[key] = PositionTree(pks, [row[1:] for row in rows])
+    return tree
+
+
+def invalidate_position_tree(model=None):
+    """Discard the cached tree of ``model`` (or of all models), forcing a rebuild on next use."""
+    with _lock:
+        if model is None:
+            _trees.clear()
+        else:
+            _trees.pop(model._meta.label_lower, None)
+
+
+def invalidate_location_index(model=None):
+    """Discard the cached location index of ``model`` (or of all models), forcing a rebuild on next use."""
+    invalidate_position_tree(model)
@@ -0,0 +1,390 @@
+"""Borehole trajectories from directional surveys, using the minimum curvature method.
+
+Between two survey stations the hole is assumed to follow a circular arc tangent to the measured directions at both
+ends. The displacement over each segment is the average of the two direction vectors, scaled by the ratio factor
+``2 / dogleg * tan(dogleg / 2)`` that accounts for the curvature of the arc. Every segment is computed at once with
+NumPy and positions are the cumulative sum of the displacements, so the stations of many boreholes can be solved in a
+single call.
+
+Angles follow the conventions of ``GenericHole``: azimuth in degrees clockwise from north, inclination in degrees
+from the horizontal plane (90 is straight down). Positions are in metres relative to the collar, as northing,
+easting and true vertical depth (positive down).
+
+Measured depths (e.g. the tops and bottoms of intervals) are converted to positions with ``interpolate``, which
+follows the same arcs between stations, and to true vertical depths with ``true_vertical_depths``. Solved borehole
+trajectories are cached per process and discarded when a borehole or one of its survey stations changes; the stored
+interval positions along that borehole are then recalculated once the change is committed.
+"""
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from fairdm_geo.core.intervals import magnitudes
+from fairdm_geo.gis.crs import local_to_ecef
+
+from .models import Borehole, IntervalPosition, SurveyStation
+from .spatial import invalidate_position_tree
+
+# dogleg severity is reported in degrees per this many metres
+DOGLEG_COURSE_LENGTH = 30.0
+
+# below this dogleg (in radians) a segment is treated as straight, avoiding 0/0 in the ratio factor
+STRAIGHT_DOGLEG = 1e-9
+
+# elevation datums that are sea level, i.e. that TVDSS can be measured from
+SEA_LEVEL_DATUMS = frozenset({"MSL"})
+
+
+@dataclass
+class Trajectory:
+    """Positions and curvature of the stations of one or more boreholes, as parallel arrays.
+
+    ``dogleg`` (degrees) and ``dogleg_severity`` (degrees per 30 m) describe the segment ending at each station and
+    are 0 at the first station of a borehole.
+    """
+
+    measured_depth: np.ndarray
+    north: np.ndarray
+    east: np.ndarray
+    tvd: np.ndarray
+    dogleg: np.ndarray
+    dogleg_severity: np.ndarray
+    groups: np.ndarray
+    inclination: np.ndarray
+    azimuth: np.ndarray
+
+    def __len__(self):
+        return len(self.measured_depth)
+
+    def select(self, group):
+        """Return the part of the trajectory belonging to ``group`` (e.g. a borehole pk)."""
+        mask = self.groups == group
+        return Trajectory(*(getattr(self, name)[mask] for name in self.__dataclass_fields__))
+
+    @classmethod
+    def concatenate(cls, trajectories):
+        """Join the trajectories of different boreholes into one."""
+        trajectories = list(trajectories)
+        if not trajectories:
+            return minimum_curvature([], [], [])
+        return cls(*(np.concatenate([getattr(t, name) for t in trajectories]) for name in cls.__dataclass_fields__))
+
+
+def direction_vectors(inclination, azimuth):
+    """Unit vectors (north, east, down) of holes with the given inclination from horizontal and azimuth, in degrees."""
+    # drilling inclination, measured from the vertical
+    theta = np.radians(90.0 - np.asarray(inclination, dtype=float))
+    phi = np.radians(np.asarray(azimuth, dtype=float))
+    return np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)
+
+
+def dogleg_angles(inclination1, azimuth1, inclination2, azimuth2):
+    """The angle (in radians) between two hole directions, given as inclination from horizontal and azimuth."""
+    theta1, theta2 = np.radians(90.0 - np.asarray(inclination1)), np.radians(90.0 - np.asarray(inclination2))
+    delta_phi = np.radians(np.asarray(azimuth2) - np.asarray(azimuth1))
+    # haversine form of cos(dl) = cos(t2 - t1) - sin(t1) sin(t2) (1 - cos(dphi)), accurate for small angles
+    h = np.sin((theta2 - theta1) / 2) ** 2 + np.sin(theta1) * np.sin(theta2) * np.sin(delta_phi / 2) ** 2
+    return 2 * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def ratio_factors(dogleg):
+    """The minimum curvature ratio factor ``2 / dogleg * tan(dogleg / 2)`` (1 for straight segments)."""
+    dogleg = np.asarray(dogleg, dtype=float)
+    ratio = np.ones(dogleg.shape)
+    curved = dogleg > STRAIGHT_DOGLEG
+    ratio[curved] = 2 / dogleg[curved] * np.tan(dogleg[curved] / 2)
+    return ratio
+
+
+def minimum_curvature(measured_depth, inclination, azimuth, groups=None):
+    """Solve the trajectory of one or more boreholes from their survey stations.
+
+    Args:
+        measured_depth: Measured depth of each station, in metres.
+        inclination: Inclination from the horizontal of each station, in degrees (90 is vertical).
+        azimuth: Azimuth of each station, in degrees.
+        groups: Optional borehole identifier of each station. The stations of a borehole must be contiguous and
+            sorted by measured depth. Without groups, all stations belong to a single borehole.
+
+    The hole is assumed to run straight from the collar (measured depth 0) to the first station of each borehole, in
+    the direction measured at that station.
+    """
+    md = np.asarray(measured_depth, dtype=float)
+    inclination = np.asarray(inclination, dtype=float)
+    azimuth = np.asarray(azimuth, dtype=float)
+    groups = np.zeros(len(md), dtype=int) if groups is None else np.asarray(groups)
+    n = len(md)
+
+    first = np.ones(n, dtype=bool)
+    first[1:] = groups[1:] != groups[:-1]
+    previous = np.arange(n) - 1
+    previous[first] = np.flatnonzero(first)
+
+    course = md - md[previous]
+    course[first] = md[first]
+    if np.any(course < 0):
+        msg = "Survey stations must be sorted by measured depth within each borehole."
+        raise ValueError(msg)
+
+    dogleg = dogleg_angles(inclination[previous], azimuth[previous], inclination, azimuth)
+    ratio = ratio_factors(dogleg)
+
+    start, end = direction_vectors(inclination[previous], azimuth[previous]), direction_vectors(inclination, azimuth)
+    steps = [course / 2 * (a + b) * ratio for a, b in zip(start, end)]
+
+    # cumulative sums restarted at the first station of every borehole
+    positions = []
+    for step in steps:
+        total = np.cumsum(step)
+        offset = np.repeat(total[first] - step[first], np.diff(np.append(np.flatnonzero(first), n)))
+        positions.append(total - offset)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        severity = np.where(course > 0, np.degrees(dogleg) * DOGLEG_COURSE_LENGTH / course, 0.0)
+
+    return Trajectory(md, *positions, np.degrees(dogleg), severity, groups, inclination, azimuth)
+
+
+def interpolate(trajectory, groups, measured_depth):
+    """Positions ``(north, east, tvd)`` at measured depths along the boreholes of a trajectory.
+
+    ``groups`` gives the borehole of each measured depth. Between stations the position follows the circular arc of
+    the minimum curvature method; above the first station the hole is straight from the collar and below the last
+    station it continues straight in the last measured direction. Measured depths of boreholes that are not part of
+    the trajectory, and missing (NaN) depths, give NaN.
+    """
+    md = np.asarray(measured_depth, dtype=float)
+    groups = np.asarray(groups, dtype=object)
+    result = np.full((3, len(md)), np.nan)
+    if not len(trajectory) or not len(md):
+        return tuple(result)
+
+    first = np.ones(len(trajectory), dtype=bool)
+    first[1:] = trajectory.groups[1:] != trajectory.groups[:-1]
+    starts = np.flatnonzero(first)
+    ends = np.append(starts[1:], len(trajectory))
+    index = {group: i for i, group in enumerate(trajectory.groups[starts])}
+    group_index = np.array([index.get(group, -1) for group in groups], dtype=int)
+    valid = (group_index >= 0) & ~np.isnan(md)
+    g, md = group_index[valid], md[valid]
+
+    # find the station at or above each measured depth with one search over (borehole, measured depth) keys
+    span = max(trajectory.measured_depth.max(), md.max(initial=0)) + 1
+    station_groups = np.repeat(np.arange(len(starts)), ends - starts)
+    station = np.searchsorted(station_groups * span + trajectory.measured_depth, g * span + md, side="right") - 1
+    above_first = station < starts[g]
+    station = np.where(above_first, starts[g], station)
+    following = np.minimum(station + 1, ends[g] - 1)
+    beyond_last = station + 1 >= ends[g]
+
+    v1 = np.array(direction_vectors(trajectory.inclination[station], trajectory.azimuth[station]))
+    v2 = np.array(direction_vectors(trajectory.inclination[following], trajectory.azimuth[following]))
+    base = np.array([trajectory.north[station], trajectory.east[station], trajectory.tvd[station]])
+    course = trajectory.measured_depth[following] - trajectory.measured_depth[station]
+    distance = md - trajectory.measured_depth[station]
+
+    # above the first station: straight from the collar in the direction of the first station
+    base[:, above_first] = 0.0
+    distance[above_first] = md[above_first]
+    straight = above_first | beyond_last | (course <= 0)
+
+    # direction at the measured depth, interpolated along the arc between the two stations
+    dogleg = 2 * np.arcsin(np.clip(np.linalg.norm(v2 - v1, axis=0) / 2, 0.0, 1.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(straight, 0.0, distance / course)
+    partial = dogleg * fraction
+    curved = ~straight & (dogleg > STRAIGHT_DOGLEG)
+    direction = v1.copy()
+    direction[:, curved] = (
+        np.sin(dogleg[curved] - partial[curved]) * v1[:, curved] + np.sin(partial[curved]) * v2[:, curved]
+    ) / np.sin(dogleg[curved])
+
+    result[:, valid] = base + distance / 2 * (v1 + direction) * ratio_factors(partial)
+    return tuple(result)
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _solve(boreholes):
+    """Solve the trajectories of a queryset of boreholes with two queries and a single ``minimum_curvature`` call.
+
+    Boreholes without survey stations are treated as straight holes described by their own azimuth, inclination and
+    length (vertical if not given).
+    """
+    rows = list(
+        SurveyStation.objects.filter(borehole__in=boreholes).values_list(
+            "borehole_id", "measured_depth", "inclination", "azimuth"
+        )
+    )
+    surveyed = {row[0] for row in rows}
+    for pk, inclination, azimuth, length in boreholes.values_list("pk", "inclination", "azimuth", "length"):
+        if pk in surveyed:
+            continue
+        inclination = 90.0 if inclination is None else inclination
+        azimuth = 0.0 if azimuth is None else azimuth
+        rows.append((pk, 0.0, inclination, azimuth))
+        if length is not None:
+            rows.append((pk, length, inclination, azimuth))
+
+    columns = list(zip(*rows)) or [(), (), (), ()]
+    groups = np.array(columns[0], dtype=object)
+    md, inclination, azimuth = (magnitudes(values, units=None) for values in columns[1:])
+    order = np.lexsort((md, groups.astype(str)))
+    return minimum_curvature(md[order], inclination[order], azimuth[order], groups[order])
+
+
+def get_trajectories(boreholes):
+    """Return the trajectory of a queryset of boreholes, grouped by borehole pk.
+
+    Trajectories are cached per borehole; only boreholes that are not cached yet are loaded and solved.
+    """
+    pks = list(boreholes.values_list("pk", flat=True))
+    missing = [pk for pk in pks if pk not in _cache]
+    if missing:
+        solved = _solve(boreholes.model._default_manager.filter(pk__in=missing))
+        with _lock:
+            for pk in missing:
+                _cache[pk] = solved.select(pk)
+    return Trajectory.concatenate(_cache[pk] for pk in pks if pk in _cache)
+
+
+def invalidate_trajectories(*pks):
+    """Discard the cached trajectories of the given boreholes (or of all boreholes)."""
+    with _lock:
+        if not pks:
+            _cache.clear()
+        for pk in pks:
+            _cache.pop(pk, None)
+
+
+@dataclass
+class TrueVerticalDepths:
+    """True vertical depths of the tops and bottoms of intervals, as parallel arrays.
+
+    ``top_tvd``/``bottom_tvd`` are depths below the collar, ``top_tvdss``/``bottom_tvdss`` depths below sea level,
+    i.e. the TVD minus the collar elevation. Missing values are NaN, as are the TVDSS of boreholes whose elevation is
+    not given relative to mean sea level (see ``SEA_LEVEL_DATUMS``); other vertical datums are not converted.
+    """
+
+    pk: np.ndarray
+    borehole: np.ndarray
+    top_tvd: np.ndarray
+    bottom_tvd: np.ndarray
+    top_tvdss: np.ndarray
+    bottom_tvdss: np.ndarray
+
+
+def _interval_depths(intervals, borehole=None, borehole_field=None):
+    """Load ``(pks, boreholes, top, bottom)`` arrays for a queryset of intervals (see ``true_vertical_depths``)."""
+    if borehole is not None:
+        rows = [(pk, borehole.pk, top, bottom) for pk, top, bottom in intervals.values_list("pk", "top", "bottom")]
+    elif borehole_field is not None:
+        rows = list(intervals.values_list("pk", borehole_field, "top", "bottom"))
+    elif issubclass(intervals.model, Borehole):
+        rows = list(intervals.values_list("pk", "pk", "top", "bottom"))
+    else:
+        msg = f"Pass the borehole (or the lookup to it) of the {intervals.model._meta.verbose_name} intervals."
+        raise ValueError(msg)
+
+    columns = list(zip(*rows)) or [(), (), (), ()]
+    pks, groups = np.array(columns[0], dtype=object), np.array(columns[1], dtype=object)
+    return pks, groups, magnitudes(columns[2], units=None), magnitudes(columns[3], units=None)
+
+
+def _boreholes(groups):
+    return Borehole.objects.filter(pk__in={group for group in groups if group is not None})
+
+
+def true_vertical_depths(intervals, borehole=None, borehole_field=None):
+    """Convert the measured ``top``/``bottom`` of a queryset of intervals to true vertical depths.
+
+    The borehole each interval was measured along is either ``borehole`` (for all intervals), read from the
+    ``borehole_field`` lookup of each interval, or, for querysets of boreholes, the borehole itself. All intervals are
+    converted with one query for the depths, one for the collar elevations and a single interpolation.
+    """
+    pks, groups, top, bottom = _interval_depths(intervals, borehole, borehole_field)
+    boreholes = _boreholes(groups)
+    trajectory = get_trajectories(boreholes)
+    elevations = {
+        pk: elevation if datum in SEA_LEVEL_DATUMS else None
+        for pk, elevation, datum in boreholes.values_list("pk", "elevation", "elevation_datum")
+    }
+    elevation = magnitudes([elevations.get(group) for group in groups], units=None)
+
+    top_tvd = interpolate(trajectory, groups, top)[2]
+    bottom_tvd = interpolate(trajectory, groups, bottom)[2]
+    return TrueVerticalDepths(pks, groups, top_tvd, bottom_tvd, top_tvd - elevation, bottom_tvd - elevation)
+
+
+def update_interval_positions(intervals, borehole=None, borehole_field=None, batch_size=1000):
+    """Calculate and store the ``IntervalPosition`` of the midpoint of every interval in a queryset.
+
+    The borehole of each interval is resolved as in ``true_vertical_depths``. The collar is placed at the longitude,
+    latitude and elevation of the borehole location, taking the elevation as height above the ellipsoid. As for the
+    TVDSS, only elevations relative to sea level (see ``SEA_LEVEL_DATUMS``) are used: a collar with another datum or
+    without an elevation is placed at height 0. Intervals whose position cannot be determined (no location, no depths)
+    lose any stored position. Returns the number of positions written.
+    """
+    pks, groups, top, bottom = _interval_depths(intervals, borehole, borehole_field)
+    middle = np.where(np.isnan(top), bottom, np.where(np.isnan(bottom), top, (top + bottom) / 2))
+    boreholes = _boreholes(groups)
+    north, east, tvd = interpolate(get_trajectories(boreholes), groups, middle)
+
+    collars = {
+        pk: (x, y, elevation if datum in SEA_LEVEL_DATUMS else None)
+        for pk, x, y, elevation, datum in boreholes.values_list(
+            "pk", "location__x", "location__y", "elevation", "elevation_datum"
+        )
+    }
+    longitude, latitude, elevation = (
+        magnitudes([collars.get(group, (None, None, None))[i] for group in groups], units=None) for i in range(3)
+    )
+    x, y, z = local_to_ecef(longitude, latitude, np.nan_to_num(elevation), east, north, -tvd)
+
+    valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(z)
+    objs = [
+        IntervalPosition(sample_id=pks[i], borehole_id=groups[i], x=x[i], y=y[i], z=z[i], tvd=tvd[i])
+        for i in np.flatnonzero(valid).tolist()
+    ]
+    with transaction.atomic(using=intervals.db):
+        IntervalPosition.objects.filter(sample_id__in=list(pks[~valid])).delete()
+        IntervalPosition.objects.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["sample"],
+            update_fields=["borehole", "x", "y", "z", "tvd"],
+        )
+    # bulk_create does not send post_save, so the in-memory index has to be reset here
+    invalidate_position_tree(IntervalPosition)
+    return len(objs)
+
+
+def refresh_interval_positions(*boreholes, batch_size=1000):
+    """Recalculate the stored ``IntervalPosition`` of every interval measured along the given boreholes (pks).
+
+    Each interval is loaded through its own (polymorphic) model, so positions written by ``update_interval_positions``
+    for any kind of interval are kept up to date. Returns the number of positions written.
+    """
+    rows = IntervalPosition.objects.filter(borehole_id__in=boreholes).values_list(
+        "borehole_id", "sample__polymorphic_ctype", "sample_id"
+    )
+    intervals = defaultdict(list)
+    for borehole, ctype, pk in rows:
+        intervals[borehole, ctype].append(pk)
+
+    found = Borehole.objects.in_bulk({borehole for borehole, _ctype in intervals})
+    count = 0
+    for (borehole, ctype), pks in intervals.items():
+        model = ContentType.objects.get_for_id(ctype).model_class()
+        count += update_interval_positions(
+            model._base_manager.filter(pk__in=pks), borehole=found[borehole], batch_size=batch_size
+        )
+    return count
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import ClusterView
+
+urls = [
+    path(
+        "sites/clusters.json",
+        ClusterView.as_view(),
+        name="sites-clusters",
+    ),
+]
@@ -0,0 +1,56 @@
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views import View
+
+from fairdm_geo.conf import settings
+
+from .clusters import MAX_ZOOM, WORLD, get_clusters
+
+
+def parse_bbox(value):
+    """Parse a ``west,south,east,north`` query parameter, raising ``ValueError`` if it is not a valid box."""
+    try:
+        bbox = tuple(float(v) for v in value.split(","))
+    except ValueError:
+        bbox = ()
+    if len(bbox) != 4:
+        msg = "The bbox must be four numbers: west,south,east,north."
+        raise ValueError(msg)
+    west, south, east, north = bbox
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        msg = "The bbox is outside the valid longitude/latitude range."
+        raise ValueError(msg)
+    return bbox
+
+
+class ClusterView(View):
+    """Serve sampling locations clustered into grid cells as GeoJSON (see ``fairdm_geo.sites.clusters``).
+
+    Takes ``?zoom=<z>&bbox=<west>,<south>,<east>,<north>``. Each feature is a point at the mean position of the
+    locations in one cell, with the cell ``bbox``, the ``count`` of locations and their counts per ``type`` and
+    ``elevation_datum`` as properties.
+    """
+
+    def get(self, request):
+        try:
+            zoom = int(request.GET.get("zoom", 0))
+        except ValueError:
+            zoom = -1
+        if not 0 <= zoom <= MAX_ZOOM:
+            return HttpResponseBadRequest(f"The zoom level must be an integer between 0 and {MAX_ZOOM}.")
+        try:
+            bbox = parse_bbox(request.GET["bbox"]) if "bbox" in request.GET else WORLD
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": cell["center"]},
+                "properties": {key: value for key, value in cell.items() if key != "center"},
+            }
+            for cell in get_clusters(zoom, bbox)
+        ]
+        response = JsonResponse({"type": "FeatureCollection", "features": features})
+        patch_cache_control(response, public=True, max_age=settings.FAIRDM_GEO_CLUSTER_MAX_AGE)
+        return response
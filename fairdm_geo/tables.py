@@ -1,12 +1,110 @@
 import django_tables2 as tables
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 from easy_icons import icon
 from fairdm.core.tables import SampleTable
 
+from fairdm_geo.paginators import KeysetPaginator
 
-class PointTable(SampleTable):
-    latitude = tables.Column(accessor="location.x", verbose_name=_("Latitude"))
-    longitude = tables.Column(accessor="location.y", verbose_name=_("Longitude"))
+
+def resolve_accessor(model, path):
+    """Split a ``location.x``-style accessor into the forward relations to join and the final field on the last one.
+
+    Returns ``(relations, field)`` where ``relations`` is a list of ``__`` joined relation paths and ``field`` is the
+    field path to load, or None if the accessor ends on a relation or on something that is not a model field (a
+    property or method), in which case the whole related object is needed.
+    """
+    relations, prefix = [], []
+    for part in path.replace(".", "__").split("__"):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return relations, None
+        if not field.is_relation:
+            return relations, "__".join([*prefix, field.name])
+        if not (field.many_to_one or field.one_to_one) or (field.auto_created and not field.concrete):
+            # reverse and many-to-many relations cannot be joined with select_related
+            return relations, None
+        prefix.append(part)
+        relations.append("__".join(prefix))
+        model = field.related_model
+    return relations, None
+
+
+class QueryOptimizedTableMixin:
+    """Trims the backing queryset of a table to what its columns display.
+
+    Forward relations used by column accessors are joined with ``select_related()``. If every accessor into a related
+    model is a plain field (e.g. ``location.x``), only those fields of the related model are loaded; columns that use
+    the related object itself (e.g. a linkified ``location`` column) load it in full. Fields of the table's own model
+    are always loaded in full. Extra paths the table needs beyond its columns (e.g. for custom ``render_*`` methods)
+    can be listed in ``related_fields``.
+
+    Set ``keyset_pagination = True`` to paginate with ``KeysetPaginator`` instead of page offsets.
+    """
+
+    related_fields = []
+    keyset_pagination = False
+    keyset_template_name = "fairdm_geo/tables/keyset_table.html"
+
+    def __init__(self, data=None, *args, exclude=None, **kwargs):
+        if isinstance(data, QuerySet):
+            data = self.optimize_queryset(data, exclude=exclude)
+        super().__init__(data, *args, exclude=exclude, **kwargs)
+
+    @classmethod
+    def get_accessors(cls, exclude=None):
+        exclude = set(exclude or ())
+        accessors = [str(column.accessor or name) for name, column in cls.base_columns.items() if name not in exclude]
+        return [*accessors, *cls.related_fields]
+
+    @classmethod
+    def optimize_queryset(cls, queryset, exclude=None):
+        select, only, full = set(), set(), set()
+        for accessor in cls.get_accessors(exclude):
+            relations, field = resolve_accessor(queryset.model, accessor)
+            select.update(relations)
+            if relations and field is None:
+                full.add(relations[-1])
+            elif relations:
+                only.add(field)
+
+        if not select:
+            return queryset
+        queryset = queryset.select_related(*sorted(select))
+
+        trimmed = {path for path in select if not any(f == path or f.startswith(f"{path}__") for f in full)}
+        if not trimmed:
+            return queryset
+        # only() restricts every model in the query, so list the fields of the table's model and of the relations
+        # that are loaded in full explicitly
+        loaded = [f.name for f in queryset.model._meta.concrete_fields]
+        for path in select - trimmed:
+            model = queryset.model
+            for part in path.split("__"):
+                model = model._meta.get_field(part).related_model
+            loaded += [f"{path}__{f.name}" for f in model._meta.concrete_fields]
+        loaded += [f for f in only if f.rsplit("__", 1)[0] in trimmed]
+        return queryset.only(*loaded)
+
+    def paginate(self, paginator_class=Paginator, per_page=None, page=1, *args, **kwargs):
+        if self.keyset_pagination:
+            paginator_class = KeysetPaginator
+            # RequestConfig only passes integer page numbers on, so read the cursor from the request directly
+            request = getattr(self, "request", None)
+            if request is not None and page == 1:
+                page = request.GET.get(self.prefixed_page_field, page)
+            # the offset page range of the default template does not apply to cursors
+            self.keyset_base_template = self.template_name
+            self.template_name = self.keyset_template_name
+        return super().paginate(paginator_class, per_page, page, *args, **kwargs)
+
+
+class PointTable(QueryOptimizedTableMixin, SampleTable):
+    latitude = tables.Column(accessor="location.y", verbose_name=_("Latitude"))
+    longitude = tables.Column(accessor="location.x", verbose_name=_("Longitude"))
     location = tables.Column(accessor="location", linkify=True)
 
     def render_location(self, record):
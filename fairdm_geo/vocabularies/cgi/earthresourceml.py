@@ -2,97 +2,103 @@
 
 from research_vocabs import Vocabulary
 
+from fairdm_geo.vocabularies.snapshot import VocabularySnapshotMixin
 
-class CommodityCode(Vocabulary):
+
+class EarthResourceVocabulary(VocabularySnapshotMixin, Vocabulary):
+    """Base class for EarthResourceML vocabularies, resolved from the vocabulary snapshot when possible."""
+
+
+class CommodityCode(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/CommodityCode.ttl"
 
 
-class EarthResourceExpression(Vocabulary):
+class EarthResourceExpression(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/EarthResourceExpression.ttl"
 
 
-class EarthResourceForm(Vocabulary):
+class EarthResourceForm(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/EarthResourceForm.ttl"
 
 
-class EarthResourceMaterialRole(Vocabulary):
+class EarthResourceMaterialRole(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/EarthResourceMaterialRole.ttl"
 
 
-class EarthResourceShape(Vocabulary):
+class EarthResourceShape(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/EarthResourceShape.ttl"
 
 
-class EndUsePotential(Vocabulary):
+class EndUsePotential(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/EndUsePotential.ttl"
 
 
-class EnvironmentalImpact(Vocabulary):
+class EnvironmentalImpact(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/EnvironmentalImpact.ttl"
 
 
-class ExplorationActivityType(Vocabulary):
+class ExplorationActivityType(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/ExplorationActivityType.ttl"
 
 
-class ExplorationResult(Vocabulary):
+class ExplorationResult(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/ExplorationResult.ttl"
 
 
-class MineStatus(Vocabulary):
+class MineStatus(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/MineStatus.ttl"
 
 
-class MineralOccurrenceType(Vocabulary):
+class MineralOccurrenceType(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/MineralOccurrenceType.ttl"
 
 
-class MineralResourceReportingClassificationMethod(Vocabulary):
+class MineralResourceReportingClassificationMethod(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/ClassificationMethodUsed.ttl"
 
 
-class MiningActivity(Vocabulary):
+class MiningActivity(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/MiningActivity.ttl"
 
 
-class ProcessingActivity(Vocabulary):
+class ProcessingActivity(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/ProcessingActivity.ttl"
 
 
-class RawMaterialRole(Vocabulary):
+class RawMaterialRole(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/RawMaterialRole.ttl"
 
 
-class ReserveAssessmentCategory(Vocabulary):
+class ReserveAssessmentCategory(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/ReserveCategory.ttl"
 
 
-class ResourceAssessmentCategory(Vocabulary):
+class ResourceAssessmentCategory(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/ResourceCategory.ttl"
 
 
-class UNFCCode(Vocabulary):
+class UNFCCode(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/UNFCValue.ttl"
 
 
-class WasteStorage(Vocabulary):
+class WasteStorage(EarthResourceVocabulary):
     class Meta:
         source = "https://github.com/CGI-IUGS/cgi-vocabs/blob/master/vocabularies/earthresourceml/WasteStorage.ttl"
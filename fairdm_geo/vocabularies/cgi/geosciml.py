@@ -11,10 +11,10 @@ https://raw.githubusercontent.com/CGI-IUGS/cgi-vocabs
 
 """
 
-from research_vocabs.vocabularies import RemoteVocabulary
+from fairdm_geo.vocabularies.snapshot import SnapshotVocabulary
 
 
-class RemoteTTLVocabulary(RemoteVocabulary):
+class RemoteTTLVocabulary(SnapshotVocabulary):
     def _source(self):
         return {
             "source": self._meta.source,
@@ -1,7 +1,7 @@
-from research_vocabs import RemoteVocabulary
+from fairdm_geo.vocabularies.snapshot import SnapshotVocabulary
 
 
-class ActionType(RemoteVocabulary):
+class ActionType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/actiontype/?format=skos",
@@ -11,7 +11,7 @@ class ActionType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/actiontype/"
 
 
-class AggregationStatistic(RemoteVocabulary):
+class AggregationStatistic(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/aggregationstatistic/?format=skos",
@@ -21,7 +21,7 @@ class AggregationStatistic(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/aggregationstatistic/"
 
 
-class AnnotationType(RemoteVocabulary):
+class AnnotationType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/annotationtype/?format=skos",
@@ -31,7 +31,7 @@ class AnnotationType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/annotationtype/"
 
 
-class CensorCode(RemoteVocabulary):
+class CensorCode(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/censorcode/?format=skos",
@@ -41,7 +41,7 @@ class CensorCode(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/censorcode/"
 
 
-class DataQualityType(RemoteVocabulary):
+class DataQualityType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/dataqualitytype/?format=skos",
@@ -51,7 +51,7 @@ class DataQualityType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/dataqualitytype/"
 
 
-class DatasetType(RemoteVocabulary):
+class DatasetType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/datasettype/?format=skos",
@@ -61,7 +61,7 @@ class DatasetType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/datasettype/"
 
 
-class DirectivesType(RemoteVocabulary):
+class DirectivesType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/directivestype/?format=skos",
@@ -71,7 +71,7 @@ class DirectivesType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/directivestype/"
 
 
-class ElevationDatum(RemoteVocabulary):
+class ElevationDatum(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/elevationdatum/?format=skos",
@@ -81,7 +81,7 @@ class ElevationDatum(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/elevationdatum/"
 
 
-class EquipmentType(RemoteVocabulary):
+class EquipmentType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/equipmenttype/?format=skos",
@@ -91,7 +91,7 @@ class EquipmentType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/equipmenttype/"
 
 
-class Medium(RemoteVocabulary):
+class Medium(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/medium/?format=skos",
@@ -101,7 +101,7 @@ class Medium(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/medium/"
 
 
-class MethodType(RemoteVocabulary):
+class MethodType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/methodtype/?format=skos",
@@ -111,7 +111,7 @@ class MethodType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/methodtype/"
 
 
-class OrganizationType(RemoteVocabulary):
+class OrganizationType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/organizationtype/?format=skos",
@@ -121,7 +121,7 @@ class OrganizationType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/organizationtype/"
 
 
-class PropertyDataType(RemoteVocabulary):
+class PropertyDataType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/propertydatatype/?format=skos",
@@ -131,7 +131,7 @@ class PropertyDataType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/propertydatatype/"
 
 
-class QualityCode(RemoteVocabulary):
+class QualityCode(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/qualitycode/?format=skos",
@@ -141,7 +141,7 @@ class QualityCode(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/qualitycode/"
 
 
-class RelationshipType(RemoteVocabulary):
+class RelationshipType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/relationshiptype/?format=skos",
@@ -151,7 +151,7 @@ class RelationshipType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/relationshiptype/"
 
 
-class ResultType(RemoteVocabulary):
+class ResultType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/resulttype/?format=skos",
@@ -161,7 +161,7 @@ class ResultType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/resulttype/"
 
 
-class SamplingFeatureGeoType(RemoteVocabulary):
+class SamplingFeatureGeoType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/samplingfeaturegeotype/?format=skos",
@@ -171,7 +171,7 @@ class SamplingFeatureGeoType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/samplingfeaturegeotype/"
 
 
-class SamplingFeatureType(RemoteVocabulary):
+class SamplingFeatureType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/samplingfeaturetype/?format=skos",
@@ -181,7 +181,7 @@ class SamplingFeatureType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/samplingfeaturetype/"
 
 
-class SiteType(RemoteVocabulary):
+class SiteType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/sitetype/?format=skos",
@@ -191,7 +191,7 @@ class SiteType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/sitetype/"
 
 
-class SpatialOffsetType(RemoteVocabulary):
+class SpatialOffsetType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/spatialoffsettype/?format=skos",
@@ -201,7 +201,7 @@ class SpatialOffsetType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/spatialoffsettype/"
 
 
-class Speciation(RemoteVocabulary):
+class Speciation(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/speciation/?format=skos",
@@ -211,7 +211,7 @@ class Speciation(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/speciation/"
 
 
-class SpecimenType(RemoteVocabulary):
+class SpecimenType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/specimentype/?format=skos",
@@ -221,7 +221,7 @@ class SpecimenType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/specimentype/"
 
 
-class Status(RemoteVocabulary):
+class Status(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/status/?format=skos",
@@ -231,7 +231,7 @@ class Status(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/status/"
 
 
-class TaxonomicClassifierType(RemoteVocabulary):
+class TaxonomicClassifierType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/taxonomicclassifiertype/?format=skos",
@@ -241,7 +241,7 @@ class TaxonomicClassifierType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/taxonomicclassifiertype/"
 
 
-class UnitsType(RemoteVocabulary):
+class UnitsType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/unittype/?format=skos",
@@ -251,7 +251,7 @@ class UnitsType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/unittype/"
 
 
-class VariableName(RemoteVocabulary):
+class VariableName(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/variablename/?format=skos",
@@ -261,7 +261,7 @@ class VariableName(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/variablename/"
 
 
-class VariableType(RemoteVocabulary):
+class VariableType(SnapshotVocabulary):
     class Meta:
         source = {
             "source": "http://vocabulary.odm2.org/api/v1/variabletype/?format=skos",
@@ -271,7 +271,7 @@ class VariableType(RemoteVocabulary):
         namespace = "http://vocabulary.odm2.org/variabletype/"
 
 
-# class ODM2Units(RemoteVocabulary):
+# class ODM2Units(SnapshotVocabulary):
 #     class Meta:
 #         source = "http://vocabulary.odm2.org/api/v1/unitstype/?format=skos"
 #         prefix = "odm2b"
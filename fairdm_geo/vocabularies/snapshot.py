@@ -0,0 +1,302 @@
+"""Offline snapshots of the remote vocabularies used by fairdm_geo.
+
+Every vocabulary in this package points at a remote SKOS/Turtle document that is downloaded and parsed with rdflib
+the first time it is instantiated. That is slow at worker startup and impossible on machines without network access.
+
+``build_snapshot`` serializes the concepts (name, URI, label, broader concept and the remaining RDF attributes) of
+each vocabulary into a single SQLite file. Vocabularies that inherit from ``VocabularySnapshotMixin`` answer
+``choices``, ``values`` and ``concepts()`` from that file and only parse the remote source when the vocabulary is
+missing from the snapshot or when something that needs the full graph is accessed. Either way, instantiating a
+vocabulary never parses anything; that happens on first use.
+
+The snapshot is regenerated with ``python manage.py build_vocabulary_snapshot`` and shipped inside the package as
+package data; the release workflow rebuilds it and refuses to publish if ``build_vocabulary_snapshot --check`` finds a
+vocabulary that the snapshot cannot resolve.
+"""
+
+import importlib
+import inspect
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from functools import cache
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from research_vocabs.vocabularies import RemoteVocabulary
+
+from fairdm_geo import __version__
+from fairdm_geo.conf import settings
+
+# bump whenever the table layout below changes; snapshots with a different format are ignored
+SNAPSHOT_FORMAT = 1
+
+# modules that are scanned for vocabularies when building a snapshot
+VOCABULARY_MODULES = [
+    "fairdm_geo.vocabularies.odm2",
+    "fairdm_geo.vocabularies.stratigraphy",
+    "fairdm_geo.vocabularies.cgi.geosciml",
+    "fairdm_geo.vocabularies.cgi.earthresourceml",
+]
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE vocabulary (
+    key TEXT PRIMARY KEY,
+    source TEXT,
+    concept_count INTEGER NOT NULL
+);
+CREATE TABLE concept (
+    vocabulary TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    uri TEXT NOT NULL,
+    label TEXT NOT NULL,
+    broader TEXT,
+    attrs TEXT NOT NULL,
+    PRIMARY KEY (vocabulary, position)
+) WITHOUT ROWID;
+"""
+
+
+class SnapshotConcept:
+    """A concept read back from a snapshot.
+
+    Mirrors the parts of the research_vocabs concept interface that fairdm_geo relies on (``name``, ``URI``,
+    ``label()`` and ``attrs``), so snapshot concepts can be passed to ``AbstractConcept._get_defaults``.
+    """
+
+    __slots__ = ("URI", "_label", "attrs", "broader", "name")
+
+    def __init__(self, name, uri, label, broader=None, attrs=None):
+        self.name = name
+        self.URI = uri
+        self._label = label
+        self.broader = broader
+        self.attrs = attrs or {}
+
+    def __repr__(self):
+        return f"<SnapshotConcept: {self.name}>"
+
+    def __str__(self):
+        return self._label
+
+    def label(self):
+        return self._label
+
+
+class SnapshotStore:
+    """Read-only access to a vocabulary snapshot file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._concepts = {}
+        with closing(self._connect()) as conn:
+            self.meta = dict(conn.execute("SELECT key, value FROM meta"))
+            self.vocabularies = {key for (key,) in conn.execute("SELECT key FROM vocabulary")}
+
+    def _connect(self):
+        return sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+
+    @property
+    def is_compatible(self):
+        return self.meta.get("format") == str(SNAPSHOT_FORMAT)
+
+    def __contains__(self, key):
+        return key in self.vocabularies
+
+    def concepts(self, key):
+        """Return the concepts stored for the vocabulary ``key``, or None if it is not part of the snapshot."""
+        if key not in self.vocabularies:
+            return None
+        if key not in self._concepts:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT name, uri, label, broader, attrs FROM concept WHERE vocabulary = ? ORDER BY position",
+                    (key,),
+                ).fetchall()
+            self._concepts[key] = [
+                SnapshotConcept(name, uri, label, broader, json.loads(attrs))
+                for name, uri, label, broader, attrs in rows
+            ]
+        return self._concepts[key]
+
+
+@cache
+def get_snapshot_store():
+    """Return the configured ``SnapshotStore``, or None if there is no usable snapshot."""
+    path = settings.FAIRDM_GEO_VOCABULARY_SNAPSHOT
+    if not path or not Path(path).exists():
+        return None
+    store = SnapshotStore(path)
+    if not store.is_compatible:
+        return None
+    return store
+
+
+def missing_vocabularies(vocabularies, store=None):
+    """Return the keys of the vocabulary classes in ``vocabularies`` that are not part of the snapshot ``store``.
+
+    ``store`` defaults to the configured snapshot; without a usable snapshot every vocabulary is missing.
+    """
+    store = store if store is not None else get_snapshot_store()
+    return [cls.snapshot_key() for cls in vocabularies if store is None or cls.snapshot_key() not in store]
+
+
+class VocabularySnapshotMixin:
+    """Resolve a vocabulary lazily, from the snapshot when possible.
+
+    Instantiating the vocabulary costs nothing: neither the snapshot nor the remote source is read until concept data
+    is actually needed, and the parent ``__init__`` (which downloads and parses the remote source) is deferred until
+    then too. When the vocabulary is part of the snapshot, ``choices``, ``values`` and ``concepts()`` are answered from
+    it and the remote source is only parsed if an attribute that the snapshot cannot provide is accessed. Pass
+    ``use_snapshot=False`` to always load from the remote source.
+    """
+
+    # public instance attributes set by the deferred research_vocabs ``__init__``. Only these load the vocabulary when
+    # accessed, so probing an unloaded vocabulary for anything else (e.g. Django's
+    # ``hasattr(value, "resolve_expression")``) does not parse the remote source. A test checks this list against
+    # research_vocabs.
+    deferred_attributes = frozenset({"graph"})
+
+    def __init__(self, *args, use_snapshot=True, **kwargs):
+        self._use_snapshot = use_snapshot
+        self._deferred_init = (args, kwargs)
+        if not settings.FAIRDM_GEO_LAZY_VOCABULARIES and self._get_snapshot() is None:
+            self._load()
+
+    def __getattr__(self, name):
+        # only called for attributes that are not set yet. Private and special names (e.g. probes for __deepcopy__)
+        # never need the parsed RDF graph; public ones only if the deferred __init__ would set them.
+        if name.startswith("_") or "_deferred_init" not in self.__dict__ or name not in self.deferred_attributes:
+            raise AttributeError(name)
+        self._load()
+        return getattr(self, name)
+
+    def _get_snapshot(self):
+        """The concepts of this vocabulary in the snapshot (None if it is not part of it), read on first use."""
+        if "_snapshot" not in self.__dict__:
+            store = get_snapshot_store() if self._use_snapshot else None
+            snapshot = store.concepts(self.snapshot_key()) if store else None
+            if snapshot is None and self._use_snapshot and settings.FAIRDM_GEO_VOCABULARY_OFFLINE:
+                msg = (
+                    f"The vocabulary '{self.snapshot_key()}' is not part of the vocabulary snapshot and "
+                    "FAIRDM_GEO_VOCABULARY_OFFLINE is enabled. Rebuild the snapshot with "
+                    "'python manage.py build_vocabulary_snapshot'."
+                )
+                raise ImproperlyConfigured(msg)
+            self._snapshot = snapshot
+        return self._snapshot
+
+    @property
+    def is_loaded(self):
+        """Whether the remote source has been parsed."""
+        return "_deferred_init" not in self.__dict__
+
+    def _load(self):
+        deferred = self.__dict__.pop("_deferred_init", None)
+        if deferred is not None:
+            args, kwargs = deferred
+            super().__init__(*args, **kwargs)
+
+    @classmethod
+    def snapshot_key(cls):
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    @property
+    def choices(self):
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            self._load()
+            return super().choices
+        return [(c.name, c.label()) for c in snapshot]
+
+    @property
+    def values(self):
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            self._load()
+            return super().values
+        return [c.name for c in snapshot]
+
+    def concepts(self):
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            self._load()
+            return super().concepts()
+        return list(snapshot)
+
+
+class SnapshotVocabulary(VocabularySnapshotMixin, RemoteVocabulary):
+    """A ``RemoteVocabulary`` that is resolved from the vocabulary snapshot when possible."""
+
+
+def iter_vocabularies(modules=None):
+    """Yield every snapshot-aware vocabulary class defined in ``modules`` (defaults to ``VOCABULARY_MODULES``)."""
+    for module_name in modules or VOCABULARY_MODULES:
+        module = importlib.import_module(module_name)
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            # base classes without their own Meta (e.g. RemoteTTLVocabulary) have nothing to load
+            if cls.__module__ == module_name and issubclass(cls, VocabularySnapshotMixin) and "Meta" in vars(cls):
+                yield cls
+
+
+def _concept_row(key, position, concept):
+    attrs = getattr(concept, "attrs", {}) or {}
+    broader = attrs.get("skos:broader")
+    if isinstance(broader, list | tuple):
+        broader = broader[0] if broader else None
+    return (
+        key,
+        position,
+        str(concept.name),
+        str(concept.URI),
+        str(concept.label()),
+        str(broader) if broader is not None else None,
+        json.dumps(attrs, default=str),
+    )
+
+
+def build_snapshot(vocabularies, path):
+    """Parse every vocabulary class in ``vocabularies`` from its remote source and write them to ``path``.
+
+    The file is written to a temporary location first and moved into place once complete, so running workers never
+    see a half-written snapshot. Returns a dict mapping vocabulary keys to the number of concepts written.
+    """
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    counts = {}
+    with closing(sqlite3.connect(tmp_path)) as conn:
+        conn.executescript(SCHEMA)
+        for cls in vocabularies:
+            vocabulary = cls(use_snapshot=False)
+            key = cls.snapshot_key()
+            rows = [_concept_row(key, i, concept) for i, concept in enumerate(vocabulary.concepts())]
+            conn.executemany("INSERT INTO concept VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            source = getattr(cls._meta, "source", None)
+            conn.execute(
+                "INSERT INTO vocabulary VALUES (?, ?, ?)",
+                (key, json.dumps(source) if isinstance(source, dict) else source, len(rows)),
+            )
+            counts[key] = len(rows)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("format", str(SNAPSHOT_FORMAT)),
+                ("fairdm_geo", __version__),
+                ("created", datetime.now(timezone.utc).isoformat()),
+            ],
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+
+    os.replace(tmp_path, path)
+    get_snapshot_store.cache_clear()
+    return counts
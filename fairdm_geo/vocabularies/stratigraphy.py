@@ -1,7 +1,7 @@
-from research_vocabs.vocabularies import RemoteVocabulary
+from fairdm_geo.vocabularies.snapshot import SnapshotVocabulary
 
 
-class GeologicalTimescale(RemoteVocabulary):
+class GeologicalTimescale(SnapshotVocabulary):
     class Meta:
         source = "https://vocabs.ardc.edu.au/registry/api/resource/downloads/1211/isc2020.ttl"
         prefix = "isc"
@@ -9,7 +9,7 @@ class GeologicalTimescale(RemoteVocabulary):
         rdf_type = "gts:GeochronologicEra"
 
 
-class GeochronologicBoundary(RemoteVocabulary):
+class GeochronologicBoundary(SnapshotVocabulary):
     class Meta:
         source = "https://vocabs.ardc.edu.au/registry/api/resource/downloads/1211/isc2020.ttl"
         prefix = "isc"
@@ -17,7 +17,7 @@ class GeochronologicBoundary(RemoteVocabulary):
         rdf_type = "gts:GeochronologicBoundary"
 
 
-class EraBoundary(RemoteVocabulary):
+class EraBoundary(SnapshotVocabulary):
     class Meta:
         source = "https://vocabs.ardc.edu.au/registry/api/resource/downloads/1211/isc2020.ttl"
         prefix = "isc"
@@ -8,6 +8,9 @@ fairdm.setup(
         "fairdm_geo.core",
         "fairdm_geo.sites",
         "fairdm_geo.rocks",
+        "fairdm_geo.gis.plates",
+        "fairdm_geo.gis.provinces",
+        "fairdm_geo.gis.natural_earth",
         "fairdm_geo.geology.geologic_time",
         "fairdm_geo.geology.lithology",
         "fairdm_geo.geology.stratigraphy",
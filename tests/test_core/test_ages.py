@@ -0,0 +1,68 @@
+import pytest
+
+from fairdm_geo.core.ages import refresh_age_bounds
+from fairdm_geo.factories.location import BoreholeFactory
+from fairdm_geo.geology.geologic_time.models import GeologicalTimescale
+from fairdm_geo.sites.models import Borehole
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def borehole():
+    borehole = BoreholeFactory()
+    borehole.age.clear()
+    return borehole
+
+
+@pytest.fixture
+def ages():
+    return {
+        name: GeologicalTimescale.objects.create(
+            name=name, label=name.title(), uri=f"https://example.org/{name}", younger_bound=younger, older_bound=older
+        )
+        for name, younger, older in [("cretaceous", 66.0, 145.0), ("jurassic", 145.0, 201.4), ("undated", None, None)]
+    }
+
+
+def bounds(borehole):
+    borehole.refresh_from_db(fields=["min_age_ma", "max_age_ma"])
+    return borehole.min_age_ma, borehole.max_age_ma
+
+
+def test_bounds_follow_add_remove_and_clear(borehole, ages):
+    borehole.age.add(ages["jurassic"])
+    assert bounds(borehole) == (145.0, 201.4)
+
+    borehole.age.add(ages["cretaceous"], ages["undated"])
+    assert bounds(borehole) == (66.0, 201.4)
+
+    borehole.age.remove(ages["jurassic"])
+    assert bounds(borehole) == (66.0, 145.0)
+
+    borehole.age.clear()
+    assert bounds(borehole) == (None, None)
+
+
+def test_bounds_follow_reverse_changes(borehole, ages):
+    accessor = Borehole._meta.get_field("age").remote_field.get_accessor_name()
+    intervals = getattr(ages["cretaceous"], accessor)
+
+    intervals.add(borehole)
+    assert bounds(borehole) == (66.0, 145.0)
+
+    intervals.clear()
+    assert bounds(borehole) == (None, None)
+
+
+def test_refresh_age_bounds_backfills(ages):
+    boreholes = BoreholeFactory.create_batch(3)
+    for borehole in boreholes:
+        borehole.age.set([ages["cretaceous"], ages["jurassic"]])
+    boreholes[0].age.clear()
+    # e.g. rows written before the columns existed, or with signals disconnected
+    Borehole.objects.update(min_age_ma=None, max_age_ma=None)
+
+    assert refresh_age_bounds(Borehole.objects.all(), batch_size=2) == 3
+    assert bounds(boreholes[0]) == (None, None)
+    assert bounds(boreholes[1]) == bounds(boreholes[2]) == (66.0, 201.4)
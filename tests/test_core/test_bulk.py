@@ -0,0 +1,55 @@
+import pytest
+from django.db import NotSupportedError, connection
+
+from fairdm_geo.core.bulk import bulk_create_inherited
+from fairdm_geo.factories.location import PointFactory, SamplingLocationFactory
+from fairdm_geo.sites.models import Borehole
+
+pytestmark = pytest.mark.django_db
+
+Point = PointFactory._meta.model
+
+
+@pytest.fixture
+def dataset():
+    return SamplingLocationFactory().dataset
+
+
+def make_boreholes(dataset, count):
+    return [
+        Borehole(name=f"BH{i}", dataset=dataset, location=PointFactory(), top=0, bottom=10 * i) for i in range(count)
+    ]
+
+
+def test_parent_links_point_at_the_new_rows(dataset):
+    objs = bulk_create_inherited(Borehole, make_boreholes(dataset, 5), batch_size=2)
+
+    assert len({obj.pk for obj in objs}) == 5
+    for obj in objs:
+        assert not obj._state.adding
+        for parent in Borehole._meta.get_parent_list():
+            assert getattr(obj, Borehole._meta.get_ancestor_link(parent).attname) == obj.pk
+            assert parent._base_manager.filter(pk=obj.pk).exists()
+
+    saved = Borehole.objects.filter(pk__in=[obj.pk for obj in objs]).order_by("name")
+    assert [(b.name, b.dataset_id, b.location_id) for b in saved] == [(o.name, dataset.pk, o.location_id) for o in objs]
+
+
+def test_preset_primary_keys_are_kept(dataset):
+    objs = make_boreholes(dataset, 2)
+    for i, obj in enumerate(objs, start=1_000_000):
+        obj.pk = i
+    bulk_create_inherited(Borehole, objs)
+    assert list(Borehole.objects.filter(pk__in=[o.pk for o in objs]).values_list("name", flat=True)) == ["BH0", "BH1"]
+
+
+def test_models_without_parents_use_bulk_create():
+    objs = bulk_create_inherited(Point, [Point(x=1, y=2), Point(x=3, y=4)])
+    assert all(obj.pk for obj in objs)
+    assert Point.objects.filter(pk__in=[obj.pk for obj in objs]).count() == 2
+
+
+def test_returning_primary_keys_is_required(dataset, monkeypatch):
+    monkeypatch.setattr(connection.features, "can_return_rows_from_bulk_insert", False)
+    with pytest.raises(NotSupportedError):
+        bulk_create_inherited(Borehole, make_boreholes(dataset, 1))
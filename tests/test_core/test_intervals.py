@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from django.core.exceptions import ValidationError
+
+from fairdm_geo.core.intervals import (
+    derive_depths,
+    find_gaps,
+    find_overlaps,
+    invalid_order,
+    magnitude,
+    sort_intervals,
+    validate_order,
+)
+
+nan = np.nan
+
+
+def test_derive_depths_positive_down():
+    top, bottom, depth = derive_depths(
+        [0, 10, nan, nan, nan],
+        [5, nan, 20, nan, nan],
+        [nan, 4, 5, 3, nan],
+    )
+    np.testing.assert_array_equal(top, [0, 10, 15, 0, nan])
+    np.testing.assert_array_equal(bottom, [5, 14, 20, 3, nan])
+    np.testing.assert_array_equal(depth, [5, 4, 5, 3, nan])
+
+
+def test_derive_depths_positive_up():
+    top, bottom, _depth = derive_depths([10, nan], [nan, 2], [4, 3], positive_down=False)
+    np.testing.assert_array_equal(top, [10, 5])
+    np.testing.assert_array_equal(bottom, [6, 2])
+
+
+def test_derive_depths_does_not_modify_inputs():
+    top = np.array([nan])
+    derive_depths(top, [nan], [3])
+    assert np.isnan(top[0])
+
+
+def test_validate_order():
+    top = np.array([0, 10, 5, nan])
+    bottom = np.array([5, 10, 1, 3])
+    assert invalid_order(top, bottom).tolist() == [1, 2]
+    with pytest.raises(ValidationError, match="#1"):
+        validate_order(top, bottom)
+    validate_order(np.array([5.0]), np.array([1.0]), positive_down=False)
+
+
+def test_magnitude():
+    assert np.isnan(magnitude(None))
+    assert magnitude(3) == 3.0
+
+
+def test_sort_intervals_normalises_bounds():
+    pks, lower, upper = sort_intervals(["b", "a"], [10, 5], [0, 0])
+    assert pks.tolist() == ["a", "b"]
+    assert lower.tolist() == [0, 0]
+    assert upper.tolist() == [5, 10]
+
+
+def test_find_gaps():
+    _pks, lower, upper = sort_intervals([1, 2, 3, 4], [0, 5, 20, 2], [10, 12, 30, 3])
+    assert find_gaps(lower, upper) == [(12.0, 20.0)]
+
+
+def test_find_overlaps():
+    # 1 and 2 touch at 10, 3 lies inside 2, 4 starts where 3 ends
+    pks, lower, upper = sort_intervals([1, 2, 3, 4], [0, 10, 12, 14], [10, 20, 14, 16])
+    assert sorted(find_overlaps(pks, lower, upper)) == [(2, 3), (2, 4)]
+
+
+def test_find_overlaps_empty():
+    assert find_overlaps(*sort_intervals([], [], [])) == []
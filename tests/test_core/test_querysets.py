@@ -0,0 +1,166 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from fairdm_geo.core.intervals import magnitude
+from fairdm_geo.core.models.base import VerticalIntervalQuerySet
+from fairdm_geo.factories.location import BoreholeFactory, PointFactory
+from fairdm_geo.sites.models import Borehole
+
+
+def list_intervals(queryset):
+    """Render every interval with its geology, the way a list view or table would."""
+    with CaptureQueriesContext(connection) as ctx:
+        for interval in queryset:
+            [str(c) for c in interval.lithology.all()]
+            [str(c) for c in interval.age.all()]
+            list(interval.stratigraphy.all())
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_with_geology_query_count_is_independent_of_size():
+    BoreholeFactory.create_batch(2)
+    small = list_intervals(Borehole.objects.with_geology())
+
+    BoreholeFactory.create_batch(20)
+    large = list_intervals(Borehole.objects.with_geology())
+
+    assert small == large
+    # without prefetching, every interval costs one query per relation
+    assert list_intervals(Borehole.objects.all()) >= large + 3 * 21
+
+
+@pytest.mark.django_db
+def test_with_geology_selected_relations():
+    BoreholeFactory.create_batch(3)
+    queryset = Borehole.objects.with_geology("lithology")
+    assert [p.prefetch_through for p in queryset._prefetch_related_lookups] == ["lithology"]
+
+
+@pytest.mark.django_db
+def test_bulk_create_intervals_derives_depths():
+    dataset = BoreholeFactory().dataset
+    objs = [
+        Borehole(name="both", dataset=dataset, location=PointFactory(), top=0, bottom=5),
+        Borehole(name="top", dataset=dataset, location=PointFactory(), top=10, vertical_depth=4),
+        Borehole(name="bottom", dataset=dataset, location=PointFactory(), bottom=20, vertical_depth=5),
+    ]
+    Borehole.objects.bulk_create_intervals(objs)
+
+    saved = Borehole.objects.filter(pk__in=[obj.pk for obj in objs])
+    depths = {b.name: [magnitude(b.top), magnitude(b.bottom), magnitude(b.vertical_depth)] for b in saved}
+    assert depths == {"both": [0, 5, 5], "top": [10, 14, 4], "bottom": [15, 20, 5]}
+
+
+@pytest.mark.django_db
+def test_save_keeps_derived_depths_in_base_units():
+    obj = Borehole(name="x", dataset=BoreholeFactory().dataset, location=PointFactory(), top=10, bottom=25)
+    obj.save()
+
+    field = Borehole._meta.get_field("vertical_depth")
+    assert type(obj.vertical_depth) is field.ureg.Quantity
+    assert str(obj.vertical_depth.units) == "meter"
+    assert obj.vertical_depth.magnitude == 15
+
+
+@pytest.mark.django_db
+def test_bulk_create_intervals_validates_order():
+    dataset = BoreholeFactory().dataset
+    with pytest.raises(ValidationError):
+        Borehole.objects.bulk_create_intervals([Borehole(name="x", dataset=dataset, top=10, bottom=5)])
+    assert not Borehole.objects.filter(name="x").exists()
+
+
+def test_default_manager_is_the_sample_manager():
+    assert Borehole._default_manager is Borehole.objects
+    assert not hasattr(Borehole, "intervals")
+
+
+# (top, bottom) of the boreholes queried below: a and b touch at 10, b and c overlap, nothing covers 30-40 and the
+# open-ended intervals are missing one of their bounds
+DEPTHS = {
+    "a": (0, 10),
+    "b": (10, 20),
+    "c": (15, 30),
+    "d": (40, 50),
+    "open_top": (None, 5),
+    "open_bottom": (5, None),
+}
+
+
+@pytest.fixture
+def boreholes(db):
+    created = {name: BoreholeFactory(name=name, top=top, bottom=bottom) for name, (top, bottom) in DEPTHS.items()}
+    return Borehole.objects.filter(pk__in=[obj.pk for obj in created.values()])
+
+
+@pytest.fixture(params=["range", "columns"])
+def intervals(request, boreholes, monkeypatch):
+    """The boreholes, queried through the ``numrange`` expression (PostgreSQL only) or the top/bottom columns."""
+    if request.param == "columns":
+        monkeypatch.setattr(VerticalIntervalQuerySet, "_use_range_index", lambda self: False)
+    elif connection.vendor != "postgresql":
+        pytest.skip("numrange queries need PostgreSQL")
+    return boreholes
+
+
+def names(queryset):
+    return sorted(queryset.values_list("name", flat=True))
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        (12, 14, ["b"]),
+        (10, 15, ["a", "b", "c"]),
+        (15, 10, ["a", "b", "c"]),
+        (30, 40, ["c", "d"]),
+        (31, 39, []),
+        (-10, 100, ["a", "b", "c", "d"]),
+    ],
+)
+def test_intersecting(intervals, start, end, expected):
+    assert names(intervals.intersecting(start, end)) == expected
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        (15, None, ["b", "c"]),
+        (10, None, ["a", "b"]),
+        (12, 18, ["b"]),
+        (18, 12, ["b"]),
+        (5, 15, []),
+        (35, None, []),
+    ],
+)
+def test_containing(intervals, start, end, expected):
+    assert names(intervals.containing(start, end)) == expected
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        (0, 20, ["a", "b"]),
+        (20, 0, ["a", "b"]),
+        (10, 30, ["b", "c"]),
+        (11, 29, []),
+        (-10, 100, ["a", "b", "c", "d"]),
+    ],
+)
+def test_within(intervals, start, end, expected):
+    assert names(intervals.within(start, end)) == expected
+
+
+def test_gaps(boreholes):
+    assert boreholes.gaps() == [(30, 40)]
+    assert boreholes.filter(name__in=["a", "b"]).gaps() == []
+
+
+def test_overlaps(boreholes):
+    pks = dict(boreholes.values_list("name", "pk"))
+    assert boreholes.overlaps() == [(pks["b"], pks["c"])]
+    # touching intervals do not overlap
+    assert boreholes.filter(name__in=["a", "b"]).overlaps() == []
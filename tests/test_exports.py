@@ -0,0 +1,95 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+import pyarrow.parquet as pq  # noqa: E402
+
+from fairdm_geo.exports import Exporter, to_arrow_table, write_arrow, write_parquet  # noqa: E402
+from fairdm_geo.factories.location import BoreholeFactory  # noqa: E402
+from fairdm_geo.geology.lithology.models import SimpleLithology  # noqa: E402
+from fairdm_geo.geology.stratigraphy.models import StratigraphicUnit  # noqa: E402
+from fairdm_geo.sites.models import Borehole  # noqa: E402
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def boreholes():
+    granite, basalt = (
+        SimpleLithology.objects.create(name=name, label=name.title(), uri=f"https://example.org/{name}")
+        for name in ("granite", "basalt")
+    )
+    (unit,) = StratigraphicUnit.objects.bulk_create([StratigraphicUnit()])
+    boreholes = BoreholeFactory.create_batch(5)
+    for i, borehole in enumerate(boreholes):
+        borehole.top, borehole.bottom = float(i), float(i + 10)
+        borehole.save()
+        borehole.lithology.set([granite, basalt] if i == 0 else [])
+        borehole.age.clear()
+        borehole.stratigraphy.set([unit] if i == 1 else [])
+    return Borehole.objects.filter(pk__in=[b.pk for b in boreholes])
+
+
+def test_schema(boreholes):
+    schema = Exporter(boreholes).schema
+    assert schema.names[:3] == ["id", "name", "top"]
+    assert schema.names[-5:] == ["longitude", "latitude", "lithology", "age", "stratigraphy"]
+    assert schema.field("top").type == pa.float64()
+    assert schema.field("min_age_ma").type == pa.float64()
+    assert schema.field("name").type == pa.string()
+    assert schema.field("vertical_datum").type == pa.string()
+    assert schema.field("lithology").type == pa.list_(pa.string())
+    # stratigraphic units have no name and are exported by primary key
+    assert schema.field("stratigraphy").type == pa.list_(pa.int64())
+
+    reprojected = Exporter(boreholes, target_crs="EPSG:3857").schema
+    assert reprojected.names[-5:-3] == ["x", "y"]
+
+
+def test_values(boreholes):
+    table = to_arrow_table(boreholes)
+    expected = list(boreholes.order_by("pk"))
+    assert table.num_rows == 5
+    assert table.column("id").to_pylist() == [b.pk for b in expected]
+    assert table.column("name").to_pylist() == [b.name for b in expected]
+    assert table.column("top").to_pylist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert table.column("vertical_depth").to_pylist() == [10.0] * 5
+    assert table.column("longitude").to_pylist() == [float(b.location.x) for b in expected]
+    assert table.column("latitude").to_pylist() == [float(b.location.y) for b in expected]
+
+
+def test_m2m_list_columns(boreholes):
+    table = to_arrow_table(boreholes)
+    unit = StratigraphicUnit.objects.get()
+    assert table.column("lithology").to_pylist() == [["basalt", "granite"], [], [], [], []]
+    assert table.column("age").to_pylist() == [[]] * 5
+    assert table.column("stratigraphy").to_pylist() == [[], [unit.pk], [], [], []]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 5])
+def test_batches_across_chunk_boundaries(boreholes, batch_size):
+    batches = list(Exporter(boreholes, batch_size=batch_size).iter_batches())
+    assert [batch.num_rows for batch in batches] == [min(batch_size, 5 - i) for i in range(0, 5, batch_size)]
+    assert pa.Table.from_batches(batches).equals(to_arrow_table(boreholes, batch_size=100))
+
+
+def test_empty_queryset(boreholes):
+    table = to_arrow_table(boreholes.none())
+    assert table.num_rows == 0
+    assert table.schema == Exporter(boreholes).schema
+
+
+def test_write_parquet(boreholes, tmp_path):
+    path = tmp_path / "boreholes.parquet"
+    assert write_parquet(boreholes, path, batch_size=2) == 5
+    assert pq.ParquetFile(path).num_row_groups == 3
+    assert pq.read_table(path).equals(to_arrow_table(boreholes))
+
+
+def test_write_arrow(boreholes, tmp_path):
+    path = tmp_path / "boreholes.arrow"
+    assert write_arrow(boreholes, path, batch_size=2) == 5
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        assert reader.num_record_batches == 3
+        assert reader.read_all().equals(to_arrow_table(boreholes))
@@ -0,0 +1,46 @@
+import json
+
+from django.test import RequestFactory
+
+from fairdm_geo.geology.autocomplete import ConceptAutocomplete
+from fairdm_geo.geology.search import invalidate_search_index
+
+
+class RankVocabulary:
+    choices = [("group", "Group"), ("formation", "Formation"), ("member", "Member"), ("bed", "Bed")]
+
+
+class RankAutocomplete(ConceptAutocomplete):
+    vocabulary = RankVocabulary
+    paginate_by = 2
+
+
+def get(**params):
+    return RankAutocomplete.as_view()(RequestFactory().get("/", params))
+
+
+def teardown_function():
+    invalidate_search_index()
+
+
+def test_vocabulary_autocomplete():
+    data = json.loads(get(q="form").content)
+    assert data["results"] == [{"id": "formation", "text": "Formation", "selected_text": "Formation", "context": []}]
+
+
+def test_pagination():
+    first = json.loads(get().content)
+    second = json.loads(get(page=2).content)
+    assert [r["id"] for r in first["results"]] == ["bed", "formation"]
+    assert first["pagination"] == {"more": True}
+    assert [r["id"] for r in second["results"]] == ["group", "member"]
+    assert second["pagination"] == {"more": False}
+
+
+def test_conditional_response():
+    response = get(q="mem")
+    assert response["ETag"]
+    assert "public" in response["Cache-Control"]
+    request = RequestFactory().get("/", {"q": "mem"}, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert RankAutocomplete.as_view()(request).status_code == 304
+    assert get(q="memb")["ETag"] != response["ETag"]
@@ -0,0 +1,52 @@
+import pytest
+
+from fairdm_geo.geology.geologic_time.index import IntervalTree
+from fairdm_geo.geology.geologic_time.models import GeologicalTimescale
+
+INTERVALS = [
+    (0, 66.0, "cenozoic"),
+    (66.0, 251.902, "mesozoic"),
+    (251.902, 538.8, "paleozoic"),
+    (0, 2.58, "quaternary"),
+    (2.58, 23.03, "neogene"),
+    (201.4, 251.902, "triassic"),
+    (251.902, 298.9, "permian"),
+]
+
+
+def brute_force_overlap(start, end):
+    return sorted(key for s, e, key in INTERVALS if s <= end and e >= start)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [(250, 300), (66.0, 66.0), (0, 0), (10, 20), (600, 700), (300, 250), (0, 1000)],
+)
+def test_overlapping_matches_brute_force(start, end):
+    tree = IntervalTree(INTERVALS)
+    assert sorted(tree.overlapping(start, end)) == brute_force_overlap(min(start, end), max(start, end))
+
+
+def test_containing():
+    tree = IntervalTree(INTERVALS)
+    assert sorted(tree.containing(1.0)) == ["cenozoic", "quaternary"]
+    assert sorted(tree.containing(66.0)) == ["cenozoic", "mesozoic"]
+    assert tree.containing(1000) == []
+
+
+def test_empty_tree():
+    assert IntervalTree([]).overlapping(0, 100) == []
+
+
+@pytest.mark.django_db
+def test_queryset_containing_uses_uncertainty():
+    GeologicalTimescale.objects.create(
+        name="example",
+        uri="https://example.org/example",
+        label="Example",
+        older_bound=10,
+        younger_bound=5,
+        older_bound_uncertainty=1,
+    )
+    assert not GeologicalTimescale.objects.containing(10.5).exists()
+    assert GeologicalTimescale.objects.containing(10.5, uncertainty=True).exists()
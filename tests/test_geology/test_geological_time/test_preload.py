@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fairdm_geo.geology.geologic_time.models import GeologicalTimescale, get_broader, parse_age_comments
+
+
+def test_parse_age_comments_in_bulk():
+    results = parse_age_comments(
+        [
+            ["older bound -440.8 +|-1.2 Ma", "younger bound -433.4 +|-0.8 Ma"],
+            [],
+            ["no age information"],
+            ["older bound -66.0 Ma"],
+        ]
+    )
+    assert results == [
+        {
+            "older_bound": 440.8,
+            "older_bound_uncertainty": 1.2,
+            "younger_bound": 433.4,
+            "younger_bound_uncertainty": 0.8,
+        },
+        {},
+        {},
+        {"older_bound": 66.0},
+    ]
+
+
+def test_parse_age_comment_without_match():
+    assert GeologicalTimescale._parse_age_comment("unknown bound -100 Ma") == {}
+
+
+@pytest.mark.parametrize(
+    "attrs, expected",
+    [
+        ({"skos:broader": ["https://example.org/jurassic"]}, "https://example.org/jurassic"),
+        ({"skos:broader": "https://example.org/jurassic"}, "https://example.org/jurassic"),
+        ({"skos:broader": []}, None),
+        ({}, None),
+    ],
+)
+def test_get_broader(attrs, expected):
+    assert get_broader(SimpleNamespace(attrs=attrs)) == expected
+
+
+@pytest.mark.django_db
+def test_preload_is_idempotent(django_assert_max_num_queries):
+    GeologicalTimescale.preload()
+    count = GeologicalTimescale.objects.count()
+    # a reload is a single upsert (plus transaction savepoints), regardless of the number of concepts
+    with django_assert_max_num_queries(3):
+        GeologicalTimescale.preload()
+    assert GeologicalTimescale.objects.count() == count
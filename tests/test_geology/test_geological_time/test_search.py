@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from django.test import RequestFactory
+
+from fairdm_geo.geology.geologic_time.index import get_timescale_search_index
+from fairdm_geo.geology.geologic_time.models import GeologicalTimescale
+from fairdm_geo.geology.geologic_time.urls import GeologicalTimescaleAutocomplete
+from fairdm_geo.geology.search import TrigramIndex, normalize
+
+ERAS = [
+    ("mesozoic", "Mesozoic", 66.0, 251.902, None),
+    ("jurassic", "Jurassic", 145.0, 201.4, "mesozoic"),
+    ("lowerjurassic", "Lower Jurassic", 174.7, 201.4, "jurassic"),
+    ("triassic", "Triassic", 201.4, 251.902, "mesozoic"),
+]
+
+
+def test_normalize():
+    assert normalize("  Lower-Jurassic, Épsilon ") == "lower jurassic epsilon"
+
+
+def test_prefix_and_typo_search():
+    index = TrigramIndex([(pk, [label, pk]) for pk, label, _y, _o, _b in ERAS])
+    assert index.search("jur") == ["jurassic", "lowerjurassic"]
+    assert index.search("lower jur") == ["lowerjurassic"]
+    assert index.search("jurasic")[0] == "jurassic"
+    assert index.search("xyz") == []
+    assert index.search("", limit=2) == ["jurassic", "lowerjurassic"]
+
+
+def test_digest_depends_on_content():
+    entries = [(pk, [label]) for pk, label, _y, _o, _b in ERAS]
+    assert TrigramIndex(entries).digest == TrigramIndex(entries).digest
+    assert TrigramIndex(entries).digest != TrigramIndex(entries[1:]).digest
+
+
+@pytest.fixture
+def eras(db):
+    for name, label, younger, older, broader in ERAS:
+        GeologicalTimescale.objects.create(
+            name=name,
+            uri=f"https://example.org/{name}",
+            label=label,
+            younger_bound=younger,
+            older_bound=older,
+            broader=f"https://example.org/{broader}" if broader else None,
+        )
+
+
+def get(**params):
+    request = RequestFactory().get("/", params)
+    return GeologicalTimescaleAutocomplete.as_view()(request)
+
+
+def test_index_context(eras):
+    index = get_timescale_search_index(GeologicalTimescale)
+    assert index.data["lowerjurassic"]["context"] == ["Jurassic", "Mesozoic"]
+    assert index.data["mesozoic"]["context"] == []
+
+
+def test_index_context_follows_broader_concepts(eras):
+    # bounds alone would place the Triassic inside this unit, but it is not a broader concept of it
+    GeologicalTimescale.objects.create(
+        name="undivided", uri="https://example.org/undivided", label="Undivided", younger_bound=0, older_bound=541
+    )
+    # concepts without published bounds still get their context
+    GeologicalTimescale.objects.create(
+        name="rhaetian", uri="https://example.org/rhaetian", label="Rhaetian", broader="https://example.org/triassic"
+    )
+    index = get_timescale_search_index(GeologicalTimescale)
+    assert index.data["triassic"]["context"] == ["Mesozoic"]
+    assert index.data["rhaetian"]["context"] == ["Triassic", "Mesozoic"]
+    assert index.data["undivided"]["context"] == []
+
+
+def test_index_context_ignores_unknown_and_cyclic_broader_concepts(eras):
+    GeologicalTimescale.objects.filter(pk="mesozoic").update(broader="https://example.org/lowerjurassic")
+    GeologicalTimescale.objects.filter(pk="triassic").update(broader="https://example.org/missing")
+    index = get_timescale_search_index(GeologicalTimescale)
+    assert index.data["lowerjurassic"]["context"] == ["Jurassic", "Mesozoic"]
+    assert index.data["triassic"]["context"] == []
+
+
+def test_autocomplete_view(eras):
+    response = get(q="jura")
+    data = json.loads(response.content)
+    assert [r["id"] for r in data["results"]] == ["jurassic", "lowerjurassic"]
+    assert data["results"][1]["text"] == "Lower Jurassic (Jurassic, Mesozoic)"
+    assert data["pagination"] == {"more": False}
+    assert "max-age" in response["Cache-Control"]
+
+    request = RequestFactory().get("/", {"q": "jura"}, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert GeologicalTimescaleAutocomplete.as_view()(request).status_code == 304
+
+
+def test_autocomplete_index_reset_on_save(eras):
+    etag = get(q="jura")["ETag"]
+    GeologicalTimescale.objects.filter(pk="triassic").get().delete()
+    assert get(q="jura")["ETag"] != etag
+    assert [r["id"] for r in json.loads(get(q="trias").content)["results"]] == []
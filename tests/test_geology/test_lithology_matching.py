@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from fairdm_geo.geology.lithology.loaders import load_rock_names
+from fairdm_geo.geology.lithology.matching import LithologyMatcher, match_lithologies
+from fairdm_geo.geology.lithology.models import SimpleLithology
+from fairdm_geo.geology.search import TrigramIndex, invalidate_search_index
+
+CSV = """id,path,depth,numchild,label,name,description,code,url
+1,0001,1,1,Rock,Rock and sediment,,RSD,http://example.org/RSD
+2,00010001,2,1,Igneous,Igneous rock,,IR,http://example.org/IR
+3,000100010001,3,0,Granite,Granite,,GRAN,http://example.org/GRAN
+"""
+
+INDEX = TrigramIndex(
+    [
+        ("basalt", ["Basalt", "basalt"]),
+        ("olivine_basalt", ["Olivine basalt"]),
+        ("granite", ["Granite", "granite"]),
+    ]
+)
+
+
+def teardown_function():
+    invalidate_search_index()
+
+
+def test_match():
+    matcher = LithologyMatcher(INDEX)
+    assert matcher.match("  BASALT ") == ("basalt", 1.0)
+    assert matcher.match("basalt, olivine") == ("olivine_basalt", 1.0)
+    key, score = matcher.match("granit")
+    assert key == "granite" and 0.5 <= score < 1
+    assert matcher.match("limestone") == (None, 0.0)
+    assert matcher.match(None) == (None, 0.0)
+
+
+def test_match_many():
+    matches = LithologyMatcher(INDEX).match_many(["Granite", None, "basalt", "granite", "xyz"])
+    assert matches.keys.tolist() == ["granite", None, "basalt", "granite", None]
+    assert matches.matched.tolist() == [True, False, True, True, False]
+    assert np.all(matches.scores[[0, 2, 3]] == 1.0)
+
+
+@pytest.mark.django_db
+def test_match_lithologies(tmp_path):
+    path = tmp_path / "rock_names.csv"
+    path.write_text(CSV)
+    load_rock_names(path)
+    SimpleLithology.objects.create(name="granite", label="Granite", uri="https://example.org/granite")
+
+    matches = match_lithologies(["granite", "igneous rock", "sandstone"])
+    assert matches["simple_lithology"].keys.tolist() == ["granite", None, None]
+    assert matches["rock_name"].keys.tolist() == [3, 2, None]
@@ -0,0 +1,47 @@
+import pytest
+
+from fairdm_geo.geology.lithology.loaders import load_rock_names, read_rock_names
+from fairdm_geo.geology.lithology.models import RockName
+
+CSV = """id,path,depth,numchild,label,name,description,code,url
+1,0001,1,2,Rock,Rock and sediment,,RSD,http://example.org/RSD
+2,00010001,2,2,Igneous,Igneous rock,,IR,http://example.org/IR
+3,000100010001,3,0,Basalt,Basalt,,BASA,http://example.org/BASA
+4,000100010002,3,1,Granite,Granite,,GRAN,http://example.org/GRAN
+5,0001000100020001,4,0,Basalt,Basalt,,BASA,http://example.org/BASA
+6,00010002,2,0,Sedimentary,Sedimentary rock,,SR,http://example.org/SR
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "rock_names.csv"
+    path.write_text(CSV)
+    return path
+
+
+def test_read_rejects_orphans(tmp_path):
+    path = tmp_path / "broken.csv"
+    path.write_text(CSV.replace("2,00010001,2", "2,00010009,2"))
+    with pytest.raises(ValueError, match="parent"):
+        read_rock_names(path)
+
+
+@pytest.mark.django_db
+def test_load_and_query(csv_path, django_assert_num_queries):
+    assert load_rock_names(csv_path) == 6
+    # loading again updates in place
+    assert load_rock_names(csv_path) == 6
+    assert RockName.objects.count() == 6
+
+    igneous = RockName.objects.get(code="IR")
+    with django_assert_num_queries(1):
+        assert [r.pk for r in igneous.get_descendants()] == [3, 4, 5]
+    assert [r.pk for r in igneous.get_descendants(include_self=True)] == [2, 3, 4, 5]
+    assert [r.pk for r in RockName.objects.get(pk=5).get_ancestors()] == [1, 2, 4]
+    assert igneous.get_parent().pk == 1
+    assert [r.pk for r in igneous.get_children()] == [3, 4]
+
+    # a class listed under several parents is found through each of its nodes
+    assert [r.pk for r in RockName.objects.ancestors("BASA")] == [1, 2, 4]
+    assert [r.pk for r in RockName.objects.descendants("GRAN", "SR", include_self=True)] == [4, 5, 6]
@@ -0,0 +1,57 @@
+import threading
+
+import numpy as np
+import pytest
+
+from fairdm_geo.gis.crs import WGS84, from_wgs84, get_transformer, local_to_ecef, to_ecef, to_wgs84, transform, utm_crs
+
+
+def test_utm_round_trip():
+    lon = np.array([8.5, 9.0, 10.2])
+    lat = np.array([47.3, 45.0, 52.1])
+    x, y = from_wgs84(lon, lat, utm_crs(32))
+    back_lon, back_lat = to_wgs84(x, y, utm_crs(32))
+    np.testing.assert_allclose(back_lon, lon, atol=1e-9)
+    np.testing.assert_allclose(back_lat, lat, atol=1e-9)
+
+
+def test_central_meridian():
+    lon, lat = to_wgs84([500_000], [0], utm_crs(33))
+    np.testing.assert_allclose(lon, [15.0])
+    np.testing.assert_allclose(lat, [0.0], atol=1e-9)
+
+
+def test_same_crs_is_a_copy():
+    x = np.array([1.0, 2.0])
+    result, _ = transform(x, [3, 4], "epsg:4326", WGS84)
+    result[0] = 99
+    assert x[0] == 1.0
+
+
+def test_transformers_are_cached_per_thread():
+    assert get_transformer(utm_crs(32)) is get_transformer(utm_crs(32))
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_transformer(utm_crs(32))))
+    thread.start()
+    thread.join()
+    assert other[0] is not get_transformer(utm_crs(32))
+
+
+def test_invalid_utm_zone():
+    with pytest.raises(ValueError):
+        utm_crs(61)
+
+
+def test_ecef_axes():
+    x, y, z = to_ecef([0, 90, 0], [0, 0, 90], [0, 0, 0])
+    np.testing.assert_allclose(x, [6_378_137.0, 0, 0], atol=1e-6)
+    np.testing.assert_allclose(y, [0, 6_378_137.0, 0], atol=1e-6)
+    np.testing.assert_allclose(z, [0, 0, 6_356_752.314245], atol=1e-6)
+
+
+def test_local_offsets_are_true_distances():
+    origin = np.array(to_ecef([10.0], [50.0], [0.0]))[:, 0]
+    x, y, z = local_to_ecef([10.0, 10.0], [50.0, 50.0], [0.0, 0.0], [300.0, 0.0], [400.0, 0.0], [0.0, -1000.0])
+    distances = np.linalg.norm(np.column_stack([x, y, z]) - origin, axis=1)
+    np.testing.assert_allclose(distances, [500.0, 1000.0], atol=1e-6)
@@ -0,0 +1,154 @@
+import io
+import json
+import lzma
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import IntegrityError
+
+from fairdm_geo.gis import loaders
+from fairdm_geo.gis.loaders import iter_json_array, load_fixture, open_fixture
+from fairdm_geo.gis.plates.models import Plate
+
+OBJECTS = [
+    {"model": "plates.plate", "pk": i, "fields": {"name": f"Plate {i}", "geom": "POINT (0 0)" * (i * 50)}}
+    for i in range(1, 30)
+]
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 64, 1024 * 1024])
+def test_iter_json_array_matches_json_load(read_size):
+    text = json.dumps(OBJECTS, indent=2)
+    items = [item for item, _size in iter_json_array(io.StringIO(text), read_size=read_size)]
+    assert items == OBJECTS
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 5, 7])
+def test_iter_json_array_values_cut_at_any_point(read_size):
+    # literals, numbers, escapes and strings all end up split across reads
+    items = [
+        {"a": True, "b": False, "c": None, "d": -1.5e-3, "e": 'Zürich 🌋 \\ "x"', "f": [0, 10, 2e8, float("inf")]}
+    ] * 3
+    text = json.dumps(items)
+    assert "\\u00fc" in text  # escapes, including a surrogate pair for the emoji
+    assert [item for item, _size in iter_json_array(io.StringIO(text), read_size=read_size)] == items
+
+
+class CountingReader(io.StringIO):
+    read_chars = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.read_chars += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize("invalid", ['{"pk" 2}', '{"pk": tx}', '{"pk": 1.2.3}', '{"pk": "a\\q"}', "{pk: 1}"])
+def test_iter_json_array_fails_at_invalid_object(invalid):
+    # an invalid object must not be mistaken for one that continues past the buffer
+    fp = CountingReader(f'[{{"pk": 1}}, {invalid}, "{"x" * 1_000_000}"]')
+    items = iter_json_array(fp, read_size=16)
+    assert next(items) == ({"pk": 1}, 9)
+    with pytest.raises(ValueError):
+        next(items)
+    assert fp.read_chars < 100
+
+
+def test_iter_json_array_empty():
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+
+@pytest.mark.parametrize("text", ['{"model": "plates.plate"}', '[{"pk": 1}, {"pk": 2'])
+def test_iter_json_array_invalid(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text)))
+
+
+def test_open_fixture_decompresses(tmp_path):
+    path = tmp_path / "plates.json.xz"
+    with lzma.open(path, "wt", encoding="utf-8") as fp:
+        json.dump(OBJECTS, fp)
+    with open_fixture(str(path)) as fp:
+        assert [item for item, _size in iter_json_array(fp)] == OBJECTS
+
+
+def test_open_fixture_rejects_other_formats(tmp_path):
+    with pytest.raises(ValueError):
+        open_fixture(str(tmp_path / "plates.yaml"))
+
+
+def plate(pk, name):
+    return {
+        "model": "plates.plate",
+        "pk": pk,
+        "fields": {
+            "name": name,
+            "plate": name,
+            "subplate_id": pk,
+            "subplate_code": "TST",
+            "subplate": name,
+            "type": "major",
+            "crust_type": "oceanic",
+            "area": 1.0,
+            "removed_field": "ignored",
+            "geom": "SRID=4326;MULTIPOLYGON (((0 0, 1 0, 1 1, 0 1, 0 0)))",
+        },
+    }
+
+
+@pytest.fixture
+def write_fixture(tmp_path):
+    def write(objects):
+        path = tmp_path / "fixture.json.xz"
+        with lzma.open(path, "wt", encoding="utf-8") as fp:
+            json.dump(objects, fp)
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def flushes(monkeypatch):
+    calls = []
+    flush = loaders._flush
+
+    def spy(model, objs, field_names, using):
+        calls.append((model._meta.label, len(objs)))
+        flush(model, objs, field_names, using)
+
+    monkeypatch.setattr(loaders, "_flush", spy)
+    return calls
+
+
+@pytest.mark.django_db
+def test_load_fixture_writes_in_batches(write_fixture, flushes):
+    objects = [plate(pk, f"Plate {pk}") for pk in range(1, 6)]
+    objects.insert(3, {"model": "auth.group", "pk": 1, "fields": {"name": "Editors"}})
+
+    counts = load_fixture(write_fixture(objects), batch_size=2)
+
+    assert counts == {Plate: 5, Group: 1}
+    assert flushes == [("plates.Plate", 2), ("plates.Plate", 1), ("auth.Group", 1), ("plates.Plate", 2)]
+    assert list(Plate.objects.order_by("pk").values_list("name", flat=True)) == [f"Plate {i}" for i in range(1, 6)]
+    assert Plate.objects.get(pk=1).geom.num_coords == 5
+
+
+@pytest.mark.django_db
+def test_load_fixture_limits_batch_bytes(write_fixture, flushes):
+    load_fixture(write_fixture([plate(pk, "Plate") for pk in range(1, 4)]), batch_size=100, max_batch_bytes=1)
+    assert flushes == [("plates.Plate", 1)] * 3
+
+
+@pytest.mark.django_db
+def test_load_fixture_updates_existing_rows(write_fixture):
+    load_fixture(write_fixture([plate(1, "Old"), plate(2, "Kept")]))
+    load_fixture(write_fixture([plate(1, "New")]))
+    assert dict(Plate.objects.values_list("pk", "name")) == {1: "New", 2: "Kept"}
+
+
+@pytest.mark.django_db
+def test_load_fixture_rolls_back_on_error(write_fixture):
+    path = write_fixture([plate(1, "Plate"), {"model": "plates.plate", "pk": 2, "fields": {"name": None}}])
+    with pytest.raises(IntegrityError):
+        load_fixture(path, batch_size=1)
+    assert not Plate.objects.exists()
@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.gis.geos import MultiPolygon, Polygon
+
+from fairdm_geo.gis.plates.models import Plate
+from fairdm_geo.gis.simplify import SIMPLIFIED_GEOMETRIES, _simplify, refresh_simplified_geometries
+
+# a unit square with a 0.05 degree bump on its top edge and a 0.005 degree dent in its bottom edge
+POLYGON = Polygon(((0, 0), (0.5, -0.005), (1, 0), (1, 1), (0.5, 1.05), (0, 1), (0, 0)), srid=4326)
+
+
+def make_plate(pk=1, **kwargs):
+    fields = {
+        "name": "Test",
+        "plate": "Test",
+        "subplate_id": 1,
+        "subplate_code": "TST",
+        "subplate": "Test",
+        "type": "Test",
+        "crust_type": "oceanic",
+        "area": 1.0,
+        "geom": MultiPolygon(POLYGON, srid=4326),
+    }
+    return Plate(id=pk, **{**fields, **kwargs})
+
+
+@pytest.mark.parametrize(
+    ("field", "num_coords"),
+    [
+        ("geom_low", 5),  # both features removed
+        ("geom_medium", 6),  # the bump is kept
+        ("geom_high", 7),  # both are kept
+    ],
+)
+def test_simplify_tolerances(field, num_coords):
+    tolerance, _max_zoom = SIMPLIFIED_GEOMETRIES[field]
+    simplified = _simplify(POLYGON, tolerance)
+    assert simplified.geom_type == "MultiPolygon"
+    assert simplified.srid == 4326
+    assert simplified.num_coords == num_coords
+    assert simplified.valid
+
+
+def test_tolerances_get_finer_with_zoom():
+    tolerances, zooms = zip(*SIMPLIFIED_GEOMETRIES.values())
+    assert list(tolerances) == sorted(tolerances, reverse=True)
+    assert list(zooms) == sorted(zooms)
+
+
+@pytest.mark.parametrize(
+    ("zoom", "field"),
+    [
+        (0, "geom_low"),
+        (3, "geom_low"),
+        (4, "geom_medium"),
+        (6, "geom_medium"),
+        (7, "geom_high"),
+        (9, "geom_high"),
+        (10, "geom"),
+        (22, "geom"),
+    ],
+)
+def test_geometry_for_zoom_picks_the_resolution(zoom, field):
+    plate = make_plate()
+    for name, (tolerance, _max_zoom) in SIMPLIFIED_GEOMETRIES.items():
+        setattr(plate, name, _simplify(POLYGON, tolerance))
+    assert Plate.geometry_field_for_zoom(zoom) == field
+    assert plate.geometry_for_zoom(zoom) is getattr(plate, field)
+
+
+def test_geometry_for_zoom_falls_back_to_the_full_geometry():
+    plate = make_plate()
+    assert plate.geom_low is None
+    assert plate.geometry_for_zoom(0) is plate.geom
+
+
+@pytest.mark.django_db
+def test_refresh_simplified_geometries():
+    plates = [make_plate(pk) for pk in range(1, 4)]
+    Plate.objects.bulk_create(plates)
+
+    refresh_simplified_geometries(Plate.objects.all(), batch_size=2)
+
+    for plate in Plate.objects.all():
+        assert plate.geom_low.num_coords == 5
+        assert plate.geom_medium.num_coords == 6
+        assert plate.geom_high.num_coords == 7
+        assert plate.geometry_for_zoom(5) == plate.geom_medium
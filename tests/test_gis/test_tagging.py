@@ -0,0 +1,41 @@
+import pytest
+
+shapely = pytest.importorskip("shapely")
+
+from fairdm_geo.gis.tagging import match_points  # noqa: E402
+
+# two unit squares sharing the border x = 1, and a third overlapping the right one
+WEST = shapely.box(0, 0, 1, 1)
+EAST = shapely.box(1, 0, 2, 1)
+OVERLAP = shapely.box(1.5, 0, 3, 1)
+
+
+@pytest.fixture
+def tree():
+    return shapely.STRtree([WEST, EAST, OVERLAP])
+
+
+def match(tree, *coords):
+    x, y = zip(*coords)
+    return dict(match_points(tree, shapely.points(x, y)))
+
+
+def test_points_inside_match_their_polygon(tree):
+    assert match(tree, (0.5, 0.5), (1.2, 0.5), (2.5, 0.5)) == {0: 0, 1: 1, 2: 2}
+
+
+def test_points_outside_match_nothing(tree):
+    assert match(tree, (-1, 0.5), (0.5, 2), (5, 5)) == {}
+
+
+def test_points_on_a_boundary_match_nothing(tree):
+    # on the border shared by the two squares, on an outer edge and on a corner
+    assert match(tree, (1, 0.5), (0.5, 0), (0, 0)) == {}
+
+
+def test_points_in_overlapping_polygons_match_once(tree):
+    assert match(tree, (0.5, 0.5), (1.75, 0.5)) in ({0: 0, 1: 1}, {0: 0, 1: 2})
+
+
+def test_match_keeps_point_indices(tree):
+    assert match(tree, (5, 5), (0.5, 0.5), (5, 5), (1.2, 0.5)) == {1: 0, 3: 1}
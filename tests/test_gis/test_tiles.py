@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from fairdm_geo.gis import tiles
+from fairdm_geo.gis.plates import urls
+from fairdm_geo.gis.plates.models import Plate
+from fairdm_geo.gis.simplify import SimplifiedGeometryModel
+
+from .test_simplify import make_plate
+
+# the tests below route requests through this module
+urlpatterns = urls.urls
+
+requires_postgis = pytest.mark.skipif(
+    not getattr(connection.ops, "postgis", False), reason="vector tiles are rendered by PostGIS"
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    with override_settings(FAIRDM_GEO_TILE_CACHE_DIR=tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    def render_tile(layer, model, z, x, y, using=None):
+        calls.append((layer, z, x, y))
+        return f"{layer}/{z}/{x}/{y}/{len(calls)}".encode()
+
+    monkeypatch.setattr(tiles, "render_tile", render_tile)
+    return calls
+
+
+@pytest.mark.parametrize("layer", list(tiles.LAYERS))
+def test_layers_resolve(layer):
+    label, fields = tiles.LAYERS[layer]
+    model = tiles.get_layer_model(layer)
+    assert model is not None, f"{label} is not installed"
+    assert model._meta.label == label
+    assert issubclass(model, SimplifiedGeometryModel)
+    for name in fields:
+        model._meta.get_field(name)
+
+
+def test_version_is_kept_until_the_cache_is_cleared(cache_dir):
+    version = tiles.fixtures_version("plates")
+    assert tiles.fixtures_version("plates") == version
+    assert tiles.tile_path("plates", 1, 0, 1) == cache_dir / "plates" / version / "1" / "0" / "1.pbf"
+
+    tiles.clear_tile_cache("plates")
+    assert tiles.fixtures_version("plates") != version
+
+
+def test_clearing_one_layer_keeps_the_others(cache_dir):
+    plates, provinces = tiles.fixtures_version("plates"), tiles.fixtures_version("provinces")
+    tiles.clear_tile_cache("plates")
+    assert tiles.fixtures_version("plates") != plates
+    assert tiles.fixtures_version("provinces") == provinces
+
+    tiles.clear_tile_cache()
+    assert tiles.fixtures_version("provinces") != provinces
+
+
+def test_tiles_are_rendered_once_per_version(cache_dir, renders):
+    first = tiles.get_tile("plates", Plate, 2, 1, 3)
+    assert tiles.get_tile("plates", Plate, 2, 1, 3) == first
+    assert tiles.tile_path("plates", 2, 1, 3).read_bytes() == first
+    assert renders == [("plates", 2, 1, 3)]
+
+    old_path = tiles.tile_path("plates", 2, 1, 3)
+    tiles.clear_tile_cache()
+    assert not old_path.exists()
+    assert tiles.get_tile("plates", Plate, 2, 1, 3) != first
+    assert len(renders) == 2
+
+
+def test_tile_urls_are_routed_per_layer():
+    assert reverse("plates-tile", urlconf=__name__, kwargs={"z": 3, "x": 2, "y": 1}) == "/tiles/plates/3/2/1.pbf"
+
+
+@pytest.mark.urls(__name__)
+@pytest.mark.parametrize("url", ["/tiles/plates/1/2/0.pbf", "/tiles/plates/1/0/2.pbf", "/tiles/plates/23/0/0.pbf"])
+def test_tile_view_rejects_tiles_outside_the_grid(client, url):
+    assert client.get(url).status_code == 404
+
+
+@pytest.mark.urls(__name__)
+@pytest.mark.skipif(getattr(connection.ops, "postgis", False), reason="PostGIS renders tiles")
+def test_tile_view_requires_postgis(client):
+    assert client.get("/tiles/plates/0/0/0.pbf").status_code == 501
+
+
+@requires_postgis
+@pytest.mark.django_db
+@pytest.mark.urls(__name__)
+def test_tile_view_renders_and_caches(client, cache_dir):
+    Plate.objects.bulk_create([make_plate()])
+
+    response = client.get("/tiles/plates/0/0/0.pbf")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/vnd.mapbox-vector-tile"
+    assert "max-age" in response["Cache-Control"]
+    assert response.content
+    assert tiles.tile_path("plates", 0, 0, 0).read_bytes() == response.content
+
+    # a tile far away from the plate is empty
+    assert tiles.render_tile("plates", Plate, 2, 0, 0) == b""
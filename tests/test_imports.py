@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from fairdm_geo.core.intervals import magnitude
+from fairdm_geo.factories.location import SamplingLocationFactory
+from fairdm_geo.imports import (
+    BoreholeImporter,
+    ImportReport,
+    SamplingLocationImporter,
+    to_float_array,
+    validate_coordinates,
+)
+from fairdm_geo.sites.models import Borehole, SamplingLocation
+
+
+def test_to_float_array_blank_and_invalid_values():
+    values = to_float_array(["1.5", "", None, "abc", 2])
+    assert values[0] == 1.5
+    assert values[4] == 2
+    assert np.isnan(values[1:4]).all()
+
+
+def test_validate_coordinates():
+    latitude = np.array([0, 90, -91, np.nan, 45])
+    longitude = np.array([0, -180, 0, 0, 181])
+    assert validate_coordinates(latitude, longitude).tolist() == [True, True, False, False, False]
+
+
+def test_report_rows_per_second():
+    assert ImportReport(rows=100, seconds=2).rows_per_second == 50
+    assert ImportReport().rows_per_second == 0
+
+
+@pytest.fixture
+def dataset():
+    return SamplingLocationFactory().dataset
+
+
+@pytest.mark.django_db
+def test_sampling_location_importer_run(dataset):
+    rows = [
+        {"name": "A", "latitude": "-41.2865", "longitude": "174.7762", "elevation": "12.5", "unknown": "x"},
+        {"name": "B", "latitude": "-41.286501", "longitude": "174.776199", "elevation": ""},
+        {"name": "C", "latitude": "95", "longitude": "0"},
+        {"name": "D", "latitude": "0", "longitude": "0", "elevation": "high"},
+    ]
+    report = SamplingLocationImporter(dataset=dataset).run(rows)
+
+    assert (report.rows, report.created, report.skipped) == (4, 2, 2)
+    assert [index for index, _message in report.errors] == [2, 3]
+    assert "elevation" in report.errors[1][1]
+    # both rows round to the same point
+    assert (report.locations_created, report.locations_reused) == (1, 0)
+
+    a, b = SamplingLocation.objects.filter(dataset=dataset, name__in=["A", "B"]).order_by("name")
+    assert a.location_id == b.location_id
+    assert (float(a.location.x), float(a.location.y)) == (174.7762, -41.2865)
+    assert magnitude(a.elevation) == 12.5
+    assert b.elevation is None
+
+    report = SamplingLocationImporter(dataset=dataset).run(
+        [{"name": "E", "latitude": "-41.2865", "longitude": "174.7762"}]
+    )
+    assert (report.locations_created, report.locations_reused) == (0, 1)
+
+
+@pytest.mark.django_db
+def test_importer_resolves_foreign_keys(dataset):
+    other = SamplingLocationFactory().dataset
+    deleted = SamplingLocationFactory().dataset
+    deleted.delete()
+    rows = [
+        {"name": "A", "latitude": "1", "longitude": "2"},
+        {"name": "B", "latitude": "1", "longitude": "2", "dataset": str(other.pk)},
+        {"name": "C", "latitude": "1", "longitude": "2", "dataset": str(deleted.pk)},
+    ]
+    report = SamplingLocationImporter(dataset=dataset).run(rows)
+
+    assert report.created == 2
+    assert [(index, message.split(":")[0]) for index, message in report.errors] == [(2, "Invalid dataset")]
+    assert SamplingLocation.objects.get(name="A", location__x=2).dataset == dataset
+    assert SamplingLocation.objects.get(name="B", location__x=2).dataset == other
+
+
+@pytest.mark.django_db
+def test_borehole_importer_run(dataset):
+    rows = [
+        {"name": f"BH{i}", "latitude": "50", "longitude": str(i), "length": "150.5", "inclination": "90"}
+        for i in range(5)
+    ]
+    report = BoreholeImporter(dataset=dataset, batch_size=2).run(rows)
+
+    assert report.created == 5
+    boreholes = Borehole.objects.filter(dataset=dataset).order_by("name")
+    assert [b.name for b in boreholes] == [f"BH{i}" for i in range(5)]
+    for borehole in boreholes:
+        assert magnitude(borehole.length) == 150.5
+        assert magnitude(borehole.inclination, "deg") == 90
+        assert SamplingLocation.objects.filter(pk=borehole.pk, location=borehole.location).exists()
+
+
+@pytest.mark.django_db
+def test_borehole_importer_derives_and_checks_depths(dataset):
+    rows = [
+        {"name": "both", "latitude": "50", "longitude": "1", "top": "0", "bottom": "120"},
+        {"name": "inverted", "latitude": "50", "longitude": "2", "top": "80", "bottom": "20"},
+        {"name": "top", "latitude": "50", "longitude": "3", "top": "10", "vertical_depth": "30"},
+    ]
+    report = BoreholeImporter(dataset=dataset).run(rows)
+
+    assert report.created == 2
+    assert report.skipped == 1
+    assert report.errors == [(1, "Invalid depths: the bottom (20) must be greater than the top (80)")]
+    depths = {
+        b.name: [magnitude(b.top), magnitude(b.bottom), magnitude(b.vertical_depth)]
+        for b in Borehole.objects.filter(dataset=dataset)
+    }
+    assert depths == {"both": [0, 120, 120], "top": [10, 40, 30]}
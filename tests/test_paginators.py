@@ -0,0 +1,104 @@
+import datetime
+from decimal import Decimal
+
+import django_tables2 as tables
+import pytest
+from django.core.paginator import PageNotAnInteger
+from django.db.models.functions import Lower
+
+from fairdm_geo.factories.location import SamplingLocationFactory
+from fairdm_geo.paginators import (
+    NEXT,
+    PREVIOUS,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+    get_ordering,
+    seek,
+)
+from fairdm_geo.sites.models import SamplingLocation
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(NEXT, [Decimal("12.5"), "abc", 42])
+    assert decode_cursor(cursor) == (NEXT, ["12.5", "abc", 42])
+    assert "=" not in cursor
+
+
+def test_cursor_serializes_dates():
+    cursor = encode_cursor(PREVIOUS, [datetime.date(2024, 1, 2)])
+    assert decode_cursor(cursor) == (PREVIOUS, ["2024-01-02"])
+
+
+@pytest.mark.parametrize("cursor", ["garbage!!", encode_cursor("x", [1])])
+def test_invalid_cursor(cursor):
+    with pytest.raises(PageNotAnInteger):
+        decode_cursor(cursor)
+
+
+def test_seek_condition():
+    condition = seek([("name", True), ("pk", False)], ["b", 3])
+    assert condition.connector == "OR"
+    first, second = condition.children
+    assert first == ("_keyset_0__lt", "b")
+    assert sorted(second.children) == [("_keyset_0", "b"), ("_keyset_1__gt", 3)]
+    reverse = seek([("name", True), ("pk", False)], ["b", 3], reverse=True)
+    assert "_keyset_0__gt" in str(reverse)
+
+
+class SiteTable(tables.Table):
+    name = tables.Column()
+
+
+@pytest.fixture
+def sites():
+    # several sites share a name, so pages have to break ties by primary key
+    return [SamplingLocationFactory(name=name) for name in ["b", "a", "c", "a", "b", "a", "c"]]
+
+
+def paginate(queryset, per_page, page=1):
+    table = SiteTable(queryset)
+    table.paginate(paginator_class=KeysetPaginator, per_page=per_page, page=page)
+    return table.page
+
+
+def pks(page):
+    return [row.record.pk for row in page]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["name", "-name"])
+@pytest.mark.parametrize("per_page", [1, 2, 3, 7])
+def test_keyset_pages_forward_and_back(sites, ordering, per_page):
+    queryset = SamplingLocation.objects.filter(pk__in=[site.pk for site in sites]).order_by(ordering)
+    expected = list(queryset.order_by(ordering, "pk").values_list("pk", flat=True))
+
+    pages = [paginate(queryset, per_page)]
+    assert not pages[0].has_previous()
+    while pages[-1].has_next():
+        pages.append(paginate(queryset, per_page, pages[-1].next_page_number()))
+    assert [pk for page in pages for pk in pks(page)] == expected
+    assert all(len(page) == per_page for page in pages[:-1])
+
+    # walk back from the last page; every page must match the one seen on the way forward
+    page = pages[-1]
+    for previous in reversed(pages[:-1]):
+        assert page.has_previous()
+        page = paginate(queryset, per_page, page.previous_page_number())
+        assert pks(page) == pks(previous)
+        assert page.has_next()
+    assert not page.has_previous()
+
+
+@pytest.mark.django_db
+def test_keyset_page_rejects_a_cursor_for_another_ordering(sites):
+    queryset = SamplingLocation.objects.order_by("name")
+    with pytest.raises(PageNotAnInteger):
+        paginate(queryset, 2, encode_cursor(NEXT, ["a"]))
+
+
+@pytest.mark.django_db
+def test_keyset_ordering_must_use_fields():
+    queryset = SamplingLocation.objects.order_by(Lower("name"))
+    with pytest.raises(TypeError):
+        get_ordering(queryset)
@@ -0,0 +1,135 @@
+import pytest
+from django.test import RequestFactory
+
+from fairdm_geo.factories.location import PointFactory, SamplingLocationFactory
+from fairdm_geo.sites.clusters import cell_size, get_cache, get_clusters, grouped_cells, merge_cells, snap_bbox
+from fairdm_geo.sites.models import SamplingLocation
+from fairdm_geo.sites.views import ClusterView, parse_bbox
+
+
+def row(cell_x, cell_y, site_type, datum, count, longitude, latitude):
+    return {
+        "cell_x": cell_x,
+        "cell_y": cell_y,
+        "type": site_type,
+        "elevation_datum": datum,
+        "count": count,
+        "longitude": longitude,
+        "latitude": latitude,
+    }
+
+
+def test_cell_size_halves_per_zoom_level():
+    assert cell_size(0) == 90
+    assert cell_size(3) == cell_size(2) / 2
+
+
+def test_snap_bbox_to_tiles():
+    assert snap_bbox((-10, 35, 30, 60), 2) == (-90, 0, 90, 90)
+    assert snap_bbox((-180, -90, 180, 90), 5) == (-180, -90, 180, 90)
+    # crossing the antimeridian
+    assert snap_bbox((170, -10, -170, 10), 3) == (135, -45, -135, 45)
+
+
+def test_merge_cells():
+    rows = [
+        row(1.0, 2.0, "outcrop", "MSL", 3, 3 * -100.0, 3 * 10.0),
+        row(1.0, 2.0, "spring", "MSL", 1, -120.0, 30.0),
+        row(4.0, 1.0, "outcrop", "EGM96", 2, 2 * 5.0, 2 * -5.0),
+        # a location on the north east corner of the world falls in the last cell
+        row(8.0, 4.0, "outcrop", "MSL", 1, 180.0, 90.0),
+    ]
+    cells = merge_cells(rows, 1)
+    assert [cell["cell"] for cell in cells] == [[1, 2], [4, 1], [7, 3]]
+
+    first = cells[0]
+    assert first["count"] == 4
+    assert first["center"] == pytest.approx([-105.0, 15.0])
+    assert first["bbox"] == [-135, 0, -90, 45]
+    assert first["type"] == {"outcrop": 3, "spring": 1}
+    assert first["elevation_datum"] == {"MSL": 4}
+
+
+def test_parse_bbox():
+    assert parse_bbox("-10,35.5,30,60") == (-10, 35.5, 30, 60)
+    for value in ["1,2,3", "a,b,c,d", "0,50,10,40", "-200,0,0,10"]:
+        with pytest.raises(ValueError):
+            parse_bbox(value)
+
+
+@pytest.mark.parametrize("params", [{"zoom": "x"}, {"zoom": 30}, {"bbox": "0,0,10"}])
+def test_invalid_requests(params):
+    response = ClusterView.as_view()(RequestFactory().get("/", params))
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def sites(db):
+    for longitude, latitude, site_type, datum in [
+        (-100.0, 10.0, "outcrop", "MSL"),
+        (-100.0, 10.0, "outcrop", "MSL"),
+        (-120.0, 30.0, "spring", "MSL"),
+        (5.0, -5.0, "outcrop", "EGM96"),
+        (175.0, 0.0, "outcrop", "MSL"),
+    ]:
+        SamplingLocationFactory(location=PointFactory(x=longitude, y=latitude), type=site_type, elevation_datum=datum)
+    # sites without a location are not clustered
+    SamplingLocationFactory(location=None)
+
+
+def grouped(rows):
+    return {
+        (int(r["cell_x"]), int(r["cell_y"]), r["type"], r["elevation_datum"]): (
+            r["count"],
+            r["longitude"],
+            r["latitude"],
+        )
+        for r in rows
+    }
+
+
+def test_grouped_cells(sites):
+    rows = grouped(grouped_cells(SamplingLocation.objects.all(), 1))
+    assert rows == {
+        (1, 2, "outcrop", "MSL"): (2, pytest.approx(-200.0), pytest.approx(20.0)),
+        (1, 2, "spring", "MSL"): (1, pytest.approx(-120.0), pytest.approx(30.0)),
+        (4, 1, "outcrop", "EGM96"): (1, pytest.approx(5.0), pytest.approx(-5.0)),
+        (7, 2, "outcrop", "MSL"): (1, pytest.approx(175.0), pytest.approx(0.0)),
+    }
+
+
+def test_grouped_cells_in_bbox(sites):
+    assert set(grouped(grouped_cells(SamplingLocation.objects.all(), 1, (-130, 0, 0, 40)))) == {
+        (1, 2, "outcrop", "MSL"),
+        (1, 2, "spring", "MSL"),
+    }
+    # crossing the antimeridian
+    assert set(grouped(grouped_cells(SamplingLocation.objects.all(), 1, (170, -10, -170, 10)))) == {
+        (7, 2, "outcrop", "MSL")
+    }
+    assert set(grouped(grouped_cells(SamplingLocation.objects.filter(type="spring"), 1))) == {(1, 2, "spring", "MSL")}
+
+
+@pytest.fixture
+def cluster_cache(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "clusters": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "fairdm-geo-clusters"},
+    }
+    settings.FAIRDM_GEO_CLUSTER_CACHE = "clusters"
+    cache = get_cache()
+    cache.clear()
+    return cache
+
+
+def test_get_clusters_is_cached_until_a_site_changes(
+    sites, cluster_cache, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    cells = get_clusters(1)
+    assert sum(cell["count"] for cell in cells) == 5
+    with django_assert_num_queries(0):
+        assert get_clusters(1) == cells
+
+    with django_capture_on_commit_callbacks(execute=True):
+        SamplingLocationFactory(location=PointFactory(x=-100.0, y=10.0))
+    assert sum(cell["count"] for cell in get_clusters(1)) == 6
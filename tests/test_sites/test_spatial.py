@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+from fairdm_geo.factories.location import BoreholeFactory, PointFactory, SamplingLocationFactory
+from fairdm_geo.sites import spatial
+from fairdm_geo.sites.models import Borehole, IntervalPosition, SamplingLocation
+from fairdm_geo.sites.spatial import (
+    LocationIndex,
+    PositionTree,
+    chord_to_km,
+    ecef_point,
+    get_location_index,
+    km_to_chord,
+)
+
+
+@pytest.fixture(params=["kdtree", "numpy"])
+def tree(request, monkeypatch):
+    if request.param == "numpy":
+        monkeypatch.setattr(spatial, "cKDTree", None)
+    elif spatial.cKDTree is None:
+        pytest.skip("scipy is not installed")
+    rng = np.random.default_rng(7)
+    return PositionTree(np.arange(500) + 1000, rng.uniform(-1000, 1000, (500, 3)))
+
+
+def test_within(tree):
+    point = np.array([10.0, -20.0, 30.0])
+    pks, distances = tree.within(point, 250)
+    expected = np.linalg.norm(tree.xyz - point, axis=1)
+    assert set(pks) == set(tree.pks[expected <= 250])
+    assert np.all(np.diff(distances) >= 0)
+
+
+def test_nearest(tree):
+    point = np.array([100.0, 0.0, -50.0])
+    pks, distances = tree.nearest(point, 5)
+    expected = np.linalg.norm(tree.xyz - point, axis=1)
+    assert list(pks) == list(tree.pks[np.argsort(expected)[:5]])
+    np.testing.assert_allclose(distances, np.sort(expected)[:5])
+
+
+def test_nearest_more_than_available(tree):
+    pks, _ = tree.nearest(np.zeros(3), 1000)
+    assert len(pks) == len(tree)
+
+
+def test_empty():
+    tree = PositionTree([], np.empty((0, 3)))
+    assert len(tree.nearest(np.zeros(3), 3)[0]) == 0
+    assert len(tree.within(np.zeros(3), 10)[0]) == 0
+
+
+def test_ecef_point_depth():
+    surface, deep = ecef_point((10.0, 50.0, 0.0)), ecef_point((10.0, 50.0, -1200.0))
+    assert np.linalg.norm(surface - deep) == pytest.approx(1200.0)
+
+
+def haversine(lon1, lat1, lon2, lat2):
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * spatial.EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.fixture
+def locations():
+    rng = np.random.default_rng(11)
+    lon, lat = rng.uniform(-180, 180, 2000), np.degrees(np.arcsin(rng.uniform(-1, 1, 2000)))
+    return np.arange(2000), lon, lat
+
+
+def test_chord_round_trip():
+    km = np.array([0.0, 1.0, 500.0, 10_000.0])
+    np.testing.assert_allclose(chord_to_km([km_to_chord(d) for d in km]), km)
+    assert km_to_chord(50_000) == pytest.approx(2.0)
+
+
+def test_location_index_matches_haversine(locations):
+    pks, lon, lat = locations
+    index = LocationIndex(pks, lon, lat)
+    distances = haversine(-3.2, 55.9, lon, lat)
+
+    found, km = index.nearest((-3.2, 55.9), 8)
+    assert list(found) == list(pks[np.argsort(distances)[:8]])
+    np.testing.assert_allclose(km, np.sort(distances)[:8])
+
+    found, km = index.within((-3.2, 55.9), 2000)
+    assert set(found) == set(pks[distances <= 2000])
+    assert np.all(np.diff(km) >= 0)
+
+
+def test_location_index_incremental_updates(locations):
+    pks, lon, lat = locations
+    index = LocationIndex(pks, lon, lat)
+    nearest = pks[np.argsort(haversine(100.0, -20.0, lon, lat))]
+
+    index.add([5000], [100.0], [-20.0])
+    index.add([nearest[0]], [0.0], [0.0])
+    index.remove([nearest[1], 12345])
+    assert len(index) == len(pks)
+
+    found, km = index.nearest((100.0, -20.0), 3)
+    assert list(found) == [5000, nearest[2], nearest[3]]
+    assert km[0] == pytest.approx(0.0)
+    assert list(index.compacted().nearest((100.0, -20.0), 3)[0]) == list(found)
+
+    index.remove([5000])
+    assert 5000 not in index.within((100.0, -20.0), 100)[0]
+
+
+@pytest.fixture
+def indexes():
+    spatial.invalidate_position_tree()
+    yield
+    spatial.invalidate_position_tree()
+
+
+def make_site(longitude, latitude, factory=SamplingLocationFactory):
+    return factory(location=PointFactory(x=longitude, y=latitude))
+
+
+@pytest.fixture
+def sites(db, indexes):
+    return {name: make_site(longitude, 0.0) for name, longitude in [("a", 0.0), ("b", 0.5), ("c", 2.0), ("d", 10.0)]}
+
+
+def test_nearest_sites(sites):
+    found = list(SamplingLocation.objects.nearest((0.1, 0.0), k=2))
+    assert [site.pk for site in found] == [sites["a"].pk, sites["b"].pk]
+    assert [site.distance for site in found] == pytest.approx(
+        [haversine(0.1, 0.0, 0.0, 0.0), haversine(0.1, 0.0, 0.5, 0.0)], rel=1e-4
+    )
+
+    filtered = SamplingLocation.objects.exclude(pk__in=[sites["a"].pk, sites["b"].pk])
+    assert [site.pk for site in filtered.nearest((0.1, 0.0), k=2)] == [sites["c"].pk, sites["d"].pk]
+
+
+def test_sites_within_km(sites):
+    found = list(SamplingLocation.objects.within_km((0.0, 0.0), 100))
+    assert [site.pk for site in found] == [sites["a"].pk, sites["b"].pk]
+    assert [site.distance for site in found] == pytest.approx([0.0, haversine(0.0, 0.0, 0.5, 0.0)], rel=1e-4)
+
+    filtered = SamplingLocation.objects.filter(pk=sites["b"].pk)
+    assert [site.pk for site in filtered.within_km((0.0, 0.0), 100)] == [sites["b"].pk]
+    assert list(SamplingLocation.objects.within_km((90.0, 45.0), 100)) == []
+
+
+def test_nearest_borehole(sites):
+    borehole = make_site(3.0, 0.0, BoreholeFactory)
+    make_site(20.0, 0.0, BoreholeFactory)
+
+    found = list(Borehole.objects.nearest((0.0, 0.0)))
+    assert [b.pk for b in found] == [borehole.pk]
+    assert found[0].distance == pytest.approx(haversine(0.0, 0.0, 3.0, 0.0), rel=1e-4)
+    # the borehole is also a sampling location, but not the nearest one
+    assert [site.pk for site in SamplingLocation.objects.nearest((0.0, 0.0))] == [sites["a"].pk]
+
+
+@pytest.mark.django_db
+def test_location_index_follows_site_changes(indexes, django_capture_on_commit_callbacks):
+    site = make_site(0.0, 0.0)
+    index = get_location_index(SamplingLocation)
+    assert index.nearest((0.0, 0.0), 1)[0].tolist() == [site.pk]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        added = make_site(50.0, 50.0)
+    assert get_location_index(SamplingLocation) is index
+    assert index.nearest((50.0, 50.0), 1)[0].tolist() == [added.pk]
+
+    # moving a point moves every site at it, so the index is rebuilt
+    with django_capture_on_commit_callbacks(execute=True):
+        added.location.x = -50.0
+        added.location.save()
+    assert get_location_index(SamplingLocation) is not index
+    assert get_location_index(SamplingLocation).nearest((-50.0, 50.0), 1)[0].tolist() == [added.pk]
+
+    pk = added.pk
+    with django_capture_on_commit_callbacks(execute=True):
+        added.delete()
+    assert get_location_index(SamplingLocation).nearest((-50.0, 50.0), 1)[0].tolist() == [site.pk]
+    assert pk not in get_location_index(SamplingLocation).within((0.0, 0.0), 20_000)[0]
+
+
+@pytest.mark.django_db
+def test_interval_position_queries(indexes):
+    borehole = BoreholeFactory()
+    shallow, deep = BoreholeFactory(), BoreholeFactory()
+    for interval, depth in [(shallow, 100.0), (deep, 600.0)]:
+        x, y, z = ecef_point((10.0, 50.0, -depth))
+        IntervalPosition.objects.create(sample_id=interval.pk, borehole=borehole, x=x, y=y, z=z, tvd=depth)
+
+    found = list(IntervalPosition.objects.within_distance((10.0, 50.0, 0.0), 200))
+    assert [p.pk for p in found] == [shallow.pk]
+    assert found[0].distance == pytest.approx(100.0, abs=0.01)
+
+    found = list(IntervalPosition.objects.nearest((10.0, 50.0, -500.0), k=2))
+    assert [p.pk for p in found] == [deep.pk, shallow.pk]
+    assert [p.distance for p in found] == pytest.approx([100.0, 400.0], abs=0.01)
+
+    # deleting a position resets the tree
+    IntervalPosition.objects.filter(pk=shallow.pk).get().delete()
+    assert list(IntervalPosition.objects.within_distance((10.0, 50.0, 0.0), 200)) == []
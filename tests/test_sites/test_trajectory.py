@@ -0,0 +1,243 @@
+import numpy as np
+import pytest
+
+from fairdm_geo.factories.location import BoreholeFactory, PointFactory
+from fairdm_geo.sites import trajectory
+from fairdm_geo.sites.models import Borehole, IntervalPosition, SurveyStation
+from fairdm_geo.sites.trajectory import (
+    Trajectory,
+    dogleg_angles,
+    get_trajectories,
+    interpolate,
+    minimum_curvature,
+    true_vertical_depths,
+    update_interval_positions,
+)
+
+
+def circular_arc(n, length=500.0):
+    """Stations along a circular arc between two directions (as inclination from horizontal / azimuth)."""
+    a = np.array([np.sin(np.radians(10)), 0, np.cos(np.radians(10))])
+    b = np.array(
+        [
+            np.sin(np.radians(60)) * np.cos(np.radians(80)),
+            np.sin(np.radians(60)) * np.sin(np.radians(80)),
+            np.cos(np.radians(60)),
+        ]
+    )
+    omega = np.arccos(a @ b)
+    s = np.linspace(0, 1, n)
+    v = (np.sin((1 - s) * omega)[:, None] * a + np.sin(s * omega)[:, None] * b) / np.sin(omega)
+    inclination = 90 - np.degrees(np.arccos(v[:, 2]))
+    azimuth = np.degrees(np.arctan2(v[:, 1], v[:, 0])) % 360
+    return 100 + s * length, inclination, azimuth
+
+
+def test_vertical_hole():
+    t = minimum_curvature([0, 100, 250], [90, 90, 90], [0, 0, 0])
+    assert np.allclose(t.tvd, [0, 100, 250])
+    assert np.allclose(t.north, 0) and np.allclose(t.east, 0)
+    assert np.allclose(t.dogleg_severity, 0)
+
+
+def test_textbook_example():
+    # inclination 15 -> 25 degrees from vertical, azimuth 20 -> 45 over 100 m
+    t = minimum_curvature([0, 100], [75, 65], [20, 45])
+    assert t.north[1] == pytest.approx(27.22, abs=0.01)
+    assert t.dogleg[1] == pytest.approx(12.95, abs=0.01)
+
+
+def test_exact_on_circular_arcs():
+    coarse = minimum_curvature(*circular_arc(2))
+    dense = minimum_curvature(*circular_arc(1001))
+    for name in ("north", "east", "tvd"):
+        assert getattr(coarse, name)[-1] == pytest.approx(getattr(dense, name)[-1])
+    # constant curvature
+    assert np.allclose(dense.dogleg_severity[2:], dense.dogleg_severity[2])
+
+
+def test_groups_are_solved_independently():
+    md, inclination, azimuth = circular_arc(5)
+    single = minimum_curvature(md, inclination, azimuth)
+    both = minimum_curvature(np.r_[md, md], np.r_[inclination, inclination], np.r_[azimuth, azimuth], [1] * 5 + [2] * 5)
+    for group in (1, 2):
+        assert np.allclose(both.select(group).tvd, single.tvd)
+        assert np.allclose(both.select(group).east, single.east)
+
+
+def test_unsorted_stations():
+    with pytest.raises(ValueError, match="sorted"):
+        minimum_curvature([100, 50], [90, 90], [0, 0])
+
+
+def test_dogleg_angles():
+    assert dogleg_angles(90, 0, 90, 180) == pytest.approx(0)
+    assert np.degrees(dogleg_angles(0, 0, 0, 180)) == pytest.approx(180)
+    assert np.degrees(dogleg_angles(90, 0, 0, 90)) == pytest.approx(90)
+
+
+def test_interpolate_follows_the_arc():
+    md, inclination, azimuth = circular_arc(3)
+    coarse = minimum_curvature(
+        np.r_[md, md], np.r_[inclination, inclination], np.r_[azimuth, azimuth], [1] * 3 + [2] * 3
+    )
+    dense = minimum_curvature(*circular_arc(1001))
+    north, east, tvd = interpolate(coarse, [2] * 1001, dense.measured_depth)
+    assert np.allclose(north, dense.north)
+    assert np.allclose(east, dense.east)
+    assert np.allclose(tvd, dense.tvd)
+
+
+def test_interpolate_outside_the_survey():
+    t = minimum_curvature([100, 200], [80, 80], [90, 90], ["a", "a"])
+    _north, east, tvd = interpolate(t, ["a", "a", "b", "a"], [50, 300, 10, np.nan])
+    # straight from the collar above the first station and straight on below the last one
+    assert tvd[:2] == pytest.approx([50 * np.sin(np.radians(80)), 300 * np.sin(np.radians(80))])
+    assert east[:2] == pytest.approx([50 * np.cos(np.radians(80)), 300 * np.cos(np.radians(80))])
+    # unknown borehole and missing depth
+    assert np.isnan(tvd[2:]).all()
+
+
+def test_concatenate():
+    a = minimum_curvature([0, 10], [90, 90], [0, 0], [1, 1])
+    b = minimum_curvature([0, 20], [90, 90], [0, 0], [2, 2])
+    joined = Trajectory.concatenate([a, b])
+    assert joined.groups.tolist() == [1, 1, 2, 2]
+    assert joined.tvd.tolist() == [0, 10, 0, 20]
+
+
+@pytest.fixture
+def trajectories():
+    trajectory.invalidate_trajectories()
+    yield trajectory._cache
+    trajectory.invalidate_trajectories()
+
+
+def make_borehole(**kwargs):
+    defaults = {"inclination": 90, "azimuth": 0, "length": 500, "top": 10, "bottom": 50, "elevation": 100}
+    return BoreholeFactory(**{**defaults, **kwargs})
+
+
+@pytest.mark.django_db
+def test_true_vertical_depths(trajectories):
+    vertical = make_borehole()
+    inclined = make_borehole(inclination=30)
+    depths = true_vertical_depths(Borehole.objects.filter(pk__in=[vertical.pk, inclined.pk]).order_by("pk"))
+
+    assert depths.pk.tolist() == depths.borehole.tolist() == [vertical.pk, inclined.pk]
+    assert depths.top_tvd == pytest.approx([10, 10 * np.sin(np.radians(30))])
+    assert depths.bottom_tvd == pytest.approx([50, 50 * np.sin(np.radians(30))])
+    assert depths.top_tvdss == pytest.approx(depths.top_tvd - 100)
+    assert depths.bottom_tvdss == pytest.approx(depths.bottom_tvd - 100)
+
+
+@pytest.mark.django_db
+def test_true_vertical_depths_follow_the_survey(trajectories):
+    borehole = make_borehole()
+    SurveyStation.objects.bulk_create(
+        [SurveyStation(borehole=borehole, measured_depth=md, inclination=45, azimuth=90) for md in (0, 100)]
+    )
+    depths = true_vertical_depths(Borehole.objects.filter(pk=borehole.pk))
+    assert depths.top_tvd == pytest.approx([10 * np.sin(np.radians(45))])
+    assert depths.bottom_tvd == pytest.approx([50 * np.sin(np.radians(45))])
+
+
+@pytest.mark.django_db
+def test_tvdss_needs_a_sea_level_datum(trajectories):
+    borehole = make_borehole(elevation_datum="NAVD88")
+    undated = make_borehole(elevation=None)
+    depths = true_vertical_depths(Borehole.objects.filter(pk__in=[borehole.pk, undated.pk]))
+
+    assert depths.top_tvd == pytest.approx([10, 10])
+    assert np.isnan(depths.top_tvdss).all()
+    assert np.isnan(depths.bottom_tvdss).all()
+
+
+@pytest.mark.django_db
+def test_true_vertical_depths_requires_a_borehole(trajectories):
+    with pytest.raises(ValueError, match="borehole"):
+        true_vertical_depths(SurveyStation.objects.all())
+
+
+@pytest.mark.django_db
+def test_survey_changes_reset_the_cached_trajectory(trajectories):
+    borehole = make_borehole()
+    boreholes = Borehole.objects.filter(pk=borehole.pk)
+    assert get_trajectories(boreholes).tvd.max() == pytest.approx(500)
+    assert borehole.pk in trajectories
+
+    station = SurveyStation.objects.create(borehole=borehole, measured_depth=100, inclination=0, azimuth=90)
+    assert borehole.pk not in trajectories
+    # horizontal from the collar to the single station, and straight on below it
+    assert get_trajectories(boreholes).tvd.max() == pytest.approx(0)
+
+    station.inclination = 90
+    station.save()
+    assert borehole.pk not in trajectories
+    assert get_trajectories(boreholes).tvd.max() == pytest.approx(100)
+
+    station.delete()
+    assert borehole.pk not in trajectories
+    assert get_trajectories(boreholes).tvd.max() == pytest.approx(500)
+
+
+@pytest.mark.django_db
+def test_borehole_changes_reset_the_cached_trajectory(trajectories):
+    borehole, other = make_borehole(), make_borehole()
+    get_trajectories(Borehole.objects.all())
+    assert {borehole.pk, other.pk} <= set(trajectories)
+
+    borehole.length = 200
+    borehole.save()
+    assert borehole.pk not in trajectories
+    assert other.pk in trajectories
+    assert get_trajectories(Borehole.objects.filter(pk=borehole.pk)).tvd.max() == pytest.approx(200)
+
+    pk = other.pk
+    other.delete()
+    assert pk not in trajectories
+
+
+@pytest.mark.django_db
+def test_interval_positions_use_sea_level_elevations_only(trajectories):
+    def position(**kwargs):
+        borehole = make_borehole(location=PointFactory(x=10.0, y=45.0), **kwargs)
+        update_interval_positions(Borehole.objects.filter(pk=borehole.pk))
+        obj = IntervalPosition.objects.get(sample_id=borehole.pk)
+        return np.array([obj.x, obj.y, obj.z])
+
+    sea_level = position(elevation=0)
+    # the collar (and so every position along the borehole) is 100 m higher
+    assert np.linalg.norm(position() - sea_level) == pytest.approx(100)
+    # other datums and missing elevations put the collar at height 0
+    assert position(elevation_datum="NAVD88") == pytest.approx(sea_level)
+    assert position(elevation=None) == pytest.approx(sea_level)
+
+
+@pytest.mark.django_db
+def test_interval_positions_follow_survey_and_borehole_changes(trajectories, django_capture_on_commit_callbacks):
+    borehole, other = make_borehole(), make_borehole()
+    assert update_interval_positions(Borehole.objects.filter(pk__in=[borehole.pk, other.pk])) == 2
+
+    def tvd(obj):
+        return IntervalPosition.objects.get(sample_id=obj.pk).tvd
+
+    assert tvd(borehole) == pytest.approx(30)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        station = SurveyStation.objects.create(borehole=borehole, measured_depth=100, inclination=30, azimuth=90)
+    assert tvd(borehole) == pytest.approx(15)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        station.delete()
+        borehole.inclination = 60
+        borehole.save()
+    assert tvd(borehole) == pytest.approx(30 * np.sin(np.radians(60)))
+    # positions along other boreholes are left alone
+    assert tvd(other) == pytest.approx(30)
+
+    # positions that were never stored are not created
+    IntervalPosition.objects.filter(sample_id=other.pk).delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        other.save()
+    assert not IntervalPosition.objects.filter(sample_id=other.pk).exists()
@@ -0,0 +1,67 @@
+import django_tables2 as tables
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from fairdm_geo.factories.location import SamplingLocationFactory
+from fairdm_geo.sites.models import SamplingLocation
+from fairdm_geo.tables import QueryOptimizedTableMixin, resolve_accessor
+
+
+class CoordinateTable(QueryOptimizedTableMixin, tables.Table):
+    name = tables.Column()
+    latitude = tables.Column(accessor="location__y")
+    longitude = tables.Column(accessor="location__x")
+
+
+class LocationTable(CoordinateTable):
+    location = tables.Column(accessor="location")
+
+
+def only_fields(queryset):
+    fields, defer = queryset.query.deferred_loading
+    assert not defer
+    return fields
+
+
+@pytest.mark.parametrize(
+    ("accessor", "expected"),
+    [
+        ("name", ([], "name")),
+        ("location.x", (["location"], "location__x")),
+        ("location__y", (["location"], "location__y")),
+        ("location", (["location"], None)),
+        ("get_absolute_url", ([], None)),
+    ],
+)
+def test_resolve_accessor(accessor, expected):
+    assert resolve_accessor(SamplingLocation, accessor) == expected
+
+
+def test_plain_related_fields_are_trimmed():
+    queryset = CoordinateTable.optimize_queryset(SamplingLocation.objects.all())
+    assert queryset.query.select_related == {"location": {}}
+    fields = only_fields(queryset)
+    assert "name" in fields
+    assert {field for field in fields if field.startswith("location__")} == {"location__x", "location__y"}
+
+
+def test_related_objects_used_by_a_column_are_loaded_in_full():
+    queryset = LocationTable.optimize_queryset(SamplingLocation.objects.all())
+    assert queryset.query.select_related == {"location": {}}
+    assert queryset.query.deferred_loading == (frozenset(), True)
+
+
+def test_excluded_columns_are_not_joined():
+    queryset = SamplingLocation.objects.all()
+    assert CoordinateTable.optimize_queryset(queryset, exclude=["latitude", "longitude"]) is queryset
+
+
+@pytest.mark.django_db
+def test_rendering_a_page_costs_one_query():
+    SamplingLocationFactory.create_batch(5)
+    table = CoordinateTable(SamplingLocation.objects.order_by("pk"))
+    with CaptureQueriesContext(connection) as ctx:
+        cells = [(row.get_cell("latitude"), row.get_cell("longitude")) for row in table.rows]
+    assert len(cells) == 5
+    assert len(ctx.captured_queries) == 1
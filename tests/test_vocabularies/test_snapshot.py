@@ -0,0 +1,161 @@
+import ast
+import copy
+import inspect
+import textwrap
+from types import SimpleNamespace
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from research_vocabs import Vocabulary
+from research_vocabs.vocabularies import RemoteVocabulary
+
+from fairdm_geo.vocabularies.snapshot import (
+    SnapshotStore,
+    VocabularySnapshotMixin,
+    build_snapshot,
+    get_snapshot_store,
+    missing_vocabularies,
+)
+
+
+def make_concept(name, label, **attrs):
+    return SimpleNamespace(name=name, URI=f"https://example.org/{name}", label=lambda: label, attrs=attrs)
+
+
+class RemoteSource:
+    """Stands in for a research_vocabs vocabulary that would hit the network."""
+
+    init_calls = 0
+
+    def __init__(self):
+        RemoteSource.init_calls += 1
+        self.graph = "parsed"
+
+    def concepts(self):
+        return [
+            make_concept("cenozoic", "Cenozoic", **{"rdfs:comment": ["younger bound 0 Ma", "older bound 66 Ma"]}),
+            make_concept("quaternary", "Quaternary", **{"skos:broader": ["https://example.org/cenozoic"]}),
+        ]
+
+
+class ExampleVocabulary(VocabularySnapshotMixin, RemoteSource):
+    _meta = SimpleNamespace(source="https://example.org/timescale.ttl")
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / "snapshot.sqlite3"
+    build_snapshot([ExampleVocabulary], path)
+    with override_settings(FAIRDM_GEO_VOCABULARY_SNAPSHOT=path):
+        get_snapshot_store.cache_clear()
+        yield path
+    get_snapshot_store.cache_clear()
+
+
+def test_build_snapshot_roundtrip(snapshot):
+    store = SnapshotStore(snapshot)
+    assert store.is_compatible
+    concepts = store.concepts(ExampleVocabulary.snapshot_key())
+    assert [c.name for c in concepts] == ["cenozoic", "quaternary"]
+    assert concepts[0].label() == "Cenozoic"
+    assert concepts[0].attrs["rdfs:comment"] == ["younger bound 0 Ma", "older bound 66 Ma"]
+    assert concepts[1].broader == "https://example.org/cenozoic"
+    assert store.concepts("missing.Vocabulary") is None
+
+
+def test_vocabulary_resolves_from_snapshot_without_parsing(snapshot):
+    RemoteSource.init_calls = 0
+    vocabulary = ExampleVocabulary()
+    assert vocabulary.values == ["cenozoic", "quaternary"]
+    assert vocabulary.choices == [("cenozoic", "Cenozoic"), ("quaternary", "Quaternary")]
+    assert RemoteSource.init_calls == 0
+
+    # anything the snapshot cannot answer falls through to the remote source
+    assert vocabulary.graph == "parsed"
+    assert RemoteSource.init_calls == 1
+
+
+@override_settings(FAIRDM_GEO_VOCABULARY_SNAPSHOT=None)
+def test_vocabulary_without_snapshot_is_loaded_on_first_use():
+    get_snapshot_store.cache_clear()
+    RemoteSource.init_calls = 0
+    vocabulary = ExampleVocabulary()
+    assert not vocabulary.is_loaded
+    assert RemoteSource.init_calls == 0
+
+    assert [c.name for c in vocabulary.concepts()] == ["cenozoic", "quaternary"]
+    assert vocabulary.is_loaded
+    assert RemoteSource.init_calls == 1
+    get_snapshot_store.cache_clear()
+
+
+def test_missing_vocabularies(snapshot):
+    class OtherVocabulary(ExampleVocabulary):
+        pass
+
+    store = SnapshotStore(snapshot)
+    assert missing_vocabularies([ExampleVocabulary, OtherVocabulary], store) == [OtherVocabulary.snapshot_key()]
+    assert missing_vocabularies([ExampleVocabulary]) == []
+
+
+def assigned_attributes(cls):
+    """Public names assigned as ``self.<name> = ...`` in the source of ``cls``."""
+    tree = ast.parse(textwrap.dedent(inspect.getsource(cls)))
+    return {
+        node.attr
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Attribute)
+        and isinstance(node.ctx, ast.Store)
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "self"
+        and not node.attr.startswith("_")
+    }
+
+
+@pytest.mark.parametrize("vocabulary", [RemoteVocabulary, Vocabulary])
+def test_deferred_attributes_cover_research_vocabs(vocabulary):
+    # a public attribute that research_vocabs starts setting would otherwise raise AttributeError on unloaded
+    # vocabularies; add it to VocabularySnapshotMixin.deferred_attributes
+    assigned = set().union(*(assigned_attributes(cls) for cls in vocabulary.__mro__ if cls is not object))
+    assert assigned <= VocabularySnapshotMixin.deferred_attributes
+
+
+@override_settings(FAIRDM_GEO_VOCABULARY_SNAPSHOT=None)
+def test_probing_an_unloaded_vocabulary_does_not_parse_it():
+    get_snapshot_store.cache_clear()
+    RemoteSource.init_calls = 0
+    vocabulary = ExampleVocabulary()
+
+    # Django deep-copies field arguments and probes values for the query expression API
+    copied = copy.deepcopy(vocabulary)
+    assert not hasattr(vocabulary, "resolve_expression")
+    assert not hasattr(vocabulary, "_private")
+    assert RemoteSource.init_calls == 0
+    assert not vocabulary.is_loaded and not copied.is_loaded
+
+    assert copied.graph == "parsed"
+    assert RemoteSource.init_calls == 1
+    assert not vocabulary.is_loaded
+    get_snapshot_store.cache_clear()
+
+
+def test_instantiation_does_not_read_the_snapshot(snapshot, monkeypatch):
+    def fail():
+        raise AssertionError
+
+    vocabulary = ExampleVocabulary()
+    with monkeypatch.context() as m:
+        m.setattr("fairdm_geo.vocabularies.snapshot.get_snapshot_store", fail)
+        ExampleVocabulary()
+    assert vocabulary.values == ["cenozoic", "quaternary"]
+
+
+@override_settings(FAIRDM_GEO_VOCABULARY_OFFLINE=True)
+def test_offline_vocabulary_missing_from_the_snapshot_fails_on_first_use(snapshot):
+    class OtherVocabulary(ExampleVocabulary):
+        pass
+
+    vocabulary = OtherVocabulary()
+    with pytest.raises(ImproperlyConfigured):
+        list(vocabulary.choices)